@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Dict, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Optional, Tuple, Union, TYPE_CHECKING
+
+from fastecdsa import curvemath  # type: ignore[attr-defined]
 
 if TYPE_CHECKING:
     # allow the type checker to use Point
@@ -22,11 +24,35 @@ class Curve:
         |  b (int): The value of :math:`b` in the curve equation.
         |  q (int): The order of the base point of the curve.
         |  oid (bytes): The object identifier of the curve.
+        |  p_bits (int): The bit length of :math:`p`.
+        |  p_bytes (int): The byte length of :math:`p`.
+        |  q_bits (int): The bit length of :math:`q`.
+        |  q_bytes (int): The byte length of :math:`q`.
     """
 
+    __slots__ = (
+        "name",
+        "p",
+        "a",
+        "b",
+        "q",
+        "gx",
+        "gy",
+        "oid",
+        "p_bits",
+        "p_bytes",
+        "q_bits",
+        "q_bytes",
+        "_G",
+        "_native",
+    )
+
     _oid_lookup: Dict[
         bytes, Curve
     ] = {}  # a lookup table for getting curve instances by their object identifier
+    _name_lookup: Dict[
+        str, Curve
+    ] = {}  # a lookup table for getting curve instances by name
 
     def __init__(
         self,
@@ -67,8 +93,18 @@ class Curve:
         self.gy = gy
         self.oid = oid
 
+        # derived values used by signing, key generation and the encoders
+        self.p_bits = p.bit_length()
+        self.p_bytes = (self.p_bits + 7) // 8
+        self.q_bits = q.bit_length()
+        self.q_bytes = (self.q_bits + 7) // 8
+
+        self._G: Optional[curvemath.NativePoint] = None
+        self._native = curvemath.build_curve(p, a, b, q, gx, gy)
+
         if oid is not None:
             self._oid_lookup[oid] = self
+        self._name_lookup[name] = self
 
     def __str__(self) -> str:
         return self.name
@@ -76,6 +112,25 @@ class Curve:
     def __repr__(self) -> str:
         return self.__str__()
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # the curves of this module are pickled by their OID, other curves (the native handle can't
+        # be pickled) are rebuilt from their domain parameters, as a user defined curve may not be
+        # registered in the unpickling process or its name or OID may belong to another curve there
+        identifier = self._identifier()
+        if identifier is not None:
+            return _curve_from_identifier, (identifier,)
+        return _restore_curve, self._params()
+
+    def _params(self) -> Tuple[Any, ...]:
+        return self.name, self.p, self.a, self.b, self.q, self.gx, self.gy, self.oid
+
+    def _identifier(self) -> Optional[bytes]:
+        """The OID this curve can be looked up by, if it is one of the curves of this module."""
+        if self.oid is not None and self in _library_curves:
+            if self._oid_lookup.get(self.oid) is self:
+                return self.oid
+        return None
+
     @classmethod
     def get_curve_by_oid(cls, oid: bytes) -> Optional[Curve]:
         r"""Get a curve via its object identifier.
@@ -90,6 +145,19 @@ class Curve:
         """
         return cls._oid_lookup.get(oid, None)
 
+    @classmethod
+    def get_curve_by_name(cls, name: str) -> Optional[Curve]:
+        r"""Get a curve via its name.
+
+        Args:
+            name (str): The name of the curve, e.g. :code:`"P256"`.
+
+        Returns:
+            Curve | None: The most recently created curve with that name. If there is no such curve
+            :code:`None` is returned.
+        """
+        return cls._name_lookup.get(name, None)
+
     def is_point_on_curve(self, point: Tuple[int, int]) -> bool:
         r"""Check if a point lies on this curve.
 
@@ -129,11 +197,52 @@ class Curve:
 
         For the purposes of ECDSA this point is multiplied by a private key to obtain the
         corresponding public key. Make a property to avoid cyclic dependency of Point on Curve
-        (a point lies on a curve) and Curve on Point (curves have a base point).
+        (a point lies on a curve) and Curve on Point (curves have a base point). Every access
+        returns a new point, so modifying it doesn't change the curve's generator, but the native
+        point behind it is built on first access only and shared.
         """
         from .point import Point
 
-        return Point(self.gx, self.gy, self)
+        if self._G is None:
+            self._G = curvemath.NativePoint(self.gx, self.gy, self)
+
+        G = Point._trusted(self.gx, self.gy, self)
+        G._native = self._G
+        return G
+
+
+def _curve_from_identifier(identifier: Union[bytes, str]) -> Curve:
+    if isinstance(identifier, bytes):
+        curve = Curve.get_curve_by_oid(identifier)
+    else:
+        curve = Curve.get_curve_by_name(identifier)
+
+    if curve is None:
+        raise ValueError(f"No curve is registered for identifier {identifier!r}")
+    return curve
+
+
+def _restore_curve(
+    name: str,
+    p: int,
+    a: int,
+    b: int,
+    q: int,
+    gx: int,
+    gy: int,
+    oid: Optional[bytes],
+) -> Curve:
+    # reuse the registered instance if there is one with the same parameters, points compare
+    # curves by identity
+    params = (name, p, a, b, q, gx, gy, oid)
+    for curve in (
+        Curve.get_curve_by_oid(oid) if oid is not None else None,
+        Curve.get_curve_by_name(name),
+    ):
+        if curve is not None and curve._params() == params:
+            return curve
+
+    return Curve(name, p, a, b, q, gx, gy, oid)
 
 
 # see https://nvlpubs.nist.gov/nistpubs/SpecialPublications/NIST.SP.800-186-draft.pdf
@@ -414,3 +523,6 @@ brainpoolP512r1 = Curve(
     ),
     b"\x2b\x24\x03\x03\x02\x08\x01\x01\x0d",
 )
+
+# the curves defined above that have an OID, the only curves pickled by it
+_library_curves = frozenset(Curve._oid_lookup.values())
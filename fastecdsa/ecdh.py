@@ -0,0 +1,113 @@
+from typing import List, Sequence, Union
+
+from fastecdsa import curvemath  # type: ignore[attr-defined]
+from .curve import Curve, P256
+from .montgomery import MontgomeryCurve
+from .point import Point
+
+
+class EcdhError(Exception):
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
+
+
+def shared_secret(d: int, Q: Point, curve: Curve = P256) -> bytes:
+    r"""Compute an elliptic curve Diffie-Hellman shared secret.
+
+    The shared secret is the :math:`x` coordinate of :math:`d \cdot Q` encoded as a big endian
+    integer of :code:`curve.p_bytes` bytes, as described in SEC 1 Section 3.3.1 (and used by e.g.
+    TLS). It is computed in a single native call that only normalizes the :math:`x` coordinate,
+    no :class:`fastecdsa.point.Point` is created for the product. On curves with a Montgomery form
+    (:code:`W25519` and :code:`W448`) the product is computed with the Montgomery ladder of
+    :mod:`fastecdsa.montgomery`. The secret should be passed through a key derivation function
+    before it is used as a key.
+
+    Args:
+        |  d (int): The private key of this party.
+        |  Q (fastecdsa.point.Point): The public key of the other party.
+        |  curve (fastecdsa.curve.Curve): The curve both keys are on.
+
+    Returns:
+        bytes: The shared secret.
+
+    Raises:
+        fastecdsa.ecdh.EcdhError: If the private key is not between 1 and the curve order, the
+            public key is not a point on the curve or the product is the identity element.
+    """
+    if not 0 < d < curve.q:
+        raise EcdhError(
+            "Invalid private key: d is not a positive integer smaller than the curve order"
+        )
+    elif Q.curve != curve or not curve.is_point_on_curve((Q.x, Q.y)):
+        raise EcdhError(f"Invalid public key, point is not on curve {curve}")
+
+    montgomery = MontgomeryCurve._weierstrass_lookup.get(curve)
+    if montgomery is not None:
+        # u = 0 is the identity element or the point of order 2, mul_x tells them apart
+        u = montgomery.mul_u(d, montgomery.from_point(Q))
+        if u != 0:
+            return ((u + montgomery._shift) % curve.p).to_bytes(curve.p_bytes, "big")
+
+    try:
+        x = curvemath.mul_x(Q.x, Q.y, d, curve)
+    except ValueError as e:
+        raise EcdhError(
+            "Invalid public key, the shared secret is the identity element"
+        ) from e
+
+    return x.to_bytes(curve.p_bytes, "big")
+
+
+def shared_secrets(
+    d: int, peers: Sequence[Point], curve: Curve = P256, contiguous: bool = False
+) -> Union[List[bytes], bytes]:
+    """Compute the ECDH shared secrets of one private key with many public keys.
+
+    This gives the same secrets as calling :func:`shared_secret` for every peer, but all of them
+    are computed in native code without holding the GIL: the peers are normalized and checked to
+    be on the curve together with a single inversion, as are the products. The private key is
+    recoded once for all of them.
+
+    Args:
+        |  d (int): The private key of this party.
+        |  peers (list[fastecdsa.point.Point]): The public keys of the other parties.
+        |  curve (fastecdsa.curve.Curve): The curve all keys are on.
+        |  contiguous (bool): Return the secrets back to back in a single bytes object (each
+            :code:`curve.p_bytes` long) instead of a list.
+
+    Returns:
+        list[bytes] | bytes: The shared secrets, in the same order as the peers.
+
+    Raises:
+        fastecdsa.ecdh.EcdhError: If the private key is not between 1 and the curve order, or a
+            public key is not a point on the curve (the message gives its index).
+        TypeError: If a public key is not a :class:`fastecdsa.point.Point`.
+    """
+    if not 0 < d < curve.q:
+        raise EcdhError(
+            "Invalid private key: d is not a positive integer smaller than the curve order"
+        )
+
+    natives = []
+    for i, Q in enumerate(peers):
+        if isinstance(Q, Point):
+            # the identity element has no curve
+            if Q.curve != curve:
+                raise EcdhError(
+                    f"Invalid public key: the point at index {i} is not on curve {curve}"
+                )
+            Q = Q._to_native()
+        elif not isinstance(Q, curvemath.NativePoint):
+            raise TypeError(f"The public key at index {i} is not a Point")
+        natives.append(Q)
+
+    try:
+        secrets: bytes = curvemath.mul_x_many(natives, d, curve)
+    except ValueError as e:
+        raise EcdhError(f"Invalid public key: {e}") from e
+
+    if contiguous:
+        return secrets
+
+    size = curve.p_bytes
+    return [secrets[i : i + size] for i in range(0, len(secrets), size)]
@@ -1,25 +1,71 @@
+import os
+import threading
+import time
+import weakref
 from binascii import hexlify
+from collections import OrderedDict, deque
 from hashlib import sha256
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    overload,
+)
 
 from fastecdsa import _ecdsa  # type: ignore[attr-defined]
 from .curve import Curve, P256
+from .encoding import SigEncoder
+from .encoding.der import DEREncoder
 from .point import Point
-from .typing import EcdsaSignature, HashFunction, SignableMessage
+from .typing import EcdsaSignature, HashFunction, MessageStream, SignableMessage
 from .util import RFC6979, msg_bytes
 
+# size of the buffer used when hashing messages read from a stream
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class EcdsaError(Exception):
     def __init__(self, msg: str) -> None:
         self.msg = msg
 
 
+@overload
+def sign(
+    msg: SignableMessage,
+    d: int,
+    curve: Curve = ...,
+    hashfunc: HashFunction = ...,
+    prehashed: bool = ...,
+    encoder: None = ...,
+) -> EcdsaSignature: ...
+
+
+@overload
+def sign(
+    msg: SignableMessage,
+    d: int,
+    curve: Curve = ...,
+    hashfunc: HashFunction = ...,
+    prehashed: bool = ...,
+    *,
+    encoder: Union[SigEncoder, Type[SigEncoder]],
+) -> bytes: ...
+
+
 def sign(
     msg: SignableMessage,
     d: int,
     curve: Curve = P256,
     hashfunc: HashFunction = sha256,
     prehashed: bool = False,
-) -> EcdsaSignature:
+    encoder: Optional[Union[SigEncoder, Type[SigEncoder]]] = None,
+) -> Union[EcdsaSignature, bytes]:
     """Sign a message using the elliptic curve digital signature algorithm.
 
     The elliptic curve signature algorithm is described in full in FIPS 186-4 Section 6. Please
@@ -31,9 +77,11 @@ def sign(
         |  curve (fastecdsa.curve.Curve): The curve to be used to sign the message.
         |  hashfunc (Callable): The hash function used to compress the message.
         |  prehashed (bool): The message being passed has already been hashed by :code:`hashfunc`.
+        |  encoder (fastecdsa.encoding.SigEncoder|None): Return the signature encoded by this
+            encoder (e.g. :code:`DEREncoder`, which is encoded by the native signer directly).
 
     Returns:
-        (int, int): The signature (r, s) as a tuple.
+        (int, int)|bytes: The signature (r, s) as a tuple, or encoded if an encoder is given.
     """
     # generate a deterministic nonce per RFC6979
     rfc6979 = RFC6979(msg, d, curve.q, hashfunc, prehashed=prehashed)
@@ -44,25 +92,18 @@ def sign(
     # This does not change that ks (mod n) = kt (mod n) = k (mod n)
     ks = k + curve.q
     kt = ks + curve.q
-    if ks.bit_length() == curve.q.bit_length():
+    if ks.bit_length() == curve.q_bits:
         k = kt
     else:
         k = ks
 
     hashed = _hex_digest(msg, hashfunc, prehashed)
 
-    r, s = _ecdsa.sign(
-        hashed,
-        str(d),
-        str(k),
-        str(curve.p),
-        str(curve.a),
-        str(curve.b),
-        str(curve.q),
-        str(curve.gx),
-        str(curve.gy),
-    )
-    return int(r), int(s)
+    if encoder is None:
+        return _ecdsa.sign(hashed, d, k, curve)
+    elif encoder is DEREncoder or isinstance(encoder, DEREncoder):
+        return _ecdsa.sign_der(hashed, d, k, curve)
+    return encoder.encode_signature(*_ecdsa.sign(hashed, d, k, curve))
 
 
 def verify(
@@ -109,19 +150,418 @@ def verify(
 
     hashed = _hex_digest(msg, hashfunc, prehashed)
 
-    return _ecdsa.verify(
-        str(r),
-        str(s),
-        hashed,
-        str(Q.x),
-        str(Q.y),
-        str(curve.p),
-        str(curve.a),
-        str(curve.b),
-        str(curve.q),
-        str(curve.gx),
-        str(curve.gy),
-    )
+    return _ecdsa.verify(r, s, hashed, Q.x, Q.y, curve)
+
+
+def sign_stream(
+    stream: MessageStream,
+    d: int,
+    curve: Curve = P256,
+    hashfunc: HashFunction = sha256,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> EcdsaSignature:
+    """Sign a message that is hashed incrementally rather than held in memory.
+
+    The stream may be a file object (opened in binary or text mode), an iterable of message chunks,
+    or a :code:`hashlib` style hash object that has already been updated with the message. Files
+    are read through a single buffer of :code:`chunk_size` bytes, so memory use is constant
+    regardless of the message size. The signature is identical to the one produced by
+    :func:`sign` for the full message.
+
+    Args:
+        |  stream (file|iterable|hash object): The message to be signed.
+        |  d (int): The ECDSA private key of the signer.
+        |  curve (fastecdsa.curve.Curve): The curve to be used to sign the message.
+        |  hashfunc (Callable): The hash function used to compress the message. If the stream is a
+            hash object it must use the same algorithm.
+        |  chunk_size (int): The number of bytes read from a file per update of the hash.
+
+    Returns:
+        (int, int): The signature (r, s) as a tuple.
+    """
+    digest = _stream_digest(stream, hashfunc, chunk_size)
+    return sign(digest, d, curve=curve, hashfunc=hashfunc, prehashed=True)
+
+
+def verify_stream(
+    sig: EcdsaSignature,
+    stream: MessageStream,
+    Q: Point,
+    curve: Curve = P256,
+    hashfunc: HashFunction = sha256,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> bool:
+    """Verify a signature on a message that is hashed incrementally rather than held in memory.
+
+    See :func:`sign_stream` for the kinds of streams that are accepted.
+
+    Args:
+        |  sig (int, int): The signature for the message.
+        |  stream (file|iterable|hash object): The message that was signed.
+        |  Q (fastecdsa.point.Point): The ECDSA public key of the signer.
+        |  curve (fastecdsa.curve.Curve): The curve to be used to verify the signature.
+        |  hashfunc (Callable): The hash function used to compress the message. If the stream is a
+            hash object it must use the same algorithm.
+        |  chunk_size (int): The number of bytes read from a file per update of the hash.
+
+    Returns:
+        bool: True if the signature is valid, False otherwise.
+
+    Raises:
+        fastecdsa.ecdsa.EcdsaError: If the signature or public key are invalid.
+    """
+    digest = _stream_digest(stream, hashfunc, chunk_size)
+    return verify(sig, digest, Q, curve=curve, hashfunc=hashfunc, prehashed=True)
+
+
+class VerificationCache:
+    """An opt-in memo of successful signature verifications.
+
+    Verifying a signature that was already verified (e.g. a token presented again, or a retried
+    webhook) is a dictionary lookup instead of a scalar multiplication. Entries are keyed by a
+    SHA-256 fingerprint of the curve, the message digest, the signature and the public key, expire
+    :code:`ttl` seconds after they were added, and the least recently used entry is evicted when
+    the cache holds :code:`maxsize` entries. Only successful verifications are cached, an invalid
+    signature is verified again every time it is presented.
+
+    Args:
+        |  maxsize (int): The maximum number of cached verifications.
+        |  ttl (float): The number of seconds a verification stays cached.
+        |  clock (function): The clock the expiry times are read from, :func:`time.monotonic` by
+            default.
+
+    Attributes:
+        |  hits (int): The number of verifications answered from the cache.
+        |  misses (int): The number of verifications that had to be computed.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1 or ttl <= 0:
+            raise ValueError("maxsize and ttl must be positive")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._expiries: "OrderedDict[bytes, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def clear(self) -> None:
+        """Remove all cached verifications and reset the counters."""
+        with self._lock:
+            self._expiries.clear()
+            self.hits = self.misses = 0
+
+    def verify(
+        self,
+        sig: EcdsaSignature,
+        msg: SignableMessage,
+        Q: Point,
+        curve: Curve = P256,
+        hashfunc: HashFunction = sha256,
+        prehashed: bool = False,
+    ) -> bool:
+        """Verify a signature like :func:`verify`, answering repeated successes from the cache.
+
+        Args:
+            |  sig (int, int): The signature for the message.
+            |  msg (str|bytes|bytearray): The message that was signed.
+            |  Q (fastecdsa.point.Point): The ECDSA public key of the signer.
+            |  curve (fastecdsa.curve.Curve): The curve to be used to verify the signature.
+            |  hashfunc (_hashlib.HASH): The hash function used to compress the message.
+            |  prehashed (bool): The message being passed has already been hashed by
+                :code:`hashfunc`.
+
+        Returns:
+            bool: True if the signature is valid, False otherwise.
+
+        Raises:
+            fastecdsa.ecdsa.EcdsaError: If the signature or public key are invalid.
+        """
+        if Q.curve != curve:
+            raise EcdsaError(f"Invalid public key, point is not on curve {curve}")
+
+        hashed = _hex_digest(msg, hashfunc, prehashed)
+        key = self._fingerprint(sig, hashed, Q, curve)
+        if self._lookup(key):
+            return True
+
+        valid = verify(sig, bytes.fromhex(hashed), Q, curve, prehashed=True)
+        if valid:
+            self._store(key)
+        return valid
+
+    def verify_many(
+        self,
+        items: Iterable[Tuple[EcdsaSignature, SignableMessage, Point]],
+        curve: Curve = P256,
+        hashfunc: HashFunction = sha256,
+        prehashed: bool = False,
+    ) -> List[bool]:
+        """Verify many signatures with :meth:`verify`.
+
+        Args:
+            |  items (list[((int, int), str|bytes|bytearray, fastecdsa.point.Point)]): The
+                signatures, messages and public keys.
+            |  curve (fastecdsa.curve.Curve): The curve to be used to verify the signatures.
+            |  hashfunc (_hashlib.HASH): The hash function used to compress the messages.
+            |  prehashed (bool): The messages being passed have already been hashed by
+                :code:`hashfunc`.
+
+        Returns:
+            list[bool]: Whether each signature is valid, in the same order as the items.
+
+        Raises:
+            fastecdsa.ecdsa.EcdsaError: If a signature or public key is invalid.
+        """
+        return [
+            self.verify(sig, msg, Q, curve, hashfunc, prehashed)
+            for sig, msg, Q in items
+        ]
+
+    @staticmethod
+    def _fingerprint(sig: EcdsaSignature, hashed: str, Q: Point, curve: Curve) -> bytes:
+        # the full domain parameters, distinct curves may share a name
+        r, s = sig
+        oid = curve.oid.hex() if curve.oid is not None else ""
+        fields = (oid, curve.p, curve.a, curve.b, curve.gx, curve.gy, curve.q)
+        fields += (hashed, r, s, Q.x, Q.y)
+        return sha256("|".join(map(str, fields)).encode()).digest()
+
+    def _lookup(self, key: bytes) -> bool:
+        now = self.clock()
+        with self._lock:
+            expiry = self._expiries.get(key)
+            if expiry is not None and expiry > now:
+                self._expiries.move_to_end(key)
+                self.hits += 1
+                return True
+
+            if expiry is not None:
+                del self._expiries[key]
+            self.misses += 1
+            return False
+
+    def _store(self, key: bytes) -> None:
+        expiry = self.clock() + self.ttl
+        with self._lock:
+            self._expiries[key] = expiry
+            self._expiries.move_to_end(key)
+            while len(self._expiries) > self.maxsize:
+                self._expiries.popitem(last=False)
+
+
+class NoncePool:
+    r"""A pool of precomputed random nonces for offline / online ECDSA signing.
+
+    Nearly all the time of a signature goes into :math:`r = (k \cdot G)_x` and :math:`k^{-1}`, which
+    don't depend on the message. The pool computes them ahead of time (offline) for fresh random
+    nonces, in native batches that use a fixed base table for :math:`k \cdot G` and a single
+    inversion for all :math:`k`, so signing a message (online) is one multiply-add modulo the curve
+    order. Only :math:`r` and :math:`k^{-1}` are kept, :math:`k` itself is discarded.
+
+    Every nonce is used for at most one signature: it is removed from the pool under a lock before
+    it is used, and a forked child process empties the pool it inherited, so the parent and the
+    child never sign with the same nonce. When fewer than :code:`refill_threshold` nonces are
+    left a refill up to :code:`size` nonces starts, in a background thread (the native code
+    releases the GIL) or in the signing call. A signing call that finds the pool empty fills it
+    itself. An exception raised by a background refill (e.g. by :code:`randfunc`) is raised again
+    by the next signing call.
+
+    The signatures are randomized rather than deterministic (RFC 6979, as used by :func:`sign`), so
+    their security depends on :code:`randfunc`.
+
+    Args:
+        |  curve (fastecdsa.curve.Curve): The curve the nonces are for.
+        |  size (int): The number of nonces the pool is filled to.
+        |  refill_threshold (int): A refill starts when fewer nonces are left.
+        |  background (bool): Refill in a background thread instead of in the signing call.
+        |  randfunc (function): A function taking one argument 'n' and returning a bytestring of n
+            random bytes suitable for cryptographic use. The default is "os.urandom".
+    """
+
+    def __init__(
+        self,
+        curve: Curve = P256,
+        size: int = 1024,
+        refill_threshold: int = 256,
+        background: bool = True,
+        randfunc: Callable[[int], bytes] = os.urandom,
+    ) -> None:
+        if size < 1 or not 0 <= refill_threshold <= size:
+            raise ValueError(
+                "size must be positive and refill_threshold between 0 and size"
+            )
+
+        self.curve = curve
+        self.size = size
+        self.refill_threshold = refill_threshold
+        self.background = background
+        self.randfunc = randfunc
+
+        self._lock = threading.Lock()
+        self._nonces: Deque[Tuple[int, int]] = deque()
+        self._refilling = False
+        self._error: Optional[BaseException] = None
+        _nonce_pools.add(self)
+
+    def __len__(self) -> int:
+        return len(self._nonces)
+
+    def fill(self) -> None:
+        """Fill the pool up to :code:`size` nonces in the calling thread."""
+        from .keys import gen_private_key
+
+        count = self.size - len(self._nonces)
+        if count <= 0:
+            return
+
+        nonces = [gen_private_key(self.curve, self.randfunc) for _ in range(count)]
+        precomputed = _ecdsa.precompute_nonces(nonces, self.curve)
+        del nonces
+
+        with self._lock:
+            self._nonces.extend(nonce for nonce in precomputed if nonce[0] != 0)
+
+    def sign(
+        self,
+        msg: SignableMessage,
+        d: int,
+        hashfunc: HashFunction = sha256,
+        prehashed: bool = False,
+    ) -> EcdsaSignature:
+        """Sign a message with a nonce from the pool.
+
+        Args:
+            |  msg (str|bytes|bytearray): A message to be signed.
+            |  d (int): The ECDSA private key of the signer.
+            |  hashfunc (Callable): The hash function used to compress the message.
+            |  prehashed (bool): The message being passed has already been hashed by
+                :code:`hashfunc`.
+
+        Returns:
+            (int, int): The signature (r, s) as a tuple.
+        """
+        q = self.curve.q
+        hashed = _hex_digest(msg, hashfunc, prehashed)
+        e = int(hashed, 16) if hashed else 0
+        if len(hashed) * 4 > self.curve.q_bits:
+            e >>= len(hashed) * 4 - self.curve.q_bits
+
+        while True:
+            r, kinv = self._take()
+            s = kinv * (e + r * d) % q
+            if s != 0:
+                return r, s
+
+    def _take(self) -> Tuple[int, int]:
+        while True:
+            refill = False
+            with self._lock:
+                error, self._error = self._error, None
+                if error is not None:
+                    raise error
+                nonce = self._nonces.popleft() if self._nonces else None
+                if len(self._nonces) < self.refill_threshold and not self._refilling:
+                    self._refilling = refill = True
+
+            if refill:
+                if self.background and nonce is not None:
+                    threading.Thread(
+                        target=self._background_refill, daemon=True
+                    ).start()
+                else:
+                    self._refill()
+            elif nonce is None:
+                # empty while another thread refills, don't wait for it
+                self.fill()
+
+            if nonce is not None:
+                return nonce
+
+    def _refill(self) -> None:
+        try:
+            self.fill()
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def _background_refill(self) -> None:
+        try:
+            self._refill()
+        except Exception as error:
+            # there's no caller to raise it to in this thread, the next signing call raises it
+            with self._lock:
+                self._error = error
+
+    def _after_fork(self) -> None:
+        # the parent may still use these nonces, and its lock may have been held while forking
+        self._lock = threading.Lock()
+        self._nonces.clear()
+        self._refilling = False
+        self._error = None
+
+
+_nonce_pools: "weakref.WeakSet[NoncePool]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for pool in list(_nonce_pools):
+        pool._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _stream_digest(
+    stream: MessageStream, hashfunc: HashFunction, chunk_size: int
+) -> bytes:
+    if hasattr(stream, "read"):
+        hasher = hashfunc()
+        readinto = getattr(stream, "readinto", None)
+
+        if readinto is not None:
+            # binary files, reuse a single buffer for every read
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while n := readinto(buffer):
+                hasher.update(view[:n])
+        else:
+            # text files and readers without readinto
+            while chunk := stream.read(chunk_size):  # type: ignore[union-attr]
+                hasher.update(_chunk_bytes(chunk))
+
+        return hasher.digest()
+
+    elif hasattr(stream, "update") and hasattr(stream, "digest"):
+        name = getattr(stream, "name", None)
+        if name is not None and name != hashfunc().name:
+            raise ValueError(
+                f"Hash object uses {name} but the hash function is {hashfunc().name}"
+            )
+        return stream.digest()  # type: ignore[union-attr]
+
+    else:
+        hasher = hashfunc()
+        for chunk in stream:  # type: ignore[union-attr]
+            hasher.update(_chunk_bytes(chunk))
+        return hasher.digest()
+
+
+def _chunk_bytes(chunk: Any) -> Any:
+    # hash objects accept any buffer, so only text needs to be encoded
+    return chunk.encode() if isinstance(chunk, str) else chunk
 
 
 def _hex_digest(msg: SignableMessage, hashfunc: HashFunction, prehashed: bool) -> str:
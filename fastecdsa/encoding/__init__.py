@@ -28,7 +28,8 @@ class KeyEncoder(ABC):
 class SigEncoder(ABC):
     """Base class that any encoding class for EC signatures should derive from.
 
-    All overriding methods should be static.
+    Overriding methods should be static, unless the encoding depends on parameters given to the
+    encoder's constructor (e.g. the curve of :code:`RawSigEncoder`).
     """
 
     @staticmethod
@@ -1,9 +1,9 @@
-from struct import pack, unpack
-from typing import Tuple
+from struct import pack
+from typing import Iterator, Optional, Tuple, Union
 
 from ..curve import Curve
 from ..point import Point
-from .util import int_bytelen, int_to_bytes
+from .util import int_to_bytes
 
 INTEGER = b"\x02"
 BIT_STRING = b"\x03"
@@ -13,6 +13,13 @@ SEQUENCE = b"\x30"
 PARAMETERS = b"\xa0"
 PUBLIC_KEY = b"\xa1"
 
+# via RFC 5480 - The "unrestricted" algorithm identifier is:
+# id-ecPublicKey OBJECT IDENTIFIER ::= {
+#   iso(1) member-body(2) us(840) ansi-X9-62(10045) keyType(2) 1 }
+EC_PUBLIC_KEY_OID = b"\x2a\x86\x48\xce\x3d\x02\x01"
+
+Buffer = Union[bytes, bytearray, memoryview]
+
 
 class ASN1EncodingError(Exception):
     pass
@@ -42,7 +49,7 @@ def asn1_structure(data_type: bytes, data: bytes) -> bytes:
 
 def asn1_private_key(d: int, curve: Curve) -> bytes:
     d_bytes = int_to_bytes(d)
-    padding = b"\x00" * (int_bytelen(curve.q) - len(d_bytes))
+    padding = b"\x00" * (curve.q_bytes - len(d_bytes))
     return asn1_structure(OCTET_STRING, padding + d_bytes)
 
 
@@ -52,10 +59,7 @@ def asn1_ecversion(version: int = 1) -> bytes:
 
 
 def asn1_ecpublickey() -> bytes:
-    # via RFC 5480 - The "unrestricted" algorithm identifier is:
-    # id-ecPublicKey OBJECT IDENTIFIER ::= {
-    #   iso(1) member-body(2) us(840) ansi-X9-62(10045) keyType(2) 1 }
-    return asn1_structure(OBJECT_IDENTIFIER, b"\x2a\x86\x48\xce\x3d\x02\x01")
+    return asn1_structure(OBJECT_IDENTIFIER, EC_PUBLIC_KEY_OID)
 
 
 def asn1_oid(curve: Curve) -> bytes:
@@ -68,7 +72,7 @@ def asn1_oid(curve: Curve) -> bytes:
 
 
 def asn1_public_key(Q: Point) -> bytes:
-    p_len = int_bytelen(Q.curve.p)
+    p_len = Q.curve.p_bytes
 
     x_bytes = int_to_bytes(Q.x)
     x_padding = b"\x00" * (p_len - len(x_bytes))
@@ -80,6 +84,84 @@ def asn1_public_key(Q: Point) -> bytes:
     return asn1_structure(BIT_STRING, key_bytes)
 
 
+def _read_asn1_length(data: Buffer, offset: int, end: int) -> Tuple[int, int]:
+    """Read the length octets at :code:`data[offset]`, returning the length and its end offset."""
+    if offset >= end:
+        raise ASN1EncodingError("ASN.1 structure is missing its length")
+
+    length = data[offset]
+    offset += 1
+
+    if length & 0x80:
+        count = length & 0x7F
+        if not 0 < count <= 8:
+            raise ASN1EncodingError(
+                f"Unsupported ASN.1 length with {count} length bytes"
+            )
+        if offset + count > end:
+            raise ASN1EncodingError("ASN.1 length bytes are truncated")
+
+        length = int.from_bytes(data[offset : offset + count], "big")
+        offset += count
+
+    if length > end - offset:
+        raise ASN1EncodingError(
+            f"Parsed length of ASN.1 structure to be {length} bytes but only {end - offset} bytes "
+            f"remain in the provided data"
+        )
+
+    return length, offset
+
+
+def read_asn1_header(
+    data: Buffer, offset: int = 0, end: Optional[int] = None
+) -> Tuple[int, int, int]:
+    """
+    Read the tag and length of the ASN.1 value starting at an offset without copying anything.
+
+    Args:
+        |  data (bytes | bytearray | memoryview): A buffer holding ASN.1 encoded data.
+        |  offset (int): The offset of the value's tag in the buffer.
+        |  end (int): The offset the value must end by, the end of the buffer by default.
+
+    Returns:
+        (int, int, int): The tag, and the start and stop offsets of the value's contents.
+
+    Raises:
+        ASN1EncodingError: If the value doesn't fit in :code:`data[offset:end]`.
+    """
+    if end is None:
+        end = len(data)
+    if offset >= end:
+        raise ASN1EncodingError("ASN.1 structure is missing its tag")
+
+    length, start = _read_asn1_length(data, offset + 1, end)
+    return data[offset], start, start + length
+
+
+def iter_asn1(
+    data: Buffer, offset: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Iterate over consecutive ASN.1 values, e.g. the contents of a SEQUENCE.
+
+    Args:
+        |  data (bytes | bytearray | memoryview): A buffer holding ASN.1 encoded data.
+        |  offset (int): The offset of the first value.
+        |  end (int): The offset of the end of the last value, the end of the buffer by default.
+
+    Returns:
+        Iterator[(int, int, int)]: The tag, and the start and stop offsets of the contents of each
+        value (see :func:`read_asn1_header`).
+    """
+    if end is None:
+        end = len(data)
+
+    while offset < end:
+        tag, start, offset = read_asn1_header(data, offset, end)
+        yield tag, start, offset
+
+
 def parse_asn1_length(data: bytes) -> Tuple[int, bytes, bytes]:
     """
     Parse an ASN.1 encoded structure.
@@ -91,26 +173,8 @@ def parse_asn1_length(data: bytes) -> Tuple[int, bytes, bytes]:
         (int, bytes, bytes): A tuple of the integer length in bytes, the byte representation of the integer,
                              and the remaining bytes after the integer bytes in the sequence
     """
-    (initial_byte,) = unpack("=B", data[:1])
-    data = data[1:]
-
-    if not (initial_byte & 0x80):
-        length = initial_byte
-    else:
-        count = initial_byte & 0x7F
-        fmt = {1: "=B", 2: "=H", 3: "=L", 4: "=L", 5: "=Q", 6: "=Q", 7: "=Q", 8: "=Q"}
-        zero_padding = b"\x00" * ((1 << (count.bit_length() - 1)) - count)
-
-        (length,) = unpack(fmt[count], zero_padding + data[:count])
-        data = data[count:]
-
-    if length > len(data):
-        raise ASN1EncodingError(
-            f"Parsed length of ASN.1 structure to be {length} bytes but only {len(data)} bytes"
-            f"remain in the provided data"
-        )
-
-    return length, data[:length], data[length:]
+    length, start = _read_asn1_length(data, 0, len(data))
+    return length, data[start : start + length], data[start + length :]
 
 
 def parse_asn1_int(data: bytes) -> Tuple[int, bytes, bytes]:
@@ -132,12 +196,5 @@ def parse_asn1_int(data: bytes) -> Tuple[int, bytes, bytes]:
     if data[0] != ord(INTEGER):
         raise ASN1EncodingError("Value should be a ASN.1 INTEGER")
 
-    length, data, remaining = parse_asn1_length(data[1:])
-
-    # integer length should match length indicated
-    if length != len(data):
-        raise ASN1EncodingError(
-            f"Expected ASN.1 INTEGER to be {length} bytes, got {len(data)} bytes"
-        )
-
-    return length, data, remaining
+    length, start = _read_asn1_length(data, 1, len(data))
+    return length, data[start : start + length], data[start + length :]
@@ -1,21 +1,39 @@
-from typing import Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from . import SigEncoder
+from fastecdsa import _ecdsa  # type: ignore[attr-defined]
+from . import KeyEncoder, SigEncoder
 from .asn1 import (
-    ASN1EncodingError,
+    BIT_STRING,
+    EC_PUBLIC_KEY_OID,
     INTEGER,
+    OBJECT_IDENTIFIER,
+    OCTET_STRING,
+    PARAMETERS,
+    PUBLIC_KEY,
     SEQUENCE,
+    ASN1EncodingError,
+    asn1_ecpublickey,
+    asn1_ecversion,
+    asn1_oid,
+    asn1_private_key,
+    asn1_public_key,
     asn1_structure,
-    parse_asn1_int,
-    parse_asn1_length,
+    iter_asn1,
+    read_asn1_header,
 )
-from .util import bytes_to_int, int_to_bytes
+from .. import curvemath  # type: ignore[attr-defined]
+from ..curve import Curve
+from ..point import Point
 
 
 class InvalidDerSignature(Exception):
     pass
 
 
+class InvalidDerKey(Exception):
+    pass
+
+
 class DEREncoder(SigEncoder):
     @staticmethod
     def encode_signature(r: int, s: int) -> bytes:
@@ -23,6 +41,8 @@ class DEREncoder(SigEncoder):
            https://tools.ietf.org/html/rfc2459 (section 7.2.2) and as detailed by
            bip-0066
 
+        The encoding is written natively into the returned bytes, without intermediate copies.
+
         Args:
             r, s
 
@@ -30,16 +50,7 @@ class DEREncoder(SigEncoder):
             bytes: The DER encoded signature
 
         """
-        r_bytes = int_to_bytes(r)
-        if r_bytes[0] & 0x80:
-            r_bytes = b"\x00" + r_bytes
-        s_bytes = int_to_bytes(s)
-        if s_bytes[0] & 0x80:
-            s_bytes = b"\x00" + s_bytes
-
-        r_asn1 = asn1_structure(INTEGER, r_bytes)
-        s_asn1 = asn1_structure(INTEGER, s_bytes)
-        return asn1_structure(SEQUENCE, r_asn1 + s_asn1)
+        return _ecdsa.der_encode(r, s)
 
     @staticmethod
     def decode_signature(binary_data: bytes) -> Tuple[int, int]:
@@ -47,42 +58,292 @@ class DEREncoder(SigEncoder):
         https://tools.ietf.org/html/rfc2459 (section 7.2.2) and as detailed by
         bip-0066
 
+        The signature is parsed natively with the strictness of BIP66: all lengths are minimally
+        encoded (the long form is only accepted from 128 bytes on, for large curves) and match the
+        data exactly, r and s are positive and minimally encoded and nothing follows them.
+
         Args:
             binary_data (bytes): A sequence of bytes respresenting an ECDSA signature.
 
         Returns (r,s)
         """
+        try:
+            return _ecdsa.der_decode(binary_data)
+        except ValueError as error:
+            raise InvalidDerSignature(str(error)) from None
+
+    @staticmethod
+    def encode_signatures(sigs: Sequence[Tuple[int, int]]) -> List[bytes]:
+        """Encode many EC signatures in serialized DER format in one native call.
+
+        Args:
+            sigs (list[(int, int)]): The signatures (r, s).
+
+        Returns:
+            list[bytes]: The DER encoded signatures, in the same order.
+        """
+        return _ecdsa.der_encode_many(sigs)
 
-        def _validate_int_bytes(data: bytes) -> None:
-            # check for negative values, indicated by leading 1 bit
-            if data[0] & 0x80:
-                raise InvalidDerSignature("Signature contains a negative value")
+    @staticmethod
+    def decode_signatures(sigs: Sequence[bytes]) -> List[Tuple[int, int]]:
+        """Decode many EC signatures from serialized DER format in one native call, see
+        :meth:`decode_signature`.
 
-            # check for leading 0x00s that aren't there to disambiguate possible negative values
-            if data[0] == 0x00 and not data[1] & 0x80:
-                raise InvalidDerSignature("Invalid leading 0x00 byte in ASN.1 integer")
+        Args:
+            sigs (list[bytes]): The DER encoded signatures.
 
-        # overarching structure must be a sequence
-        if not binary_data or binary_data[0] != ord(SEQUENCE):
-            raise InvalidDerSignature("First byte should be ASN.1 SEQUENCE")
+        Returns:
+            list[(int, int)]: The signatures (r, s), in the same order.
 
+        Raises:
+            InvalidDerSignature: If a signature is invalid (the message gives its index).
+        """
         try:
-            seqlen, sequence, leftover = parse_asn1_length(binary_data[1:])
-        except ASN1EncodingError as asn1_error:
-            raise InvalidDerSignature(asn1_error)
-
-        # sequence should be entirety remaining data
-        if leftover:
-            raise InvalidDerSignature(
-                f"Expected a sequence of {seqlen} bytes, got {len(sequence + leftover)}"
+            return _ecdsa.der_decode_many(sigs)
+        except ValueError as error:
+            raise InvalidDerSignature(str(error)) from None
+
+
+class DERKeyEncoder(KeyEncoder):
+    """Encode keys in binary DER, the contents of a PEM file without its base64 armor.
+
+    Public keys are SubjectPublicKeyInfo structures as described in
+    `RFC 5480 <https://tools.ietf.org/html/rfc5480>`_ and private keys are ECPrivateKey structures
+    as described in `RFC 5915 <https://tools.ietf.org/html/rfc5915.html>`_. The curve of a key is
+    read from the object identifier it embeds. Keys are parsed in place with
+    :func:`fastecdsa.encoding.asn1.iter_asn1`, without copying their parts.
+    """
+
+    binary_data = True
+
+    def encode_public_key(self, Q: Point) -> bytes:
+        """Encode an EC public key as a SubjectPublicKeyInfo.
+
+        Args:
+            |  Q (fastecdsa.point.Point): An ECDSA public key.
+
+        Returns:
+            bytes: The DER encoded public key.
+        """
+        algorithm = asn1_structure(SEQUENCE, asn1_ecpublickey() + asn1_oid(Q.curve))
+        return asn1_structure(SEQUENCE, algorithm + asn1_public_key(Q))
+
+    def encode_private_key(self, d: int, curve: Curve) -> bytes:
+        """Encode an EC private key as an ECPrivateKey, including its curve and public key.
+
+        Args:
+            |  d (int): An ECDSA private key.
+            |  curve (fastecdsa.curve.Curve): The curve that the private key is for.
+
+        Returns:
+            bytes: The DER encoded private key.
+        """
+        Q: Point = d * curve.G
+
+        version = asn1_ecversion()
+        private_key = asn1_private_key(d, curve)
+        parameters = asn1_structure(PARAMETERS, asn1_oid(curve))
+        public_key = asn1_structure(PUBLIC_KEY, asn1_public_key(Q))
+
+        return asn1_structure(SEQUENCE, version + private_key + parameters + public_key)
+
+    def decode_public_key(self, key: bytes, curve: Optional[Curve] = None) -> Point:
+        """Decode a DER encoded SubjectPublicKeyInfo.
+
+        Args:
+            |  key (bytes): The DER encoded public key, any bytes-like object is accepted.
+            |  curve (fastecdsa.curve.Curve): The curve to use if the key doesn't name a curve
+                known to fastecdsa.
+
+        Returns:
+            fastecdsa.point.Point: The public key, on the curve named by the key.
+
+        Raises:
+            InvalidDerKey: If the key is malformed or not a point on its curve.
+        """
+        point, curve = self._parse_public_key(key, curve)
+        return self._decode_point(point, curve)
+
+    def decode_public_keys(
+        self, keys: Sequence[bytes], curve: Optional[Curve] = None
+    ) -> List[Point]:
+        """Decode many DER encoded SubjectPublicKeyInfo structures.
+
+        The points of the keys are decompressed and checked to be on their curve in one native call
+        per curve (see :func:`fastecdsa.curvemath.decode_public_keys`).
+
+        Args:
+            |  keys (list[bytes]): The DER encoded public keys.
+            |  curve (fastecdsa.curve.Curve): The curve to use for keys that don't name a curve
+                known to fastecdsa.
+
+        Returns:
+            list[fastecdsa.point.Point]: The public keys, in the same order.
+
+        Raises:
+            InvalidDerKey: If a key is invalid (the message gives its index).
+        """
+        points: List[memoryview] = []
+        by_curve: Dict[Curve, List[int]] = {}
+        for i, key in enumerate(keys):
+            try:
+                point, key_curve = self._parse_public_key(key, curve)
+            except InvalidDerKey as error:
+                raise InvalidDerKey(f"Invalid key at index {i}: {error}") from None
+            points.append(point)
+            by_curve.setdefault(key_curve, []).append(i)
+
+        decoded: List[Point] = [None] * len(points)  # type: ignore[list-item]
+        for key_curve, indices in by_curve.items():
+            try:
+                natives = curvemath.decode_public_keys(
+                    [points[i] for i in indices], key_curve
+                )
+            except ValueError as error:
+                # the native decoder gives the index within this curve's keys
+                raise InvalidDerKey(
+                    f"Invalid key at index {indices[error.index]}: {error}"
+                ) from None
+            for i, native in zip(indices, natives):
+                decoded[i] = Point._from_native(native, key_curve)
+
+        return decoded
+
+    def decode_private_key(self, key: bytes) -> int:
+        """Decode a DER encoded ECPrivateKey.
+
+        Args:
+            |  key (bytes): The DER encoded private key, any bytes-like object is accepted.
+
+        Returns:
+            int: The private key.
+
+        Raises:
+            InvalidDerKey: If the key is malformed or out of range for its curve.
+        """
+        view = memoryview(key)
+        try:
+            values = self._parse_sequence(view)
+            tags = [tag for tag, _, _ in values]
+            if tags[:2] != [INTEGER[0], OCTET_STRING[0]]:
+                raise InvalidDerKey(
+                    "ECPrivateKey must start with a version and a private key"
+                )
+
+            _, start, stop = values[0]
+            if view[start:stop] != b"\x01":
+                raise InvalidDerKey("Unsupported ECPrivateKey version")
+
+            curve = None
+            for tag, start, stop in values[2:]:
+                if tag == PARAMETERS[0] and start < stop:
+                    curve = self._parse_curve(view, start, stop)
+                elif tag not in (PARAMETERS[0], PUBLIC_KEY[0]):
+                    raise InvalidDerKey(f"Unexpected tag 0x{tag:02x} in ECPrivateKey")
+        except ASN1EncodingError as error:
+            raise InvalidDerKey(str(error)) from None
+
+        _, start, stop = values[1]
+        d = int.from_bytes(view[start:stop], "big")
+        if d == 0 or (curve is not None and d >= curve.q):
+            raise InvalidDerKey("Private key is out of range for its curve")
+
+        return d
+
+    def decode_private_keys(self, keys: Sequence[bytes]) -> List[int]:
+        """Decode many DER encoded ECPrivateKey structures, see :meth:`decode_private_key`.
+
+        Args:
+            |  keys (list[bytes]): The DER encoded private keys.
+
+        Returns:
+            list[int]: The private keys, in the same order.
+
+        Raises:
+            InvalidDerKey: If a key is invalid (the message gives its index).
+        """
+        decoded = []
+        for i, key in enumerate(keys):
+            try:
+                decoded.append(self.decode_private_key(key))
+            except InvalidDerKey as error:
+                raise InvalidDerKey(f"Invalid key at index {i}: {error}") from None
+        return decoded
+
+    @staticmethod
+    def _parse_sequence(view: memoryview) -> List[Tuple[int, int, int]]:
+        """Get the (tag, start, stop) of the values of the SEQUENCE making up all of a key."""
+        tag, start, stop = read_asn1_header(view)
+        if tag != SEQUENCE[0] or stop != len(view):
+            raise InvalidDerKey("A key must be a single SEQUENCE")
+        return list(iter_asn1(view, start, stop))
+
+    @staticmethod
+    def _parse_curve(view: memoryview, start: int, stop: int) -> Optional[Curve]:
+        """Get the curve named by the object identifier in view[start:stop], if it's known."""
+        tag, oid_start, oid_stop = read_asn1_header(view, start, stop)
+        if tag != OBJECT_IDENTIFIER[0] or oid_stop != stop:
+            raise InvalidDerKey(
+                "Only curves named by an object identifier are supported"
             )
+        return Curve.get_curve_by_oid(bytes(view[oid_start:oid_stop]))
 
+    def _parse_public_key(
+        self, key: bytes, curve: Optional[Curve]
+    ) -> Tuple[memoryview, Curve]:
+        """Get a view of the SEC1 encoded point of a SubjectPublicKeyInfo and its curve."""
+        view = memoryview(key)
         try:
-            rlen, r, sdata = parse_asn1_int(sequence)
-            slen, s, _ = parse_asn1_int(sdata)
-        except ASN1EncodingError as asn1_error:
-            raise InvalidDerSignature(asn1_error)
-
-        _validate_int_bytes(r)
-        _validate_int_bytes(s)
-        return bytes_to_int(r), bytes_to_int(s)
+            values = self._parse_sequence(view)
+            if [tag for tag, _, _ in values] != [SEQUENCE[0], BIT_STRING[0]]:
+                raise InvalidDerKey(
+                    "SubjectPublicKeyInfo must hold an algorithm and a key"
+                )
+
+            _, start, stop = values[0]
+            tag, oid_start, oid_stop = read_asn1_header(view, start, stop)
+            if (
+                tag != OBJECT_IDENTIFIER[0]
+                or view[oid_start:oid_stop] != EC_PUBLIC_KEY_OID
+            ):
+                raise InvalidDerKey("Not an EC public key")
+            if oid_stop < stop:
+                curve = self._parse_curve(view, oid_stop, stop) or curve
+        except ASN1EncodingError as error:
+            raise InvalidDerKey(str(error)) from None
+
+        if curve is None:
+            raise InvalidDerKey("The curve of the public key is unknown")
+
+        # the first byte of a BIT STRING is its number of unused bits
+        _, start, stop = values[1]
+        if start == stop or view[start] != 0:
+            raise InvalidDerKey("Invalid public key BIT STRING")
+
+        return view[start + 1 : stop], curve
+
+    @staticmethod
+    def _decode_point(point: memoryview, curve: Curve) -> Point:
+        """Decode a SEC1 encoded point whose coordinates have the byte length of the field."""
+        bytelen = curve.p_bytes
+        prefix = point[0] if point else None
+
+        if prefix == 4 and len(point) == 2 * bytelen + 1:
+            x = int.from_bytes(point[1 : bytelen + 1], "big")
+            y = int.from_bytes(point[bytelen + 1 :], "big")
+            try:
+                return Point(x, y, curve)
+            except ValueError as error:
+                raise InvalidDerKey(str(error)) from None
+
+        if prefix in (2, 3) and len(point) == bytelen + 1:
+            x = int.from_bytes(point[1:], "big")
+            try:
+                y = curvemath.decompress(x, prefix == 3, curve)
+            except ValueError as error:
+                raise InvalidDerKey(str(error)) from None
+            return Point._trusted(x, y, curve)
+
+        raise InvalidDerKey(
+            f"A public key must be 04 + {2 * bytelen} bytes or 02 / 03 + {bytelen} bytes"
+        )
@@ -0,0 +1,92 @@
+from typing import List, Sequence, Tuple
+
+from fastecdsa import _ecdsa  # type: ignore[attr-defined]
+from . import SigEncoder
+from ..curve import Curve
+
+
+class InvalidRawSignature(Exception):
+    pass
+
+
+class RawSigEncoder(SigEncoder):
+    """Encode signatures as fixed width :code:`r || s`.
+
+    This is the encoding of JWS / JWT (ES256, ES384 and ES512, see RFC 7518 section 3.4) and of most
+    blockchain formats: :math:`r` and :math:`s` as big endian integers, each padded to the byte
+    length of the curve order. Unlike DER the width depends on the curve, so the encoder is created
+    for a curve. Encoding and decoding are native and copy the integers' digits directly.
+
+    Args:
+        |  curve (fastecdsa.curve.Curve): The curve the signatures are on.
+    """
+
+    def __init__(self, curve: Curve) -> None:
+        self.curve = curve
+        self.width = curve.q_bytes
+
+    def encode_signature(self, r: int, s: int) -> bytes:  # type: ignore[override]
+        """Encode a signature.
+
+        Args:
+            |  r (int): The r value of the signature.
+            |  s (int): The s value of the signature.
+
+        Returns:
+            bytes: The :code:`2 * width` bytes of :code:`r || s`.
+
+        Raises:
+            ValueError: If r or s is negative or doesn't fit in :code:`width` bytes.
+        """
+        return _ecdsa.encode_raw(r, s, self.width)
+
+    def decode_signature(self, binary_data: bytes) -> Tuple[int, int]:  # type: ignore[override]
+        """Decode a signature.
+
+        Args:
+            |  binary_data (bytes): The :code:`2 * width` bytes of :code:`r || s`.
+
+        Returns:
+            (int, int): The signature (r, s) as a tuple.
+
+        Raises:
+            InvalidRawSignature: If the signature doesn't have the right length.
+        """
+        try:
+            return _ecdsa.decode_raw(binary_data, self.width)
+        except ValueError as error:
+            raise InvalidRawSignature(str(error)) from None
+
+    def encode_signatures(self, rs: Sequence[int], ss: Sequence[int]) -> bytes:
+        """Encode many signatures into one contiguous buffer.
+
+        Args:
+            |  rs (list[int]): The r values of the signatures.
+            |  ss (list[int]): The s values of the signatures, in the same order.
+
+        Returns:
+            bytes: The encoded signatures back to back, :code:`2 * width` bytes each.
+
+        Raises:
+            ValueError: If the lists have different lengths or a value doesn't fit in
+                :code:`width` bytes.
+        """
+        return _ecdsa.encode_raw_many(rs, ss, self.width)
+
+    def decode_signatures(self, binary_data: bytes) -> Tuple[List[int], List[int]]:
+        """Decode a contiguous buffer of signatures.
+
+        Args:
+            |  binary_data (bytes): Encoded signatures back to back, :code:`2 * width` bytes each.
+
+        Returns:
+            (list[int], list[int]): The r values and the s values of the signatures.
+
+        Raises:
+            InvalidRawSignature: If the length of the data is not a multiple of the size of a
+                signature.
+        """
+        try:
+            return _ecdsa.decode_raw_many(binary_data, self.width)
+        except ValueError as error:
+            raise InvalidRawSignature(str(error)) from None
@@ -1,8 +1,10 @@
+from typing import List, Sequence
+
 from . import KeyEncoder
-from .util import bytes_to_int, int_bytelen, int_to_bytes
+from .util import bytes_to_int, int_to_bytes
+from .. import curvemath  # type: ignore[attr-defined]
 from ..curve import Curve
 from ..point import Point
-from ..util import mod_sqrt
 
 
 class InvalidSEC1PublicKey(Exception):
@@ -24,7 +26,7 @@ class SEC1Encoder(KeyEncoder):
         Returns:
             bytes: The SEC1 encoded public key
         """
-        bytelen = int_bytelen(Q.curve.q)
+        bytelen = Q.curve.p_bytes
         if compressed:
             if Q.y & 1:  # odd root
                 return b"\x03" + int_to_bytes(Q.x, bytelen)
@@ -49,7 +51,7 @@ class SEC1Encoder(KeyEncoder):
         Raises:
             InvalidSEC1PublicKey
         """
-        bytelen = int_bytelen(curve.q)
+        bytelen = curve.p_bytes
         if key.startswith(b"\x04"):  # uncompressed key
             if len(key) != bytelen * 2 + 1:
                 raise InvalidSEC1PublicKey(
@@ -62,16 +64,43 @@ class SEC1Encoder(KeyEncoder):
                 raise InvalidSEC1PublicKey(
                     "A compressed public key must be %d bytes long" % (bytelen + 1)
                 )
-            x = bytes_to_int(key[1:])
-            root = mod_sqrt(curve.evaluate(x), curve.p)[0]
-            if key.startswith(b"\x03"):  # odd root
-                y = root if root % 2 == 1 else -root % curve.p
-            elif key.startswith(b"\x02"):  # even root
-                y = root if root % 2 == 0 else -root % curve.p
-            else:
+            if not key.startswith((b"\x02", b"\x03")):
                 raise InvalidSEC1PublicKey("Wrong key format")
+
+            # the y coordinate is computed (and the point checked) natively
+            x = bytes_to_int(key[1:])
+            try:
+                y = curvemath.decompress(x, key.startswith(b"\x03"), curve)
+            except ValueError as e:
+                raise InvalidSEC1PublicKey(str(e)) from e
+            return Point._trusted(x, y, curve)
         return Point(x, y, curve=curve)
 
+    def decode_public_keys(self, keys: Sequence[bytes], curve: Curve) -> List[Point]:
+        """Decode many SEC1 encoded public keys (compressed or uncompressed) at once.
+
+        The keys are parsed, decompressed and checked to be on the curve in a single call to the C
+        extension, which releases the GIL while it does the arithmetic.
+
+        Args:
+            keys (Sequence[bytes]): public keys encoded using the SEC1 format, any bytes-like
+                objects are accepted
+            curve (fastecdsa.curve.Curve): Curve to use when decoding the public keys
+
+        Returns:
+            List[Point]: The decoded public keys, in the same order as the encodings
+
+        Raises:
+            InvalidSEC1PublicKey: If any of the keys is malformed or not a point on the curve
+        """
+        try:
+            natives = curvemath.decode_public_keys(keys, curve)
+        except ValueError as e:
+            raise InvalidSEC1PublicKey(
+                f"Invalid SEC1 public key at index {e.index}: {e}"
+            ) from e
+        return [Point._from_native(native, curve) for native in natives]
+
     def encode_private_key(self, d: int, curve: Curve) -> bytes:
         raise NotImplementedError("SEC1Encoder only encodes public keys")
 
@@ -2,13 +2,7 @@ from typing import Optional
 
 
 def int_bytelen(x: int) -> int:
-    length = 0
-
-    while x:
-        length += 1
-        x >>= 8
-
-    return length
+    return (x.bit_length() + 7) // 8
 
 
 def int_to_bytes(x: int, length: Optional[int] = None) -> bytes:
@@ -0,0 +1,93 @@
+import os
+import threading
+import weakref
+from typing import Callable
+
+# size of the blocks read from the operating system by BufferedRandom
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+
+class BufferedRandom:
+    """A random source that reads entropy from the operating system in large blocks.
+
+    Instances are callables with the same signature as :func:`os.urandom` and can be passed as the
+    :code:`randfunc` of key and nonce generation. Requests are served from a buffer that is refilled
+    with one call to :code:`source` per :code:`block_size` bytes, instead of one system call per
+    request. Requests of at least :code:`block_size` bytes are passed to :code:`source` directly.
+    This pays off where system calls are expensive, when the calling code can't draw its randomness
+    in bulk (e.g. :func:`fastecdsa.keys.gen_private_key` called once per key), but where reading
+    entropy is cheap the Python call of each request costs more than it saves.
+
+    Bytes are handed out once and overwritten with zeros in the buffer, so it never holds bytes
+    that were already returned. Instances are thread safe, and a forked child process discards the
+    buffer it inherited, so the parent and the child never return the same bytes.
+
+    Args:
+        |  block_size (int): The number of bytes read from :code:`source` at a time.
+        |  source (function): A function taking one argument 'n' and returning a bytestring of n
+            random bytes suitable for cryptographic use. The default is "os.urandom".
+    """
+
+    def __init__(
+        self,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        source: Callable[[int], bytes] = os.urandom,
+    ) -> None:
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+
+        self.block_size = block_size
+        self.source = source
+
+        self._lock = threading.Lock()
+        self._buffer = memoryview(bytearray())
+        self._offset = 0
+        _buffered_randoms.add(self)
+
+    def __call__(self, n: int) -> bytes:
+        if n < 0:
+            raise ValueError("negative argument not allowed")
+        elif n >= self.block_size:
+            return self.source(n)
+
+        with self._lock:
+            buffer, offset = self._buffer, self._offset
+            end = offset + n
+            if end > len(buffer):
+                refilled = bytearray(buffer[offset:])
+                refilled += self.source(self.block_size)
+                _wipe(buffer)
+                self._buffer = buffer = memoryview(refilled)
+                offset, end = 0, n
+
+            result = buffer[offset:end].tobytes()
+            buffer[offset:end] = bytes(n)
+            self._offset = end
+            return result
+
+    def _after_fork(self) -> None:
+        # the lock may have been held by another thread of the parent while forking
+        self._lock = threading.Lock()
+        _wipe(self._buffer)
+        self._buffer = memoryview(bytearray())
+        self._offset = 0
+
+
+def _wipe(buffer: memoryview) -> None:
+    buffer[:] = bytes(len(buffer))
+
+
+_buffered_randoms: "weakref.WeakSet[BufferedRandom]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for random in list(_buffered_randoms):
+        random._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# a shared buffered random source, e.g. for gen_private_key(curve, randfunc=entropy.urandom)
+urandom = BufferedRandom()
@@ -0,0 +1,537 @@
+import hashlib
+import hmac
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from fastecdsa import curvemath  # type: ignore[attr-defined]
+from .curve import secp256k1
+from .encoding.sec1 import InvalidSEC1PublicKey, SEC1Encoder
+from .point import Point
+
+# child indices from this one on are hardened
+HARDENED = 0x80000000
+
+# number of derived nodes kept by a node cache by default
+DEFAULT_CACHE_SIZE = 1024
+
+_SEED_KEY = b"Bitcoin seed"
+_VERSIONS = {
+    # version: (private, testnet)
+    0x0488ADE4: (True, False),  # xprv
+    0x0488B21E: (False, False),  # xpub
+    0x04358394: (True, True),  # tprv
+    0x043587CF: (False, True),  # tpub
+}
+_BASE58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+class HDError(Exception):
+    def __init__(self, msg: str) -> None:
+        self.msg = msg
+
+
+class NodeCache:
+    """A bounded cache of derived nodes, the least recently used node is evicted first.
+
+    Caching is opt-in: a cache passed to :meth:`HDKey.from_seed` (or :meth:`HDKey.deserialize`) is
+    shared by all the nodes derived from that root, and :meth:`HDKey.child` (and so
+    :meth:`HDKey.derive`) looks nodes up here before deriving them, so the shared part of paths
+    (e.g. :code:`m/44'/0'/0'/0`) is only derived once. Note that the cache holds the private keys
+    of the nodes it contains, call :meth:`clear` when they are no longer needed.
+
+    Args:
+        |  maxsize (int): The maximum number of nodes kept, :code:`0` disables the cache.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+
+        self.maxsize = maxsize
+        self._nodes: "OrderedDict[Tuple[Any, ...], HDKey]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def clear(self) -> None:
+        """Remove all nodes from the cache."""
+        with self._lock:
+            self._nodes.clear()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional["HDKey"]:
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is not None:
+                self._nodes.move_to_end(key)
+            return node
+
+    def put(self, key: Tuple[Any, ...], node: "HDKey") -> None:
+        if self.maxsize == 0:
+            return
+
+        with self._lock:
+            self._nodes[key] = node
+            self._nodes.move_to_end(key)
+            while len(self._nodes) > self.maxsize:
+                self._nodes.popitem(last=False)
+
+
+class HDKey:
+    """An extended key of a BIP32 hierarchical deterministic wallet on secp256k1.
+
+    A private extended key derives private and public children, a public extended key (see
+    :meth:`neuter`) only non-hardened public children. :meth:`child` and :meth:`derive` derive
+    single nodes, through a :class:`NodeCache` if one was given, :meth:`children` derives a range
+    of siblings at once: their public keys are computed in one native call from a fixed base table
+    of the generator and normalized with a single inversion per chunk.
+
+    The public key of a private node is only computed when it is needed (e.g. to derive a
+    non-hardened child), so hardened paths cost one HMAC per level.
+
+    Args:
+        |  chain_code (bytes): The 32 byte chain code.
+        |  d (int|None): The private key, or :code:`None` for a public extended key.
+        |  Q (fastecdsa.point.Point|None): The public key, computed from :code:`d` if not given.
+        |  depth (int): The depth of the node, 0 for the master node.
+        |  parent_fingerprint (bytes): The fingerprint of the parent's key, zeros for the master
+            node.
+        |  child_number (int): The index of the node in its parent.
+        |  cache (NodeCache|None): The cache used to derive children, shared with the nodes derived
+            from this one. :code:`None` (the default) disables caching.
+    """
+
+    __slots__ = (
+        "chain_code",
+        "depth",
+        "child_number",
+        "cache",
+        "_d",
+        "_Q",
+        "_public_key",
+        "_parent_key",
+        "_parent_fingerprint",
+    )
+
+    def __init__(
+        self,
+        chain_code: bytes,
+        d: Optional[int] = None,
+        Q: Optional[Point] = None,
+        depth: int = 0,
+        parent_fingerprint: bytes = b"\x00" * 4,
+        child_number: int = 0,
+        cache: Optional[NodeCache] = None,
+    ) -> None:
+        if len(chain_code) != 32:
+            raise HDError("The chain code must be 32 bytes long")
+        elif d is None and Q is None:
+            raise HDError("An extended key needs a private or a public key")
+        elif d is not None and not 0 < d < secp256k1.q:
+            raise HDError("The private key must be between 1 and the curve order")
+        elif Q is not None and (Q.curve is not secp256k1 or Q._is_identity()):
+            raise HDError("The public key must be a point on secp256k1")
+        elif not 0 <= depth <= 255 or not 0 <= child_number < 2**32:
+            raise HDError("The depth or child number is out of range")
+        elif len(parent_fingerprint) != 4:
+            raise HDError("The parent fingerprint must be 4 bytes long")
+
+        self.chain_code = bytes(chain_code)
+        self.depth = depth
+        self.child_number = child_number
+        self.cache = cache
+        self._d = d
+        self._Q = Q
+        self._public_key: Optional[bytes] = None
+        self._parent_key: Optional[bytes] = None
+        self._parent_fingerprint: Optional[bytes] = bytes(parent_fingerprint)
+
+    @classmethod
+    def _derived(
+        cls,
+        parent: "HDKey",
+        index: int,
+        chain_code: bytes,
+        d: Optional[int],
+        Q: Optional[Point],
+        public_key: Optional[bytes] = None,
+    ) -> "HDKey":
+        """Build a child node without validating it, for keys the derivation computed itself."""
+        node = cls.__new__(cls)
+        node.chain_code = chain_code
+        node.depth = parent.depth + 1
+        node.child_number = index
+        node.cache = parent.cache
+        node._d = d
+        node._Q = Q
+        node._public_key = public_key
+        node._parent_key = parent.public_key
+        node._parent_fingerprint = None
+        return node
+
+    @classmethod
+    def from_seed(cls, seed: bytes, cache: Optional[NodeCache] = None) -> "HDKey":
+        """Generate the master node of a wallet from a seed.
+
+        Args:
+            |  seed (bytes): The seed, between 16 and 64 bytes long.
+            |  cache (NodeCache|None): The cache used to derive children.
+
+        Returns:
+            HDKey: The master private extended key.
+        """
+        if not 16 <= len(seed) <= 64:
+            raise HDError("The seed must be between 16 and 64 bytes long")
+
+        digest = hmac.digest(_SEED_KEY, seed, "sha512")
+        d = int.from_bytes(digest[:32], "big")
+        if not 0 < d < secp256k1.q:
+            raise HDError("The seed gives an invalid master key, use another seed")
+        return cls(digest[32:], d=d, cache=cache)
+
+    @property
+    def is_private(self) -> bool:
+        """bool: Whether this is a private extended key."""
+        return self._d is not None
+
+    @property
+    def d(self) -> Optional[int]:
+        """int|None: The private key, :code:`None` for a public extended key."""
+        return self._d
+
+    @property
+    def Q(self) -> Point:
+        """fastecdsa.point.Point: The public key."""
+        if self._Q is None:
+            assert self._d is not None
+            self._Q = _mul_base([self._d])[0]
+        return self._Q
+
+    @property
+    def public_key(self) -> bytes:
+        """bytes: The compressed SEC1 encoding of the public key."""
+        if self._public_key is None:
+            self._public_key = SEC1Encoder().encode_public_key(self.Q, compressed=True)
+        return self._public_key
+
+    @property
+    def identifier(self) -> bytes:
+        """bytes: The identifier of the key, the RIPEMD-160 hash of the SHA-256 hash of its public
+        key."""
+        return _hash160(self.public_key)
+
+    @property
+    def fingerprint(self) -> bytes:
+        """bytes: The first 4 bytes of the identifier."""
+        return self.identifier[:4]
+
+    @property
+    def parent_fingerprint(self) -> bytes:
+        """bytes: The fingerprint of the parent's key, zeros for the master node."""
+        if self._parent_fingerprint is None:
+            assert self._parent_key is not None
+            self._parent_fingerprint = _hash160(self._parent_key)[:4]
+        return self._parent_fingerprint
+
+    def neuter(self) -> "HDKey":
+        """Get the public extended key of this node.
+
+        Returns:
+            HDKey: The extended key without its private key.
+        """
+        node = HDKey.__new__(HDKey)
+        node.chain_code = self.chain_code
+        node.depth = self.depth
+        node.child_number = self.child_number
+        node.cache = self.cache
+        node._d = None
+        node._Q = self.Q
+        node._public_key = self._public_key
+        node._parent_key = self._parent_key
+        node._parent_fingerprint = self._parent_fingerprint
+        return node
+
+    def child(self, index: int) -> "HDKey":
+        """Derive a child node, through the node cache if there is one.
+
+        Args:
+            |  index (int): The index of the child, :data:`HARDENED` and above for hardened
+                children.
+
+        Returns:
+            HDKey: The child node, private if this node is private.
+
+        Raises:
+            HDError: If the index is out of range, a hardened child of a public key is asked for,
+                or the child key is invalid (probability below :math:`2^{-127}`, BIP32 says to
+                skip to the next index).
+        """
+        if not 0 <= index < 2**32:
+            raise HDError("The child index must be between 0 and 2^32 - 1")
+
+        if self.cache is None:
+            return self._derive_child(index)
+
+        key = (
+            self._d if self._d is not None else self.public_key,
+            self.chain_code,
+            self.depth,
+            index,
+        )
+        node = self.cache.get(key)
+        if node is None:
+            node = self._derive_child(index)
+            self.cache.put(key, node)
+        return node
+
+    def derive(self, path: Union[str, Sequence[int]]) -> "HDKey":
+        """Derive a descendant node, e.g. :code:`key.derive("m/44'/0'/0'/0/7")`.
+
+        Args:
+            |  path (str|list[int]): The path from this node, either a string of indices separated
+                by :code:`/` with an optional leading :code:`m` and hardened indices marked by
+                :code:`'` or :code:`h`, or a list of indices.
+
+        Returns:
+            HDKey: The descendant node.
+        """
+        node = self
+        for index in parse_path(path) if isinstance(path, str) else path:
+            node = node.child(index)
+        return node
+
+    def children(self, start: int, stop: int) -> List["HDKey"]:
+        """Derive the children with the indices in :code:`range(start, stop)`.
+
+        This is equivalent to calling :meth:`child` for every index, but the public keys of all the
+        children are computed in one native call. The children are not added to the node cache.
+
+        Args:
+            |  start (int): The index of the first child.
+            |  stop (int): The index after the last child, the range may not cross
+                :data:`HARDENED`.
+
+        Returns:
+            list[HDKey]: The child nodes, in index order.
+
+        Raises:
+            HDError: If the range is invalid or a child key is invalid (the message gives its
+                index).
+        """
+        if not 0 <= start <= stop <= 2**32 or start < HARDENED < stop:
+            raise HDError("The child indices must be in [0, 2^31) or [2^31, 2^32)")
+
+        q = secp256k1.q
+        prefix = self._hmac_prefix(start)
+        chain_codes, tweaks = [], []
+        for index in range(start, stop):
+            digest = hmac.digest(
+                self.chain_code, prefix + index.to_bytes(4, "big"), "sha512"
+            )
+            tweak = int.from_bytes(digest[:32], "big")
+            if tweak >= q:
+                raise HDError(f"The child at index {index} is invalid")
+            tweaks.append(tweak)
+            chain_codes.append(digest[32:])
+
+        if self._d is not None:
+            ds: List[Optional[int]] = [(tweak + self._d) % q for tweak in tweaks]
+            data = curvemath.mul_base_many(ds, secp256k1)
+        else:
+            ds = [None] * len(tweaks)
+            data = curvemath.mul_base_many(tweaks, secp256k1, self.Q)
+
+        size = secp256k1.p_bytes
+        children = []
+        for i, index in enumerate(range(start, stop)):
+            offset = 2 * size * i
+            x_bytes = data[offset : offset + size]
+            x = int.from_bytes(x_bytes, "big")
+            y = int.from_bytes(data[offset + size : offset + 2 * size], "big")
+            if x == 0 and y == 0:
+                raise HDError(f"The child at index {index} is invalid")
+
+            Q = Point._trusted(x, y, secp256k1)
+            public_key = (b"\x03" if y & 1 else b"\x02") + x_bytes
+            children.append(
+                self._derived(self, index, chain_codes[i], ds[i], Q, public_key)
+            )
+
+        return children
+
+    def serialize(self, testnet: bool = False) -> str:
+        """Serialize the extended key (e.g. :code:`xprv...` / :code:`xpub...`).
+
+        Args:
+            |  testnet (bool): Use the testnet versions (:code:`tprv` / :code:`tpub`).
+
+        Returns:
+            str: The Base58Check encoded extended key.
+        """
+        version = next(
+            v for v, flags in _VERSIONS.items() if flags == (self.is_private, testnet)
+        )
+        key = (
+            b"\x00" + self._d.to_bytes(32, "big")
+            if self._d is not None
+            else self.public_key
+        )
+        data = (
+            version.to_bytes(4, "big")
+            + bytes([self.depth])
+            + self.parent_fingerprint
+            + self.child_number.to_bytes(4, "big")
+            + self.chain_code
+            + key
+        )
+        return _base58check_encode(data)
+
+    @classmethod
+    def deserialize(cls, encoded: str, cache: Optional[NodeCache] = None) -> "HDKey":
+        """Parse a serialized extended key.
+
+        Args:
+            |  encoded (str): The Base58Check encoded extended key.
+            |  cache (NodeCache|None): The cache used to derive children.
+
+        Returns:
+            HDKey: The extended key.
+
+        Raises:
+            HDError: If the extended key is malformed.
+        """
+        data = _base58check_decode(encoded)
+        if len(data) != 78:
+            raise HDError("An extended key is 78 bytes long")
+
+        version = int.from_bytes(data[:4], "big")
+        if version not in _VERSIONS:
+            raise HDError(f"Unknown extended key version {data[:4].hex()}")
+
+        depth, parent_fingerprint = data[4], data[5:9]
+        child_number = int.from_bytes(data[9:13], "big")
+        chain_code, key = data[13:45], data[45:]
+        if depth == 0 and (parent_fingerprint != b"\x00" * 4 or child_number != 0):
+            raise HDError("A master key has no parent")
+
+        private, _ = _VERSIONS[version]
+        if private:
+            if key[0] != 0:
+                raise HDError("Invalid private key prefix")
+            d = int.from_bytes(key[1:], "big")
+            return cls(
+                chain_code, d, None, depth, parent_fingerprint, child_number, cache
+            )
+
+        if key[0] not in (2, 3):
+            raise HDError("The public key of an extended key must be compressed")
+        try:
+            Q = SEC1Encoder().decode_public_key(key, secp256k1)
+        except (InvalidSEC1PublicKey, ValueError) as error:
+            raise HDError(f"Invalid public key: {error}") from None
+        return cls(chain_code, None, Q, depth, parent_fingerprint, child_number, cache)
+
+    def _hmac_prefix(self, index: int) -> bytes:
+        # the data HMAC'ed with the child index to derive the child
+        if index < HARDENED:
+            return self.public_key
+        elif self._d is None:
+            raise HDError("Hardened children can't be derived from a public key")
+        return b"\x00" + self._d.to_bytes(32, "big")
+
+    def _derive_child(self, index: int) -> "HDKey":
+        data = self._hmac_prefix(index)
+        digest = hmac.digest(self.chain_code, data + index.to_bytes(4, "big"), "sha512")
+        tweak = int.from_bytes(digest[:32], "big")
+        if tweak >= secp256k1.q:
+            raise HDError(f"The child at index {index} is invalid")
+
+        if self._d is not None:
+            d = (tweak + self._d) % secp256k1.q
+            if d == 0:
+                raise HDError(f"The child at index {index} is invalid")
+            return self._derived(self, index, digest[32:], d, None)
+
+        Q = _mul_base([tweak], self.Q)[0]
+        if Q._is_identity():
+            raise HDError(f"The child at index {index} is invalid")
+        return self._derived(self, index, digest[32:], None, Q)
+
+    def __repr__(self) -> str:
+        kind = "private" if self.is_private else "public"
+        return f"<HDKey {kind} depth={self.depth} child_number={self.child_number}>"
+
+
+def parse_path(path: str) -> List[int]:
+    """Parse a derivation path like :code:`m/44'/0'/0'/0/7` into child indices.
+
+    Args:
+        |  path (str): Indices separated by :code:`/` with an optional leading :code:`m`, hardened
+            indices are marked by :code:`'` or :code:`h`.
+
+    Returns:
+        list[int]: The child indices, hardened indices offset by :data:`HARDENED`.
+    """
+    parts = path.strip().split("/")
+    if parts[0] in ("m", "M"):
+        parts = parts[1:]
+
+    indices = []
+    for part in parts:
+        hardened = part[-1:] in ("'", "h", "H")
+        digits = part[:-1] if hardened else part
+        if not digits.isdigit() or int(digits) >= HARDENED:
+            raise HDError(f"Invalid path component {part!r} in {path!r}")
+        indices.append(int(digits) + (HARDENED if hardened else 0))
+    return indices
+
+
+def _mul_base(scalars: List[int], offset: Optional[Point] = None) -> List[Point]:
+    data = curvemath.mul_base_many(scalars, secp256k1, offset)
+    size = secp256k1.p_bytes
+    points = []
+    for i in range(0, len(data), 2 * size):
+        x = int.from_bytes(data[i : i + size], "big")
+        y = int.from_bytes(data[i + size : i + 2 * size], "big")
+        points.append(
+            Point._identity_element()
+            if x == 0 and y == 0
+            else Point._trusted(x, y, secp256k1)
+        )
+    return points
+
+
+def _hash160(data: bytes) -> bytes:
+    sha = hashlib.sha256(data).digest()
+    try:
+        return hashlib.new("ripemd160", sha).digest()
+    except ValueError:
+        raise HDError("RIPEMD-160 is not available in this Python build") from None
+
+
+def _base58check_encode(data: bytes) -> str:
+    data += hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+    n = int.from_bytes(data, "big")
+    encoded = bytearray()
+    while n:
+        n, digit = divmod(n, 58)
+        encoded.append(_BASE58_ALPHABET[digit])
+    zeros = len(data) - len(data.lstrip(b"\x00"))
+    return (_BASE58_ALPHABET[:1] * zeros + bytes(reversed(encoded))).decode()
+
+
+def _base58check_decode(encoded: str) -> bytes:
+    n = 0
+    for char in encoded.encode():
+        digit = _BASE58_ALPHABET.find(char)
+        if digit < 0:
+            raise HDError(f"Invalid Base58 character {chr(char)!r}")
+        n = n * 58 + digit
+
+    zeros = len(encoded) - len(encoded.lstrip("1"))
+    data = b"\x00" * zeros + n.to_bytes((n.bit_length() + 7) // 8, "big")
+    payload, checksum = data[:-4], data[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise HDError("Invalid Base58Check checksum")
+    return payload
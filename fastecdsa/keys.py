@@ -1,12 +1,13 @@
+from hashlib import sha256
 from os import urandom
-from typing import Any, Callable, Optional, Tuple
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 
+from fastecdsa import _ecdsa, curvemath  # type: ignore[attr-defined]
 from .curve import Curve
-from .ecdsa import verify
+from .ecdsa import _hex_digest
 from .encoding import KeyEncoder
-from .point import Point
-from .typing import EcdsaSignature, SignableMessage
-from .util import mod_sqrt, msg_bytes
+from .point import Point, PointArray
+from .typing import EcdsaSignature, HashFunction, SignableMessage
 
 
 def gen_keypair(curve: Curve) -> Tuple[int, Point]:
@@ -29,6 +30,45 @@ def gen_keypair(curve: Curve) -> Tuple[int, Point]:
     return private_key, public_key
 
 
+def gen_keypairs(
+    n: int,
+    curve: Curve,
+    randfunc: Callable[[Any], bytes] = urandom,
+    contiguous: bool = False,
+) -> Union[List[Tuple[int, Point]], Tuple[List[int], PointArray]]:
+    """Generate many keypairs at once.
+
+    This is equivalent to calling :func:`gen_keypair` :code:`n` times, but the randomness for all
+    private keys is drawn in one call to :code:`randfunc` and the public keys are computed in native
+    code without holding the GIL, from a table of multiples of the curve's base point that is built
+    once per curve, and converted to affine coordinates with a single inversion per chunk of keys.
+
+    Args:
+        |  n (int): The number of keypairs to generate.
+        |  curve (fastecdsa.curve.Curve): The curve over which the keypairs will be calculated.
+        |  randfunc (function): A function taking one argument 'n' and returning a bytestring of n
+            random bytes suitable for cryptographic use. The default is "os.urandom".
+        |  contiguous (bool): Return the public keys in a compact
+            :class:`fastecdsa.point.PointArray` instead of as :class:`fastecdsa.point.Point`
+            objects.
+
+    Returns:
+        list[(int, fastecdsa.point.Point)] | (list[int], fastecdsa.point.PointArray): A list of
+        (private key, public key) tuples, or the list of private keys and the array of the
+        corresponding public keys when :code:`contiguous` is set.
+    """
+    if n < 0:
+        raise ValueError("The number of keypairs must be non-negative")
+
+    private_keys = _gen_private_keys(n, curve, randfunc)
+    public_keys = PointArray._trusted(
+        curvemath.mul_base_many(private_keys, curve), curve
+    )
+    if contiguous:
+        return private_keys, public_keys
+    return list(zip(private_keys, public_keys))
+
+
 def gen_private_key(curve: Curve, randfunc: Callable[[Any], bytes] = urandom) -> int:
     """Generate a private key to sign data with.
 
@@ -44,15 +84,8 @@ def gen_private_key(curve: Curve, randfunc: Callable[[Any], bytes] = urandom) ->
     Returns:
         int: Returns a positive integer smaller than the curve order.
     """
-    order_bits = 0
-    order = curve.q
-
-    while order > 0:
-        order >>= 1
-        order_bits += 1
-
-    order_bytes = (order_bits + 7) // 8  # randfunc only takes bytes
-    extra_bits = order_bytes * 8 - order_bits  # bits to shave off after getting bytes
+    order_bytes = curve.q_bytes  # randfunc only takes bytes
+    extra_bits = order_bytes * 8 - curve.q_bits  # bits to shave off after getting bytes
 
     rand = int.from_bytes(randfunc(order_bytes), "big")
     rand >>= extra_bits
@@ -65,6 +98,27 @@ def gen_private_key(curve: Curve, randfunc: Callable[[Any], bytes] = urandom) ->
     return rand
 
 
+def _gen_private_keys(
+    n: int, curve: Curve, randfunc: Callable[[Any], bytes]
+) -> List[int]:
+    # same rejection sampling as gen_private_key, with the random bytes of all keys drawn at once
+    order_bytes = curve.q_bytes
+    extra_bits = order_bytes * 8 - curve.q_bits
+
+    keys: List[int] = []
+    while len(keys) < n:
+        missing = n - len(keys)
+        rand = randfunc(missing * order_bytes)
+        for offset in range(0, missing * order_bytes, order_bytes):
+            key = (
+                int.from_bytes(rand[offset : offset + order_bytes], "big") >> extra_bits
+            )
+            if 1 <= key < curve.q:
+                keys.append(key)
+
+    return keys
+
+
 def get_public_key(d: int, curve: Curve) -> Point:
     """Generate a public key from a private key.
 
@@ -86,6 +140,9 @@ def get_public_keys_from_sig(
 ) -> Tuple[Point, Point]:
     """Recover the public keys that can verify a signature / message pair.
 
+    Both keys are computed natively from shared work, the first one is the key for recovery id 0
+    (even :math:`y` coordinate of :math:`R`) and the second one the key for recovery id 1.
+
     Args:
         |  sig (int, int): A ECDSA signature.
         |  msg (str|bytes|bytearray): The message corresponding to the signature.
@@ -97,26 +154,89 @@ def get_public_keys_from_sig(
                                                         signature for the message.
     """
     r, s = sig
-    rinv = pow(r, curve.q - 2, curve.q)
-
-    z = int.from_bytes(hashfunc(msg_bytes(msg)).digest(), "big")
-    hash_bit_length = hashfunc().digest_size * 8
-    if curve.q.bit_length() < hash_bit_length:
-        z >>= hash_bit_length - curve.q.bit_length()
-
-    y_squared = (r * r * r + curve.a * r + curve.b) % curve.p
-    y1, y2 = mod_sqrt(y_squared, curve.p)
-    R1, R2 = Point(r, y1, curve=curve), Point(r, y2, curve=curve)
-
-    Qs = rinv * (s * R1 - z * curve.G), rinv * (s * R2 - z * curve.G)
-    for Q in Qs:
-        if not verify(sig, msg, Q, curve=curve, hashfunc=hashfunc):
-            raise ValueError(
-                f"Could not recover public key, is the signature ({sig}) a valid "
-                f"signature for the message ({msg!r}) over the given curve ({curve}) using the "
-                f"given hash function ({hashfunc})?"
-            )
-    return Qs
+    keys = _ecdsa.recover(r, s, _hex_digest(msg, hashfunc, False), -1, curve)
+    if not keys:
+        raise ValueError(
+            f"Could not recover public key, is the signature ({sig}) a valid "
+            f"signature for the message ({msg!r}) over the given curve ({curve}) using the "
+            f"given hash function ({hashfunc})?"
+        )
+    return Point._trusted(*keys[0], curve), Point._trusted(*keys[1], curve)
+
+
+def recover_public_key(
+    sig: EcdsaSignature,
+    msg: SignableMessage,
+    recovery_id: int,
+    curve: Curve,
+    hashfunc: HashFunction = sha256,
+    prehashed: bool = False,
+) -> Point:
+    """Recover the public key that signed a message using the signature's recovery id.
+
+    The recovery id (as used by e.g. Bitcoin and Ethereum) selects one of the candidate points
+    :math:`R` the signature could have been created with: bit 0 is the parity of :math:`R`'s
+    :math:`y` coordinate and bit 1 is set if :math:`R`'s :math:`x` coordinate is :math:`r + n`
+    rather than :math:`r`. The key is computed with a single double scalar multiplication.
+
+    Args:
+        |  sig (int, int): A ECDSA signature.
+        |  msg (str|bytes|bytearray): The message corresponding to the signature.
+        |  recovery_id (int): The recovery id, between 0 and 3.
+        |  curve (fastecdsa.curve.Curve): The curve used to sign the message.
+        |  hashfunc (_hashlib.HASH): The hash function used to compress the message.
+        |  prehashed (bool): The message being passed has already been hashed by :code:`hashfunc`.
+
+    Returns:
+        fastecdsa.point.Point: The public key that verifies the signature for the message.
+
+    Raises:
+        ValueError: If the recovery id is out of range or no key can be recovered for it.
+    """
+    if recovery_id not in range(4):
+        raise ValueError(f"The recovery id must be between 0 and 3, got {recovery_id}")
+
+    r, s = sig
+    keys = _ecdsa.recover(
+        r, s, _hex_digest(msg, hashfunc, prehashed), recovery_id, curve
+    )
+    if not keys:
+        raise ValueError(
+            f"Could not recover public key, is the signature ({sig}) with recovery id "
+            f"{recovery_id} a valid signature for the message ({msg!r}) over the given curve "
+            f"({curve}) using the given hash function ({hashfunc})?"
+        )
+    return Point._trusted(*keys[0], curve)
+
+
+def recover_public_keys_batch(
+    sigs: Sequence[EcdsaSignature],
+    digests: Sequence[bytes],
+    recovery_ids: Sequence[int],
+    curve: Curve,
+) -> PointArray:
+    """Recover the public keys of many signatures using their recovery ids.
+
+    This is equivalent to calling :func:`recover_public_key` for every signature with
+    :code:`prehashed=True`, but all signatures are recovered in native code without holding the
+    GIL: the inversions of every :math:`r` and of the intermediate points are shared between
+    signatures and the multiples of the generator are only computed once.
+
+    Args:
+        |  sigs (list[(int, int)]): The ECDSA signatures.
+        |  digests (list[bytes]): The hashes of the signed messages, in the same order.
+        |  recovery_ids (list[int]): The recovery id of every signature, between 0 and 3.
+        |  curve (fastecdsa.curve.Curve): The curve used to sign the messages.
+
+    Returns:
+        fastecdsa.point.PointArray: The recovered public keys, in the same order as the signatures.
+
+    Raises:
+        ValueError: If the arguments have different lengths, a recovery id is out of range or no
+            key can be recovered for a signature (the message gives its index).
+    """
+    data = _ecdsa.recover_batch(sigs, digests, recovery_ids, curve)
+    return PointArray._trusted(data, curve)
 
 
 def export_private_key(
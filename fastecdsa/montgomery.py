@@ -0,0 +1,240 @@
+from __future__ import annotations
+from typing import Dict
+
+from fastecdsa import curvemath  # type: ignore[attr-defined]
+from .curve import Curve, W25519, W448
+from .point import Point
+
+
+class MontgomeryCurve:
+    r"""Representation of a curve in Montgomery form, as used by X25519 and X448 (RFC 7748).
+
+    The curve is defined by :math:`v^2 \equiv u^3 + Au^2 + u \pmod{p}`. Only the :math:`u`
+    coordinate is used: scalar multiplication is a native Montgomery ladder that costs one
+    differential addition and one doubling per bit and a single inversion. Every Montgomery curve is
+    isomorphic to a short Weierstrass curve (:math:`x = u + A / 3`), which is how the curve is
+    available as a :class:`fastecdsa.curve.Curve` (e.g. :code:`W25519`); :meth:`to_point` and
+    :meth:`from_point` map between the two.
+
+    Attributes:
+        |  name (str): The name of the curve.
+        |  p (int): The value of :math:`p` in the curve equation.
+        |  A (int): The value of :math:`A` in the curve equation.
+        |  bits (int): The bit length of scalars and :math:`u` coordinates, and of the ladder.
+        |  cofactor (int): The cofactor of the curve, scalars are clamped to a multiple of it.
+        |  base_u (int): The :math:`u` coordinate of the base point.
+        |  weierstrass (:class:`fastecdsa.curve.Curve`): The isomorphic short Weierstrass curve.
+        |  byte_length (int): The length of encoded scalars and :math:`u` coordinates.
+    """
+
+    __slots__ = (
+        "name",
+        "p",
+        "A",
+        "bits",
+        "cofactor",
+        "base_u",
+        "weierstrass",
+        "byte_length",
+        "_a24",
+        "_shift",
+    )
+
+    _weierstrass_lookup: Dict[
+        Curve, MontgomeryCurve
+    ] = {}  # a lookup table for getting the Montgomery form of a Weierstrass curve
+
+    def __init__(
+        self,
+        name: str,
+        p: int,
+        A: int,
+        bits: int,
+        cofactor: int,
+        base_u: int,
+        weierstrass: Curve,
+    ) -> None:
+        self.name = name
+        self.p = p
+        self.A = A
+        self.bits = bits
+        self.cofactor = cofactor
+        self.base_u = base_u
+        self.weierstrass = weierstrass
+        self.byte_length = (bits + 7) // 8
+
+        self._a24 = (A - 2) // 4
+        self._shift = A * pow(3, -1, p) % p
+
+        self._weierstrass_lookup[weierstrass] = self
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def decode_scalar(self, k: bytes) -> int:
+        """Decode and clamp a scalar (the :code:`decodeScalar` functions of RFC 7748).
+
+        Args:
+            |  k (bytes): The little endian scalar, :code:`byte_length` bytes long.
+
+        Returns:
+            int: The scalar, a multiple of the cofactor with its top bit set.
+        """
+        if len(k) != self.byte_length:
+            raise ValueError(f"{self.name} scalars are {self.byte_length} bytes long")
+
+        scalar = int.from_bytes(k, "little") & ((1 << self.bits) - 1)
+        return (scalar & ~(self.cofactor - 1)) | (1 << (self.bits - 1))
+
+    def decode_u(self, u: bytes) -> int:
+        """Decode a :math:`u` coordinate (the :code:`decodeUCoordinate` function of RFC 7748).
+
+        Args:
+            |  u (bytes): The little endian :math:`u` coordinate, :code:`byte_length` bytes long.
+
+        Returns:
+            int: The :math:`u` coordinate, unused high bits are ignored.
+        """
+        if len(u) != self.byte_length:
+            raise ValueError(
+                f"{self.name} u coordinates are {self.byte_length} bytes long"
+            )
+
+        return int.from_bytes(u, "little") & ((1 << self.bits) - 1)
+
+    def encode_u(self, u: int) -> bytes:
+        r"""Encode a :math:`u` coordinate (the :code:`encodeUCoordinate` function of RFC 7748).
+
+        Args:
+            |  u (int): The :math:`u` coordinate.
+
+        Returns:
+            bytes: The little endian encoding of :math:`u \bmod p`.
+        """
+        return (u % self.p).to_bytes(self.byte_length, "little")
+
+    def mul_u(self, d: int, u: int) -> int:
+        """Multiply a point given by its :math:`u` coordinate by a scalar, without clamping.
+
+        Args:
+            |  d (int): A non-negative scalar smaller than :math:`2^{bits}`.
+            |  u (int): The :math:`u` coordinate of the point.
+
+        Returns:
+            int: The :math:`u` coordinate of the product, :code:`0` for the identity element.
+        """
+        return curvemath.montgomery_ladder(d, u, self.p, self._a24, self.bits)
+
+    def scalar_mult(self, k: bytes, u: bytes) -> bytes:
+        """The X25519 / X448 function of RFC 7748.
+
+        The result is all zeros if :code:`u` is a point of small order. Protocols that need
+        contributory behaviour (e.g. TLS) should check for that.
+
+        Args:
+            |  k (bytes): The encoded scalar (e.g. a private key).
+            |  u (bytes): The encoded :math:`u` coordinate (e.g. a public key).
+
+        Returns:
+            bytes: The encoded :math:`u` coordinate of the product.
+        """
+        return self.encode_u(self.mul_u(self.decode_scalar(k), self.decode_u(u)))
+
+    def public_key(self, k: bytes) -> bytes:
+        """Compute the public key of a private key (the product of the scalar and the base point).
+
+        Args:
+            |  k (bytes): The encoded private key.
+
+        Returns:
+            bytes: The encoded public key.
+        """
+        return self.encode_u(self.mul_u(self.decode_scalar(k), self.base_u))
+
+    def to_point(self, u: int, odd: bool = False) -> Point:
+        """Map a :math:`u` coordinate to a point on the isomorphic Weierstrass curve.
+
+        Args:
+            |  u (int): The :math:`u` coordinate.
+            |  odd (bool): The parity of the :math:`y` coordinate of the point (a :math:`u`
+                coordinate doesn't determine it).
+
+        Returns:
+            :class:`fastecdsa.point.Point`: The point on :code:`weierstrass`.
+
+        Raises:
+            ValueError: If :math:`u` is not the coordinate of a point on the curve (but of a point
+                on its twist).
+        """
+        x = (u + self._shift) % self.p
+        y = curvemath.decompress(x, odd, self.weierstrass)
+        return Point._trusted(x, y, self.weierstrass)
+
+    def from_point(self, P: Point) -> int:
+        """Map a point on the isomorphic Weierstrass curve to its :math:`u` coordinate.
+
+        Args:
+            |  P (:class:`fastecdsa.point.Point`): A point on :code:`weierstrass`.
+
+        Returns:
+            int: The :math:`u` coordinate of the point.
+
+        Raises:
+            ValueError: If the point is not on :code:`weierstrass` or is the identity element.
+        """
+        if P.curve is not self.weierstrass:
+            raise ValueError(f"The point is not on {self.weierstrass}")
+
+        return (P.x - self._shift) % self.p
+
+    @classmethod
+    def from_weierstrass(cls, curve: Curve) -> MontgomeryCurve:
+        """Get the Montgomery form of a Weierstrass curve.
+
+        Args:
+            |  curve (:class:`fastecdsa.curve.Curve`): A Weierstrass curve, e.g. :code:`W25519`.
+
+        Returns:
+            :class:`MontgomeryCurve`: The Montgomery curve isomorphic to :code:`curve`.
+
+        Raises:
+            ValueError: If there is no Montgomery curve registered for the curve.
+        """
+        try:
+            return cls._weierstrass_lookup[curve]
+        except KeyError:
+            raise ValueError(f"{curve} has no Montgomery form") from None
+
+
+# see https://tools.ietf.org/html/rfc7748#section-4 for params
+Curve25519 = MontgomeryCurve("Curve25519", W25519.p, 486662, 255, 8, 9, W25519)
+Curve448 = MontgomeryCurve("Curve448", W448.p, 156326, 448, 4, 5, W448)
+
+
+def x25519(k: bytes, u: bytes) -> bytes:
+    """The X25519 function of RFC 7748, see :meth:`MontgomeryCurve.scalar_mult`.
+
+    Args:
+        |  k (bytes): The 32 byte scalar (e.g. a private key).
+        |  u (bytes): The 32 byte :math:`u` coordinate (e.g. a public key).
+
+    Returns:
+        bytes: The 32 byte :math:`u` coordinate of the product.
+    """
+    return Curve25519.scalar_mult(k, u)
+
+
+def x448(k: bytes, u: bytes) -> bytes:
+    """The X448 function of RFC 7748, see :meth:`MontgomeryCurve.scalar_mult`.
+
+    Args:
+        |  k (bytes): The 56 byte scalar (e.g. a private key).
+        |  u (bytes): The 56 byte :math:`u` coordinate (e.g. a public key).
+
+    Returns:
+        bytes: The 56 byte :math:`u` coordinate of the product.
+    """
+    return Curve448.scalar_mult(k, u)
@@ -1,7 +1,19 @@
 from __future__ import annotations
+import warnings
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
 
 from fastecdsa import curvemath  # type: ignore[attr-defined]
-from .curve import Curve
+from .curve import Curve, _curve_from_identifier
+from .util import mod_sqrt
+
+
+def _warn_coordinate_setter() -> None:
+    warnings.warn(
+        "Setting the coordinates of a Point is deprecated, points are hashable and changing them "
+        "changes their hash, create a new Point instead",
+        DeprecationWarning,
+        stacklevel=3,
+    )
 
 
 class CurveMismatchError(Exception):
@@ -14,12 +26,19 @@ class CurveMismatchError(Exception):
 class Point:
     """Representation of a point on an elliptic curve.
 
+    Arithmetic is done on a :class:`fastecdsa.curvemath.NativePoint` that keeps the point in
+    jacobian coordinates, so chained operations (e.g. :code:`r * (s * R - z * G)`) stay in native
+    code. The affine coordinates of a result are only computed when :code:`x` or :code:`y` are
+    accessed.
+
     Attributes:
         |  x (int): The x coordinate of the point.
         |  y (int): The y coordinate of the point.
         |  curve (:class:`Curve`): The curve that the point lies on.
     """
 
+    __slots__ = ("_x", "_y", "curve", "_native")
+
     def __init__(self, x: int, y: int, curve: Curve) -> None:
         r"""Initialize a point on an elliptic curve.
 
@@ -44,9 +63,71 @@ class Point:
                 f"coordinates are not on curve <{curve}>\n\tx={x:x}\n\ty={y:x}"
             )
         else:
-            self.x = x
-            self.y = y
+            self._x: Optional[int] = x
+            self._y: Optional[int] = y
             self.curve = curve
+            self._native = None
+
+    @classmethod
+    def _trusted(cls, x: int, y: int, curve: Curve) -> Point:
+        """Build a point without reducing or validating its coordinates.
+
+        Only for coordinates the library computed itself (e.g. results of the C extension), which
+        are already reduced modulo :math:`p` and on the curve. User supplied coordinates must go
+        through the regular constructor.
+        """
+        point = cls.__new__(cls)
+        point._x = x
+        point._y = y
+        point.curve = curve
+        point._native = None
+        return point
+
+    @classmethod
+    def _from_native(cls, native: curvemath.NativePoint, curve: Curve) -> Point:
+        """Wrap a point computed by the C extension, its coordinates are computed lazily."""
+        if native.is_identity():
+            return cls._identity_element()
+
+        point = cls.__new__(cls)
+        point._x = point._y = None
+        point.curve = curve
+        point._native = native
+        return point
+
+    def _to_native(self) -> curvemath.NativePoint:
+        if self._native is None:
+            self._native = curvemath.NativePoint(self._x, self._y, self.curve)
+        return self._native
+
+    def _affine(self) -> None:
+        self._x, self._y = self._native.affine()
+
+    @property
+    def x(self) -> int:
+        if self._x is None:
+            self._affine()
+        return self._x  # type: ignore[return-value]
+
+    @x.setter
+    def x(self, value: int) -> None:
+        _warn_coordinate_setter()
+        self._y = self.y
+        self._x = value
+        self._native = None
+
+    @property
+    def y(self) -> int:
+        if self._y is None:
+            self._affine()
+        return self._y  # type: ignore[return-value]
+
+    @y.setter
+    def y(self, value: int) -> None:
+        _warn_coordinate_setter()
+        self._x = self.x
+        self._y = value
+        self._native = None
 
     def __str__(self) -> str:
         if self._is_identity():
@@ -63,6 +144,26 @@ class Point:
 
         return self.x == other.x and self.y == other.y and self.curve is other.curve
 
+    def __hash__(self) -> int:
+        if self._is_identity():
+            return hash((0, 0, None))
+        return hash((self.x, self.y, self.curve.oid))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # pickle as the compressed SEC1 encoding and the curve's identifier (or the curve itself if
+        # it is not registered) instead of the coordinates and the whole curve
+        if self._is_identity():
+            return _restore_point, (None, b"")
+
+        identifier = self.curve._identifier()
+        encoded = (b"\x03" if self.y & 1 else b"\x02") + self.x.to_bytes(
+            self.curve.p_bytes, "big"
+        )
+        return _restore_point, (
+            self.curve if identifier is None else identifier,
+            encoded,
+        )
+
     def __add__(self, other: Point) -> Point:
         """Add two points on the same elliptic curve.
 
@@ -73,7 +174,9 @@ class Point:
         Returns:
             :class:`Point`: A point :math:`R` such that :math:`R = P + Q`
         """
-        if not isinstance(other, Point):
+        if isinstance(other, PointExpression):
+            return NotImplemented
+        elif not isinstance(other, Point):
             raise TypeError(f"Cannot add {type(other)} to Point")
 
         if self._is_identity():
@@ -82,22 +185,8 @@ class Point:
             return self
         elif self.curve is not other.curve:
             raise CurveMismatchError(self.curve, other.curve)
-        elif self == -other:
-            return self._identity_element()
-        else:
-            x, y = curvemath.add(
-                str(self.x),
-                str(self.y),
-                str(other.x),
-                str(other.y),
-                str(self.curve.p),
-                str(self.curve.a),
-                str(self.curve.b),
-                str(self.curve.q),
-                str(self.curve.gx),
-                str(self.curve.gy),
-            )
-            return Point(int(x), int(y), self.curve)
+
+        return Point._from_native(self._to_native() + other._to_native(), self.curve)
 
     def __sub__(self, other: Point) -> Point:
         """Subtract two points on the same elliptic curve.
@@ -109,16 +198,12 @@ class Point:
         Returns:
             :class:`Point`: A point :math:`R` such that :math:`R = P - Q`
         """
-        if not isinstance(other, Point):
+        if isinstance(other, PointExpression):
+            return NotImplemented
+        elif not isinstance(other, Point):
             raise TypeError(f"Cannot subtract {type(other)} from Point")
 
-        if self == other:
-            return self._identity_element()
-        elif other._is_identity():
-            return self
-
-        negative = Point(other.x, -other.y % other.curve.p, other.curve)
-        return self.__add__(negative)
+        return self.__add__(-other)
 
     def __mul__(self, scalar: int) -> Point:
         r"""Multiply a :class:`Point` on an elliptic curve by an integer.
@@ -134,25 +219,10 @@ class Point:
         if not isinstance(scalar, int):
             raise TypeError(f"Cannot multiply Point by {type(scalar)}")
 
-        if scalar == 0:
+        if scalar == 0 or self._is_identity():
             return self._identity_element()
 
-        x, y = curvemath.mul(
-            str(self.x),
-            str(self.y),
-            str(abs(scalar)),
-            str(self.curve.p),
-            str(self.curve.a),
-            str(self.curve.b),
-            str(self.curve.q),
-            str(self.curve.gx),
-            str(self.curve.gy),
-        )
-        x = int(x)
-        y = int(y)
-        if x == 0 and y == 0:
-            return self._identity_element()
-        return Point(x, y, self.curve) if scalar > 0 else -Point(x, y, self.curve)
+        return Point._from_native(self._to_native() * scalar, self.curve)
 
     def __rmul__(self, scalar: int) -> Point:
         r"""Multiply a :class:`Point` on an elliptic curve by an integer.
@@ -178,12 +248,309 @@ class Point:
         """
         if self._is_identity():
             return self
+        elif self._x is None:
+            return Point._from_native(-self._native, self.curve)
+
+        return Point._trusted(self._x, -self._y % self.curve.p, self.curve)  # type: ignore[operator]
 
-        return Point(self.x, -self.y % self.curve.p, self.curve)
+    def lazy(self) -> PointExpression:
+        r"""Start a lazily evaluated expression from this point.
+
+        Arithmetic on the returned :class:`PointExpression` only collects terms, the result is
+        computed with a single multi-scalar multiplication once it is needed, e.g.
+        :code:`(s * R.lazy() - z * G).evaluate()`.
+
+        Returns:
+            :class:`PointExpression`: The expression :math:`1 \cdot P`.
+        """
+        if self._is_identity():
+            return PointExpression({})
+        return PointExpression({id(self): (self, 1)})
+
+    @staticmethod
+    def msm(points: Sequence[Point], scalars: Sequence[int]) -> Point:
+        r"""Compute the multi-scalar multiplication :math:`d_1 P_1 + d_2 P_2 + \ldots + d_n P_n`.
+
+        This is much faster than multiplying and adding the points one by one, the sum is computed
+        in a single call to the C extension that shares the doublings between all of the points
+        (Straus' method for few points, Pippenger's bucket method for many).
+
+        Args:
+            | points (Sequence[:class:`Point`]): the points :math:`P_1, \ldots, P_n`, all on the same
+                curve
+            | scalars (Sequence[int]): the integers :math:`d_1, \ldots, d_n`
+
+        Returns:
+            :class:`Point`: The point :math:`R = d_1 P_1 + d_2 P_2 + \ldots + d_n P_n`
+        """
+        if len(points) != len(scalars):
+            raise ValueError("points and scalars must have the same length")
+
+        curve = None
+        natives, coefficients = [], []
+        for point, scalar in zip(points, scalars):
+            if not isinstance(scalar, int):
+                raise TypeError(f"Cannot multiply Point by {type(scalar)}")
+            elif point._is_identity():
+                continue
+            elif curve is None:
+                curve = point.curve
+            elif point.curve is not curve:
+                raise CurveMismatchError(curve, point.curve)
+
+            natives.append(point._to_native())
+            coefficients.append(scalar)
+
+        if curve is None:
+            return Point._identity_element()
+
+        return Point._from_native(curvemath.msm(natives, coefficients, curve), curve)
 
     def _is_identity(self) -> bool:
-        return self.x == 0 and self.y == 0 and self.curve is None
+        return self.curve is None and self.x == 0 and self.y == 0
 
     @staticmethod
     def _identity_element() -> Point:
         return Point(0, 0, curve=None)  # type: ignore[arg-type]
+
+
+class PointExpression:
+    r"""A lazily evaluated linear combination :math:`d_1 P_1 + d_2 P_2 + \ldots` of points.
+
+    Expressions are created with :meth:`Point.lazy` and support the same operators as
+    :class:`Point` (:code:`+`, :code:`-`, negation and multiplication by an integer, with either
+    points or other expressions as operands). Terms for the same point object are merged as they
+    are collected and nothing is computed until the value is needed, either explicitly via
+    :meth:`evaluate` or by accessing :attr:`x`, :attr:`y` or comparing the expression. The value is
+    then computed with one call to :meth:`Point.msm`.
+    """
+
+    __slots__ = ("_terms", "_value")
+
+    def __init__(self, terms: Dict[int, Tuple[Point, int]]) -> None:
+        self._terms = (
+            terms  # id(point) -> (point, scalar), the point keeps its id unique
+        )
+        self._value: Optional[Point] = None
+
+    def evaluate(self) -> Point:
+        """Compute the value of the expression.
+
+        Returns:
+            :class:`Point`: The point the expression evaluates to.
+        """
+        if self._value is None:
+            terms = [
+                (point, scalar) for point, scalar in self._terms.values() if scalar != 0
+            ]
+            self._value = Point.msm(
+                [point for point, _ in terms], [scalar for _, scalar in terms]
+            )
+        return self._value
+
+    @property
+    def x(self) -> int:
+        return self.evaluate().x
+
+    @property
+    def y(self) -> int:
+        return self.evaluate().y
+
+    def __str__(self) -> str:
+        return str(self.evaluate())
+
+    def __repr__(self) -> str:
+        return f"<PointExpression with {len(self._terms)} term(s)>"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PointExpression):
+            other = other.evaluate()
+        elif not isinstance(other, Point):
+            raise TypeError(f"Cannot compare PointExpression to {type(other)}")
+
+        return self.evaluate() == other
+
+    def _combine(self, other: object, factor: int) -> PointExpression:
+        if isinstance(other, Point):
+            other = other.lazy()
+        elif not isinstance(other, PointExpression):
+            return NotImplemented
+
+        terms = dict(self._terms)
+        for key, (point, scalar) in other._terms.items():
+            previous = terms.get(key)
+            terms[key] = (
+                point,
+                factor * scalar + (0 if previous is None else previous[1]),
+            )
+        return PointExpression(terms)
+
+    def __add__(self, other: Union[Point, PointExpression]) -> PointExpression:
+        return self._combine(other, 1)
+
+    def __radd__(self, other: Point) -> PointExpression:
+        return self._combine(other, 1)
+
+    def __sub__(self, other: Union[Point, PointExpression]) -> PointExpression:
+        return self._combine(other, -1)
+
+    def __rsub__(self, other: Point) -> PointExpression:
+        return (-self)._combine(other, 1)
+
+    def __mul__(self, scalar: int) -> PointExpression:
+        if not isinstance(scalar, int):
+            raise TypeError(f"Cannot multiply PointExpression by {type(scalar)}")
+
+        return PointExpression(
+            {
+                key: (point, coefficient * scalar)
+                for key, (point, coefficient) in self._terms.items()
+            }
+        )
+
+    def __rmul__(self, scalar: int) -> PointExpression:
+        return self.__mul__(scalar)
+
+    def __neg__(self) -> PointExpression:
+        return self.__mul__(-1)
+
+
+class PointAccumulator(curvemath.PointAccumulator):
+    r"""A mutable running sum of points on a curve.
+
+    Adding points with :code:`+=` on a :class:`Point` creates a new point for every addition, the
+    accumulator instead keeps the sum in native (jacobian) coordinates, so no modular inversion is
+    needed until the coordinates of :meth:`result` are read.
+
+    Args:
+        |  curve (:class:`fastecdsa.curve.Curve`): The curve that the summed points are on.
+
+    The accumulator supports :code:`add(P)`, :code:`sub(P)`, :code:`add_many(points)`,
+    :code:`add_scaled(P, d)` (adds :math:`d \cdot P`), :code:`reset()` and the :code:`+=` and
+    :code:`-=` operators. Adding a point on a different curve raises a :code:`ValueError`.
+    """
+
+    __slots__ = ("curve",)
+
+    def __init__(self, curve: Curve) -> None:
+        super().__init__(curve)
+        self.curve = curve
+
+    def result(self) -> Point:
+        """Get the current sum.
+
+        Returns:
+            :class:`Point`: The sum of all points added to (minus those subtracted from) the
+            accumulator.
+        """
+        return Point._from_native(super().result(), self.curve)
+
+
+class PointArray(Sequence[Point]):
+    """A compact, read only array of points on one curve.
+
+    The points are stored back to back in a single bytes object, each as its big endian :math:`x`
+    and :math:`y` coordinates padded to :code:`curve.p_bytes` bytes (both zero for the identity
+    element). This is far smaller than a list of :class:`Point` objects when many keys are
+    produced at once, the :class:`Point` objects are only created when the array is indexed.
+
+    Args:
+        |  data (bytes): The encoded points.
+        |  curve (:class:`fastecdsa.curve.Curve`): The curve the points are on.
+
+    Raises:
+        ValueError: If the data is not a whole number of points or a point is not on the curve
+            (checked when the point is read).
+    """
+
+    __slots__ = ("curve", "data", "_checked")
+
+    def __init__(self, data: bytes, curve: Curve) -> None:
+        if len(data) % (2 * curve.p_bytes):
+            raise ValueError(
+                f"The length of the data ({len(data)}) is not a multiple of the size of a point "
+                f"on {curve.name} ({2 * curve.p_bytes})"
+            )
+
+        self.curve = curve
+        self.data = bytes(data)
+        self._checked = False
+
+    @classmethod
+    def _trusted(cls, data: bytes, curve: Curve) -> PointArray:
+        """Wrap points that are known to be on the curve, e.g. the output of the native code."""
+        array = cls.__new__(cls)
+        array.curve = curve
+        array.data = data
+        array._checked = True
+        return array
+
+    @property
+    def itemsize(self) -> int:
+        """int: The number of bytes used by each point."""
+        return 2 * self.curve.p_bytes
+
+    def __len__(self) -> int:
+        return len(self.data) // self.itemsize
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        size = self.itemsize
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                data = self.data[start * size : stop * size]
+            else:
+                data = b"".join(
+                    self.data[i * size : (i + 1) * size]
+                    for i in range(start, stop, step)
+                )
+            array = PointArray._trusted(data, self.curve)
+            array._checked = self._checked
+            return array
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("PointArray index out of range")
+
+        return self._decode(self.data[index * size : (index + 1) * size])
+
+    def __iter__(self) -> Iterator[Point]:
+        size, data = self.itemsize, self.data
+        for offset in range(0, len(data), size):
+            yield self._decode(data[offset : offset + size])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PointArray):
+            return NotImplemented
+        return self.curve == other.curve and self.data == other.data
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"<PointArray of {len(self)} points on {self.curve.name}>"
+
+    def _decode(self, encoded: bytes) -> Point:
+        width = self.curve.p_bytes
+        x = int.from_bytes(encoded[:width], "big")
+        y = int.from_bytes(encoded[width:], "big")
+        if x == 0 and y == 0:
+            return Point._identity_element()
+        elif self._checked:
+            return Point._trusted(x, y, self.curve)
+        return Point(x, y, self.curve)
+
+
+def _restore_point(curve: Union[Curve, bytes, str, None], encoded: bytes) -> Point:
+    if curve is None:
+        return Point._identity_element()
+    elif not isinstance(curve, Curve):
+        curve = _curve_from_identifier(curve)
+
+    x = int.from_bytes(encoded[1:], "big")
+    y = mod_sqrt(curve.evaluate(x), curve.p)[0]
+    if y & 1 != encoded[0] & 1:
+        y = -y % curve.p
+
+    return Point(x, y, curve)
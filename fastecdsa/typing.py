@@ -1,5 +1,16 @@
-from typing import Any, Callable, Tuple, Union
+from typing import IO, Any, Callable, Iterable, Protocol, Tuple, Union
 
 EcdsaSignature = Tuple[int, int]
 SignableMessage = Union[str, bytes, bytearray]
 HashFunction = Callable[[Any], Any]
+
+
+class HashObject(Protocol):
+    """A hash object in the style of :code:`hashlib`, e.g. the result of :code:`sha256()`."""
+
+    def update(self, data: bytes, /) -> None: ...
+
+    def digest(self) -> bytes: ...
+
+
+MessageStream = Union[IO[bytes], IO[str], Iterable[SignableMessage], HashObject]
@@ -1,5 +1,6 @@
 import hmac
 from struct import pack
+from functools import lru_cache
 from typing import Callable, Tuple
 
 from .typing import SignableMessage
@@ -32,7 +33,7 @@ class RFC6979:
         self.x = x
         self.q = q
         self.msg = msg_bytes(msg)
-        self.qlen = len(bin(q)) - 2  # -2 for the leading '0b'
+        self.qlen = q.bit_length()
         self.rlen = ((self.qlen + 7) // 8) * 8
         self.hashfunc = hashfunc
         self.prehashed = prehashed
@@ -96,8 +97,9 @@ class RFC6979:
             v = hmac.new(k, v, self.hashfunc).digest()
 
 
-def _tonelli_shanks(n: int, p: int) -> Tuple[int, int]:
-    """A generic algorithm for computing modular square roots."""
+@lru_cache(maxsize=32)
+def _tonelli_shanks_precompute(p: int) -> Tuple[int, int, Tuple[int, ...]]:
+    """Compute S, Q (p - 1 = Q * 2^S, Q odd) and c^(2^i) for i < S, c = z^Q for a non-residue z."""
     Q, S = p - 1, 0
     while Q % 2 == 0:
         Q, S = Q // 2, S + 1
@@ -106,18 +108,45 @@ def _tonelli_shanks(n: int, p: int) -> Tuple[int, int]:
     while pow(z, (p - 1) // 2, p) != (-1 % p):
         z += 1
 
-    M, c, t, R = S, pow(z, Q, p), pow(n, Q, p), pow(n, (Q + 1) // 2, p)
+    powers = [pow(z, Q, p)]
+    for _ in range(1, S):
+        powers.append(powers[-1] * powers[-1] % p)
+    return S, Q, tuple(powers)
+
+
+def _tonelli_shanks(n: int, p: int) -> Tuple[int, int]:
+    """A generic algorithm for computing modular square roots."""
+    S, Q, powers = _tonelli_shanks_precompute(p)
+    if n % p == 0:
+        return 0, 0
+
+    # c is always powers[S - M], so the b = c^(2^(M - i - 1)) below is powers[S - i - 1]
+    M, t, R = S, pow(n, Q, p), pow(n, (Q + 1) // 2, p)
     while t != 1:
-        for i in range(1, M):
-            if pow(t, 2**i, p) == 1:
-                break
+        i, t2i = 0, t
+        while t2i != 1 and i < M:
+            i, t2i = i + 1, t2i * t2i % p
+
+        if i == M:  # n is not a square
+            break
 
-        b = pow(c, 2 ** (M - i - 1), p)
-        M, c, t, R = i, pow(b, 2, p), (t * b * b) % p, (R * b) % p
+        b = powers[S - i - 1]
+        M, t, R = i, (t * b * b) % p, (R * b) % p
 
+    if R * R % p != n % p:
+        raise ValueError(f"{n} is not a quadratic residue modulo {p}")
     return R, -R % p
 
 
+def _atkin(n: int, p: int) -> Tuple[int, int]:
+    """Atkin's algorithm for modular square roots, for primes p = 5 mod 8."""
+    n2 = 2 * n % p
+    v = pow(n2, (p - 5) // 8, p)
+    i = n2 * v * v % p
+    x = n * v * (i - 1) % p
+    return x, -x % p
+
+
 def mod_sqrt(a: int, p: int) -> Tuple[int, int]:
     r"""Compute the square root of :math:`a \pmod{p}`
 
@@ -129,11 +158,16 @@ def mod_sqrt(a: int, p: int) -> Tuple[int, int]:
 
     Returns:
         (int, int): the two values of :math:`x` satisfying :math:`x^2 \equiv a \pmod{p}`.
+
+    Raises:
+        ValueError: If :math:`p \equiv 1 \pmod{8}` and :math:`a` has no square root.
     """
     if p % 4 == 3:
         k = (p - 3) // 4
         x = pow(a, k + 1, p)
         return x, (-x % p)
+    elif p % 8 == 5:
+        return _atkin(a, p)
     else:
         return _tonelli_shanks(a, p)
 
@@ -12,7 +12,19 @@ curvemath = Extension(
     "fastecdsa.curvemath",
     include_dirs=["src/"],
     libraries=["gmp"],
-    sources=["src/curveMath.c", "src/curve.c", "src/point.c"],
+    sources=[
+        "src/curveMath.c",
+        "src/curve.c",
+        "src/point.c",
+        "src/convert.c",
+        "src/jacobianMath.c",
+        "src/nativePoint.c",
+        "src/msm.c",
+        "src/pointAccumulator.c",
+        "src/modSqrt.c",
+        "src/montgomery.c",
+        "src/fixedBase.c",
+    ],
     extra_compile_args=extra_compile_args,
     extra_link_args=extra_link_args,
 )
@@ -21,7 +33,17 @@ _ecdsa = Extension(
     "fastecdsa._ecdsa",
     include_dirs=["src/"],
     libraries=["gmp"],
-    sources=["src/_ecdsa.c", "src/curveMath.c", "src/curve.c", "src/point.c"],
+    sources=[
+        "src/_ecdsa.c",
+        "src/der.c",
+        "src/curve.c",
+        "src/point.c",
+        "src/convert.c",
+        "src/jacobianMath.c",
+        "src/msm.c",
+        "src/modSqrt.c",
+        "src/fixedBase.c",
+    ],
     extra_compile_args=extra_compile_args,
     extra_link_args=extra_link_args,
 )
@@ -1,18 +1,22 @@
 #include "_ecdsa.h"
+#include "convert.h"
+#include "jacobianMath.h"
+#include "msm.h"
+#include "modSqrt.h"
+#include "fixedBase.h"
+#include "der.h"
+#include <stdlib.h>
 #include <string.h>
 #include <stdio.h>
 
+// signatures are recovered in chunks of this size by recover_batch, bounding the memory used
+#define RECOVER_CHUNK_SIZE 256
 
-void signZZ_p(Sig * sig, char * msg, mpz_t d, mpz_t k, const CurveZZ_p * curve) {
-    mpz_t e, kinv;
 
-    // R = k * G, r = R[x]
-    PointZZ_p R;
-    pointZZ_pMul(&R, curve->g, k, curve);
-    mpz_init_set(sig->r, R.x);
-    mpz_mod(sig->r, sig->r, curve->q);
-
-    // convert digest to integer (digest is computed as hex in ecdsa.py)
+/*
+ * Set e to the leftmost bits of the hex encoded digest, as many as the curve order has.
+ */
+static void digestToMpz(mpz_t e, const char * msg, const CurveZZ_p * curve) {
     mpz_init_set_str(e, msg, 16);
     int orderBits = mpz_sizeinbase(curve->q, 2);
     int digestBits = strlen(msg) * 4;
@@ -20,6 +24,25 @@ void signZZ_p(Sig * sig, char * msg, mpz_t d, mpz_t k, const CurveZZ_p * curve)
     if(digestBits > orderBits) {
         mpz_fdiv_q_2exp(e, e, digestBits - orderBits);
     }
+}
+
+
+void signZZ_p(Sig * sig, char * msg, mpz_t d, mpz_t k, const CurveZZ_p * curve) {
+    mpz_t e, kinv;
+
+    // R = k * G, r = R[x], with the fixed base table (read in constant time) as the nonce is secret
+    JacobianZZ_p jacobianR;
+    PointZZ_p R;
+    jacobianZZ_pInit(&jacobianR);
+    mpz_inits(R.x, R.y, NULL);
+    jacobianZZ_pMulBase(&jacobianR, k, curve);
+    jacobianZZ_pToAffine(&R, &jacobianR, curve);
+    jacobianZZ_pClear(&jacobianR);
+    mpz_init_set(sig->r, R.x);
+    mpz_mod(sig->r, sig->r, curve->q);
+
+    // convert digest to integer (digest is computed as hex in ecdsa.py)
+    digestToMpz(e, msg, curve);
 
     // s = (k^-1 * (e + d * r)) mod n
     mpz_inits(kinv, sig->s, NULL);
@@ -34,93 +57,865 @@ void signZZ_p(Sig * sig, char * msg, mpz_t d, mpz_t k, const CurveZZ_p * curve)
 
 
 int verifyZZ_p(Sig * sig, char * msg, PointZZ_p * Q, const CurveZZ_p * curve) {
-    mpz_t e, w, u1, u2;
+    mpz_t e, w, u[2];
+    JacobianZZ_p terms[2], sum;
     PointZZ_p tmp;
-    mpz_inits(w, u1, u2, tmp.x, tmp.y, NULL);
+    mpz_inits(w, u[0], u[1], tmp.x, tmp.y, NULL);
 
     // convert digest to integer (digest is computed as hex in ecdsa.py)
-    mpz_init_set_str(e, msg, 16);
-    int orderBits = mpz_sizeinbase(curve->q, 2);
-    int digestBits = strlen(msg) * 4;
-
-    if(digestBits > orderBits) {
-        mpz_fdiv_q_2exp(e, e, digestBits - orderBits);
-    }
+    digestToMpz(e, msg, curve);
 
     mpz_invert(w, sig->s, curve->q);
-    mpz_mul(u1, e, w);
-    mpz_mod(u1, u1, curve->q);
-    mpz_mul(u2, sig->r, w);
-    mpz_mod(u2, u2, curve->q);
-
-    pointZZ_pShamirsTrick(&tmp, curve->g, u1, Q, u2, curve);
+    mpz_mul(u[0], e, w);
+    mpz_mod(u[0], u[0], curve->q);
+    mpz_mul(u[1], sig->r, w);
+    mpz_mod(u[1], u[1], curve->q);
+
+    // u1 * G + u2 * Q
+    jacobianZZ_pInit(&terms[0]);
+    jacobianZZ_pInit(&terms[1]);
+    jacobianZZ_pInit(&sum);
+    jacobianZZ_pSetAffine(&terms[0], curve->g);
+    jacobianZZ_pSetAffine(&terms[1], Q);
+    jacobianZZ_pMultiMul(&sum, terms, u, 2, curve);
+    jacobianZZ_pToAffine(&tmp, &sum, curve);
     mpz_mod(tmp.x, tmp.x, curve->q);
 
-    int equal = (mpz_cmp(tmp.x, sig->r) == 0);
-    mpz_clears(e, w, u1, u2, tmp.x, tmp.y, NULL);
+    int equal = !jacobianZZ_pIsIdentityElement(&sum) && (mpz_cmp(tmp.x, sig->r) == 0);
+    jacobianZZ_pClear(&terms[0]);
+    jacobianZZ_pClear(&terms[1]);
+    jacobianZZ_pClear(&sum);
+    mpz_clears(e, w, u[0], u[1], tmp.x, tmp.y, NULL);
     return equal;
 }
 
 
+/*
+ * Recover the public key(s) that verify a signature. With a recovery id (0 - 3, bit 0 is the parity
+ * of R's y coordinate and bit 1 is set if R's x coordinate is r + q) the single key is computed with
+ * one double scalar multiplication Q = -z / r * G + s / r * R. Without one (recid < 0) both keys for
+ * x = r are computed from the shared terms A = s / r * R and B = -z / r * G as A + B and -A + B, in
+ * the order of R's y parity. Returns the number of keys written to keys, 0 if there are none.
+ */
+int recoverZZ_p(PointZZ_p * keys, Sig * sig, char * msg, int recid, const CurveZZ_p * curve) {
+    if(mpz_sgn(sig->r) <= 0 || mpz_cmp(sig->r, curve->q) >= 0 ||
+       mpz_sgn(sig->s) <= 0 || mpz_cmp(sig->s, curve->q) >= 0) {
+        return 0;
+    }
+
+    PointZZ_p R;
+    mpz_t e, rinv, u[2];
+    mpz_inits(R.x, R.y, rinv, u[0], u[1], NULL);
+
+    // R's x coordinate, the curve order was added to it if it overflowed when r was reduced
+    mpz_set(R.x, sig->r);
+    if(recid >= 2) {
+        mpz_add(R.x, R.x, curve->q);
+    }
+
+    int count = 0;
+    if(pointZZ_pDecompress(&R, R.x, recid > 0 && (recid & 1), curve)) {
+        digestToMpz(e, msg, curve);
+
+        // u1 = -z / r, u2 = s / r
+        mpz_invert(rinv, sig->r, curve->q);
+        mpz_mul(u[0], e, rinv);
+        mpz_neg(u[0], u[0]);
+        mpz_mod(u[0], u[0], curve->q);
+        mpz_mul(u[1], sig->s, rinv);
+        mpz_mod(u[1], u[1], curve->q);
+
+        JacobianZZ_p terms[2], candidates[2];
+        int i;
+        for(i = 0; i < 2; i++) {
+            jacobianZZ_pInit(&terms[i]);
+            jacobianZZ_pInit(&candidates[i]);
+        }
+        jacobianZZ_pSetAffine(&terms[0], curve->g);
+        jacobianZZ_pSetAffine(&terms[1], &R);
+
+        if(recid >= 0) {
+            jacobianZZ_pMultiMul(&candidates[0], terms, u, 2, curve);
+            count = 1;
+        } else {
+            // terms become B = u1 * G and A = u2 * R
+            jacobianZZ_pMul(&terms[0], &terms[0], u[0], curve);
+            jacobianZZ_pMul(&terms[1], &terms[1], u[1], curve);
+            jacobianZZ_pAdd(&candidates[0], &terms[1], &terms[0], curve);
+            jacobianZZ_pNeg(&terms[1], &terms[1], curve);
+            jacobianZZ_pAdd(&candidates[1], &terms[1], &terms[0], curve);
+            count = 2;
+        }
+
+        for(i = 0; i < count; i++) {
+            if(jacobianZZ_pIsIdentityElement(&candidates[i])) {
+                count = 0;
+            }
+        }
+        jacobianZZ_pBatchToAffine(keys, candidates, count, curve);
+
+        for(i = 0; i < 2; i++) {
+            jacobianZZ_pClear(&terms[i]);
+            jacobianZZ_pClear(&candidates[i]);
+        }
+        mpz_clear(e);
+    }
+
+    mpz_clears(R.x, R.y, rinv, u[0], u[1], NULL);
+    return count;
+}
+
+
+/*
+ * Recover the public keys of n signatures from their recovery ids (see recoverZZ_p). The inverses
+ * of all r are computed with one inversion, the tables of multiples of every R with another and
+ * the keys are normalized with a third. gTable holds the multiples of G used by Straus' method.
+ * Returns -1 on success or the index of the first signature no key can be recovered for.
+ */
+static long recoverBatchZZ_p(PointZZ_p * keys, mpz_t * r, mpz_t * s, mpz_t * e, const int * recids,
+    size_t n, PointZZ_p * gTable, const CurveZZ_p * curve)
+{
+    size_t tableSize = n * STRAUS_WINDOW_SIZE, i;
+    PointZZ_p * R = (PointZZ_p *)malloc(n * sizeof(PointZZ_p));
+    PointZZ_p * table = (PointZZ_p *)malloc(tableSize * sizeof(PointZZ_p));
+    JacobianZZ_p * jacobianTable = (JacobianZZ_p *)calloc(tableSize, sizeof(JacobianZZ_p));
+    JacobianZZ_p * results = (JacobianZZ_p *)calloc(n, sizeof(JacobianZZ_p));
+    mpz_t * rinv = (mpz_t *)malloc(n * sizeof(mpz_t));
+    mpz_t u[2];
+    long failed = -1;
+
+    mpz_inits(u[0], u[1], NULL);
+    for(i = 0; i < n; i++) {
+        mpz_inits(R[i].x, R[i].y, rinv[i], NULL);
+        jacobianZZ_pInit(&results[i]);
+    }
+    for(i = 0; i < tableSize; i++) {
+        mpz_inits(table[i].x, table[i].y, NULL);
+        jacobianZZ_pInit(&jacobianTable[i]);
+    }
+
+    for(i = 0; i < n && failed < 0; i++) {
+        if(mpz_sgn(r[i]) <= 0 || mpz_cmp(r[i], curve->q) >= 0 || mpz_sgn(s[i]) <= 0 || mpz_cmp(s[i], curve->q) >= 0) {
+            failed = i;
+            break;
+        }
+
+        mpz_set(R[i].x, r[i]);
+        if(recids[i] >= 2) {
+            mpz_add(R[i].x, R[i].x, curve->q);
+        }
+        if(!pointZZ_pDecompress(&R[i], R[i].x, recids[i] & 1, curve)) {
+            failed = i;
+            break;
+        }
+        jacobianZZ_pStrausTable(&jacobianTable[i * STRAUS_WINDOW_SIZE], &R[i], curve);
+    }
+
+    if(failed < 0) {
+        mpz_batch_invert(rinv, r, n, curve->q);
+        jacobianZZ_pBatchToAffine(table, jacobianTable, tableSize, curve);
+
+        for(i = 0; i < n; i++) {
+            PointZZ_p * tables[2] = {gTable, &table[i * STRAUS_WINDOW_SIZE]};
+
+            // u1 = -z / r, u2 = s / r
+            mpz_mul(u[0], e[i], rinv[i]);
+            mpz_neg(u[0], u[0]);
+            mpz_mod(u[0], u[0], curve->q);
+            mpz_mul(u[1], s[i], rinv[i]);
+            mpz_mod(u[1], u[1], curve->q);
+
+            jacobianZZ_pStrausEvaluate(&results[i], tables, u, 2, curve);
+            if(jacobianZZ_pIsIdentityElement(&results[i])) {
+                failed = i;
+                break;
+            }
+        }
+    }
+
+    if(failed < 0) {
+        jacobianZZ_pBatchToAffine(keys, results, n, curve);
+    }
+
+    for(i = 0; i < n; i++) {
+        mpz_clears(R[i].x, R[i].y, rinv[i], NULL);
+        jacobianZZ_pClear(&results[i]);
+    }
+    for(i = 0; i < tableSize; i++) {
+        mpz_clears(table[i].x, table[i].y, NULL);
+        jacobianZZ_pClear(&jacobianTable[i]);
+    }
+    mpz_clears(u[0], u[1], NULL);
+    free(R);
+    free(table);
+    free(jacobianTable);
+    free(results);
+    free(rinv);
+    return failed;
+}
+
+
+/*
+ * Compute the message independent part of n signatures: r = (k * G)[x] mod q and k^-1 mod q for
+ * every nonce k (0 < k < q). The multiples of G come from the fixed base table and are normalized
+ * with one inversion, all k are inverted with another.
+ */
+static void precomputeNoncesZZ_p(mpz_t * r, mpz_t * kinv, mpz_t * k, size_t n, const CurveZZ_p * curve) {
+    JacobianZZ_p * R = (JacobianZZ_p *)calloc(n, sizeof(JacobianZZ_p));
+    PointZZ_p * affine = (PointZZ_p *)malloc(n * sizeof(PointZZ_p));
+    size_t i;
+
+    for(i = 0; i < n; i++) {
+        jacobianZZ_pInit(&R[i]);
+        mpz_inits(affine[i].x, affine[i].y, NULL);
+        jacobianZZ_pMulBase(&R[i], k[i], curve);
+    }
+    jacobianZZ_pBatchToAffine(affine, R, n, curve);
+    mpz_batch_invert(kinv, k, n, curve->q);
+
+    for(i = 0; i < n; i++) {
+        mpz_mod(r[i], affine[i].x, curve->q);
+        jacobianZZ_pClear(&R[i]);
+        mpz_clears(affine[i].x, affine[i].y, NULL);
+    }
+    free(R);
+    free(affine);
+}
+
+
+/*
+ * DER encode a signature whose integers' minimal two's complement encodings are rlen and slen
+ * bytes long. Returns a new bytes object and where the content of both integers goes.
+ */
+static PyObject * derSignatureNew(size_t rlen, size_t slen, unsigned char ** rout, unsigned char ** sout) {
+    size_t content = derHeaderSize(rlen) + rlen + derHeaderSize(slen) + slen;
+    PyObject * ret = PyBytes_FromStringAndSize(NULL, derHeaderSize(content) + content);
+    if(ret == NULL) {
+        return NULL;
+    }
+
+    unsigned char * out = (unsigned char *)PyBytes_AS_STRING(ret);
+    out = derWriteHeader(out, DER_SEQUENCE, content);
+    *rout = derWriteHeader(out, DER_INTEGER, rlen);
+    *sout = derWriteHeader(*rout + rlen, DER_INTEGER, slen);
+    return ret;
+}
+
+
+static PyObject * derEncodeMpz(const mpz_t r, const mpz_t s) {
+    // a zero byte is prepended when the top bit is set (which mpz_sizeinbase counts in)
+    size_t rlen = mpz_sizeinbase(r, 2) / 8 + 1, slen = mpz_sizeinbase(s, 2) / 8 + 1;
+    unsigned char * rout, * sout;
+
+    PyObject * ret = derSignatureNew(rlen, slen, &rout, &sout);
+    if(ret != NULL) {
+        mpzToBytes(rout, rlen, r);
+        mpzToBytes(sout, slen, s);
+    }
+    return ret;
+}
+
+
+static PyObject * derEncodePyLongs(PyObject * r, PyObject * s) {
+    Py_ssize_t rlen = pyLongSignedByteLength(r), slen;
+    if(rlen < 0 || (slen = pyLongSignedByteLength(s)) < 0) {
+        return NULL;
+    }
+
+    unsigned char * rout, * sout;
+    PyObject * ret = derSignatureNew(rlen, slen, &rout, &sout);
+    if(ret != NULL && (pyLongToBytes(rout, rlen, r) || pyLongToBytes(sout, slen, s))) {
+        Py_CLEAR(ret);
+    }
+    return ret;
+}
+
+
+// decode a DER signature into an (r, s) tuple, index is the position of the signature in a batch
+static PyObject * derDecodePyLongs(PyObject * obj, Py_ssize_t index) {
+    Py_buffer data;
+    if(PyObject_GetBuffer(obj, &data, PyBUF_SIMPLE)) {
+        return NULL;
+    }
+
+    const unsigned char * r, * s;
+    size_t rlen, slen;
+    const char * error = derDecodeSignature((const unsigned char *)data.buf, data.len, &r, &rlen, &s, &slen);
+
+    PyObject * ret = NULL;
+    if(error == NULL) {
+        ret = Py_BuildValue("NN", pyLongFromBytes(r, rlen), pyLongFromBytes(s, slen));
+    } else if(index < 0) {
+        PyErr_SetString(PyExc_ValueError, error);
+    } else {
+        PyErr_Format(PyExc_ValueError, "%s (signature at index %zd)", error, index);
+    }
+    PyBuffer_Release(&data);
+    return ret;
+}
+
+
 /******************************************************************************
  PYTHON BINDINGS
  ******************************************************************************/
 static PyObject * _ecdsa_sign(PyObject *self, PyObject *args) {
-    char * msg, * d, * k, * p, * a, * b, * q, * gx, * gy;
+    char * msg;
+    PyObject * d, * k, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "sOOO", &msg, &d, &k, &curveObj)) {
+        return NULL;
+    }
 
-    if (!PyArg_ParseTuple(args, "sssssssss", &msg, &d, &k, &p, &a, &b, &q, &gx, &gy)) {
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
         return NULL;
     }
 
     mpz_t privKey, nonce;
-    CurveZZ_p * curve = buildCurveZZ_p(p, a, b, q, gx, gy, 10);
-    Sig sig;
+    mpz_inits(privKey, nonce, NULL);
 
-    mpz_init_set_str(privKey, d, 10);
-    mpz_init_set_str(nonce, k, 10);
+    if(mpzFromPyLong(privKey, d) || mpzFromPyLong(nonce, k)) {
+        mpz_clears(privKey, nonce, NULL);
+        return NULL;
+    }
 
+    // the table used by signZZ_p is built while the GIL is held
+    curveZZ_pFixedBasePrecompute(curve);
+
+    Sig sig;
     signZZ_p(&sig, msg, privKey, nonce, curve);
-    destroyCurveZZ_p(curve);
 
-    char * resultR = mpz_get_str(NULL, 10, sig.r);
-    char * resultS = mpz_get_str(NULL, 10, sig.s);
+    PyObject * ret = Py_BuildValue("NN", pyLongFromMpz(sig.r), pyLongFromMpz(sig.s));
     mpz_clears(sig.r, sig.s, privKey, nonce, NULL);
+    return ret;
+}
+
+
+static PyObject * _ecdsa_sign_der(PyObject *self, PyObject *args) {
+    char * msg;
+    PyObject * d, * k, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "sOOO", &msg, &d, &k, &curveObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
+
+    mpz_t privKey, nonce;
+    mpz_inits(privKey, nonce, NULL);
 
-    PyObject * ret = Py_BuildValue("ss", resultR, resultS);
-    free(resultR);
-    free(resultS);
+    if(mpzFromPyLong(privKey, d) || mpzFromPyLong(nonce, k)) {
+        mpz_clears(privKey, nonce, NULL);
+        return NULL;
+    }
+
+    // the table used by signZZ_p is built while the GIL is held
+    curveZZ_pFixedBasePrecompute(curve);
+
+    Sig sig;
+    signZZ_p(&sig, msg, privKey, nonce, curve);
+
+    PyObject * ret = derEncodeMpz(sig.r, sig.s);
+    mpz_clears(sig.r, sig.s, privKey, nonce, NULL);
     return ret;
 }
 
 
 static PyObject * _ecdsa_verify(PyObject *self, PyObject *args) {
-    char * r, * s, * msg, * qx, * qy, * p, * a, * b, * q, * gx, * gy;
+    char * msg;
+    PyObject * r, * s, * qx, * qy, * curveObj;
 
-    if (!PyArg_ParseTuple(args, "sssssssssss", &r, &s, &msg, &qx, &qy, &p, &a, &b, &q, &gx, &gy)) {
+    if (!PyArg_ParseTuple(args, "OOsOOO", &r, &s, &msg, &qx, &qy, &curveObj)) {
         return NULL;
     }
 
-    Sig sig;
-    mpz_init_set_str(sig.r, r, 10);
-    mpz_init_set_str(sig.s, s, 10);
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
 
-    CurveZZ_p * curve = buildCurveZZ_p(p, a, b, q, gx, gy, 10);
-    int valid = 0;
+    Sig sig;
+    PointZZ_p Q;
+    mpz_inits(sig.r, sig.s, Q.x, Q.y, NULL);
 
-    PointZZ_p * Q = buildPointZZ_p(qx, qy, 10);
-    valid = verifyZZ_p(&sig, msg, Q, curve);
+    if(mpzFromPyLong(sig.r, r) || mpzFromPyLong(sig.s, s) ||
+       mpzFromPyLong(Q.x, qx) || mpzFromPyLong(Q.y, qy)) {
+        mpz_clears(sig.r, sig.s, Q.x, Q.y, NULL);
+        return NULL;
+    }
 
-    destroyCurveZZ_p(curve);
-    destroyPointZZ_p(Q);
+    int valid = verifyZZ_p(&sig, msg, &Q, curve);
 
-    mpz_clears(sig.r, sig.s, NULL);
+    mpz_clears(sig.r, sig.s, Q.x, Q.y, NULL);
     return Py_BuildValue("O", valid ? Py_True : Py_False);
 }
 
 
+static PyObject * _ecdsa_recover(PyObject *self, PyObject *args) {
+    char * msg;
+    int recid;
+    PyObject * r, * s, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OOsiO", &r, &s, &msg, &recid, &curveObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    } else if(recid > 3) {
+        PyErr_SetString(PyExc_ValueError, "The recovery id must be between 0 and 3");
+        return NULL;
+    }
+
+    Sig sig;
+    PointZZ_p keys[2];
+    mpz_inits(sig.r, sig.s, keys[0].x, keys[0].y, keys[1].x, keys[1].y, NULL);
+
+    PyObject * ret = NULL;
+    if(mpzFromPyLong(sig.r, r) == 0 && mpzFromPyLong(sig.s, s) == 0) {
+        int count = recoverZZ_p(keys, &sig, msg, recid, curve), i;
+
+        ret = PyTuple_New(count);
+        for(i = 0; ret != NULL && i < count; i++) {
+            PyObject * key = Py_BuildValue("NN", pyLongFromMpz(keys[i].x), pyLongFromMpz(keys[i].y));
+            if(key == NULL) {
+                Py_CLEAR(ret);
+                break;
+            }
+            PyTuple_SET_ITEM(ret, i, key);
+        }
+    }
+
+    mpz_clears(sig.r, sig.s, keys[0].x, keys[0].y, keys[1].x, keys[1].y, NULL);
+    return ret;
+}
+
+
+/*
+ * Read the signature, digest and recovery id of one entry of recover_batch. The digest is the raw
+ * hash (not hex) and is truncated to the bit length of the curve order. Returns 0 or -1 with a
+ * python exception set.
+ */
+static int recoverBatchParse(mpz_t r, mpz_t s, mpz_t e, int * recid, PyObject * sigObj,
+    PyObject * digestObj, PyObject * recidObj, const CurveZZ_p * curve)
+{
+    PyObject * sig = PySequence_Fast(sigObj, "signatures must be (r, s) pairs");
+    if(sig == NULL) {
+        return -1;
+    } else if(PySequence_Fast_GET_SIZE(sig) != 2) {
+        PyErr_SetString(PyExc_ValueError, "signatures must be (r, s) pairs");
+        Py_DECREF(sig);
+        return -1;
+    }
+
+    int status = mpzFromPyLong(r, PySequence_Fast_GET_ITEM(sig, 0)) || mpzFromPyLong(s, PySequence_Fast_GET_ITEM(sig, 1));
+    Py_DECREF(sig);
+    if(status) {
+        return -1;
+    }
+
+    long id = PyLong_AsLong(recidObj);
+    if(id == -1 && PyErr_Occurred()) {
+        return -1;
+    } else if(id < 0 || id > 3) {
+        PyErr_SetString(PyExc_ValueError, "The recovery id must be between 0 and 3");
+        return -1;
+    }
+    *recid = (int)id;
+
+    Py_buffer view;
+    if(PyObject_GetBuffer(digestObj, &view, PyBUF_SIMPLE) < 0) {
+        return -1;
+    }
+    mpz_import(e, view.len, 1, 1, 1, 0, view.buf);
+    size_t orderBits = mpz_sizeinbase(curve->q, 2), digestBits = (size_t)view.len * 8;
+    if(digestBits > orderBits) {
+        mpz_fdiv_q_2exp(e, e, digestBits - orderBits);
+    }
+    PyBuffer_Release(&view);
+    return 0;
+}
+
+
+static PyObject * _ecdsa_recover_batch(PyObject *self, PyObject *args) {
+    PyObject * sigsObj, * digestsObj, * recidsObj, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OOOO", &sigsObj, &digestsObj, &recidsObj, &curveObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
+
+    PyObject * sigs = PySequence_Fast(sigsObj, "signatures must be a sequence");
+    PyObject * digests = sigs == NULL ? NULL : PySequence_Fast(digestsObj, "digests must be a sequence");
+    PyObject * recids = digests == NULL ? NULL : PySequence_Fast(recidsObj, "recovery ids must be a sequence");
+    if(recids == NULL) {
+        Py_XDECREF(sigs);
+        Py_XDECREF(digests);
+        return NULL;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(sigs), start, i;
+    if(PySequence_Fast_GET_SIZE(digests) != n || PySequence_Fast_GET_SIZE(recids) != n) {
+        PyErr_SetString(PyExc_ValueError, "signatures, digests and recovery ids must have the same length");
+        Py_DECREF(sigs);
+        Py_DECREF(digests);
+        Py_DECREF(recids);
+        return NULL;
+    }
+
+    // every key is written as x || y, each coordinate padded to the byte length of p
+    size_t coordinateBytes = (mpz_sizeinbase(curve->p, 2) + 7) / 8;
+    PyObject * ret = PyBytes_FromStringAndSize(NULL, n * 2 * coordinateBytes);
+    unsigned char * out = ret == NULL ? NULL : (unsigned char *)PyBytes_AS_STRING(ret);
+
+    // the multiples of G are shared by every signature
+    JacobianZZ_p gJacobian[STRAUS_WINDOW_SIZE];
+    PointZZ_p gTable[STRAUS_WINDOW_SIZE], keys[RECOVER_CHUNK_SIZE];
+    mpz_t r[RECOVER_CHUNK_SIZE], s[RECOVER_CHUNK_SIZE], e[RECOVER_CHUNK_SIZE];
+    int recidValues[RECOVER_CHUNK_SIZE];
+
+    for(i = 0; i < STRAUS_WINDOW_SIZE; i++) {
+        jacobianZZ_pInit(&gJacobian[i]);
+        mpz_inits(gTable[i].x, gTable[i].y, NULL);
+    }
+    for(i = 0; i < RECOVER_CHUNK_SIZE; i++) {
+        mpz_inits(keys[i].x, keys[i].y, r[i], s[i], e[i], NULL);
+    }
+    jacobianZZ_pStrausTable(gJacobian, curve->g, curve);
+    jacobianZZ_pBatchToAffine(gTable, gJacobian, STRAUS_WINDOW_SIZE, curve);
+
+    for(start = 0; ret != NULL && start < n; start += RECOVER_CHUNK_SIZE) {
+        Py_ssize_t count = n - start < RECOVER_CHUNK_SIZE ? n - start : RECOVER_CHUNK_SIZE;
+        long failed;
+
+        for(i = 0; i < count; i++) {
+            if(recoverBatchParse(r[i], s[i], e[i], &recidValues[i], PySequence_Fast_GET_ITEM(sigs, start + i),
+                                 PySequence_Fast_GET_ITEM(digests, start + i), PySequence_Fast_GET_ITEM(recids, start + i), curve)) {
+                Py_CLEAR(ret);
+                break;
+            }
+        }
+        if(ret == NULL) {
+            break;
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+        failed = recoverBatchZZ_p(keys, r, s, e, recidValues, count, gTable, curve);
+        for(i = 0; failed < 0 && i < count; i++) {
+            unsigned char * key = out + (start + i) * 2 * coordinateBytes;
+            mpzToBytes(key, coordinateBytes, keys[i].x);
+            mpzToBytes(key + coordinateBytes, coordinateBytes, keys[i].y);
+        }
+        Py_END_ALLOW_THREADS
+
+        if(failed >= 0) {
+            PyErr_Format(PyExc_ValueError, "Could not recover the public key of the signature at index %zd", start + failed);
+            Py_CLEAR(ret);
+        }
+    }
+
+    for(i = 0; i < STRAUS_WINDOW_SIZE; i++) {
+        jacobianZZ_pClear(&gJacobian[i]);
+        mpz_clears(gTable[i].x, gTable[i].y, NULL);
+    }
+    for(i = 0; i < RECOVER_CHUNK_SIZE; i++) {
+        mpz_clears(keys[i].x, keys[i].y, r[i], s[i], e[i], NULL);
+    }
+    Py_DECREF(sigs);
+    Py_DECREF(digests);
+    Py_DECREF(recids);
+    return ret;
+}
+
+
+static PyObject * _ecdsa_precompute_nonces(PyObject *self, PyObject *args) {
+    PyObject * noncesObj, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OO", &noncesObj, &curveObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
+
+    PyObject * nonces = PySequence_Fast(noncesObj, "nonces must be a sequence");
+    if(nonces == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(nonces), i;
+    mpz_t * k = (mpz_t *)malloc((n ? n : 1) * sizeof(mpz_t));
+    mpz_t * r = (mpz_t *)malloc((n ? n : 1) * sizeof(mpz_t));
+    mpz_t * kinv = (mpz_t *)malloc((n ? n : 1) * sizeof(mpz_t));
+    int status = 0;
+
+    for(i = 0; i < n; i++) {
+        mpz_inits(k[i], r[i], kinv[i], NULL);
+    }
+    for(i = 0; i < n && status == 0; i++) {
+        status = mpzFromPyLong(k[i], PySequence_Fast_GET_ITEM(nonces, i));
+        if(status == 0 && (mpz_sgn(k[i]) <= 0 || mpz_cmp(k[i], curve->q) >= 0)) {
+            PyErr_SetString(PyExc_ValueError, "Nonces must be positive integers smaller than the curve order");
+            status = -1;
+        }
+    }
+
+    PyObject * ret = NULL;
+    if(status == 0) {
+        // the table is built while the GIL is held so concurrent callers don't race on it
+        curveZZ_pFixedBasePrecompute(curve);
+
+        Py_BEGIN_ALLOW_THREADS
+        precomputeNoncesZZ_p(r, kinv, k, n, curve);
+        Py_END_ALLOW_THREADS
+
+        ret = PyList_New(n);
+        for(i = 0; ret != NULL && i < n; i++) {
+            PyObject * item = Py_BuildValue("NN", pyLongFromMpz(r[i]), pyLongFromMpz(kinv[i]));
+            if(item == NULL) {
+                Py_CLEAR(ret);
+            } else {
+                PyList_SET_ITEM(ret, i, item);
+            }
+        }
+    }
+
+    for(i = 0; i < n; i++) {
+        mpz_clears(k[i], r[i], kinv[i], NULL);
+    }
+    free(k);
+    free(r);
+    free(kinv);
+    Py_DECREF(nonces);
+    return ret;
+}
+
+
+static PyObject * _ecdsa_encode_raw(PyObject *self, PyObject *args) {
+    PyObject * r, * s;
+    Py_ssize_t width;
+
+    if (!PyArg_ParseTuple(args, "OOn", &r, &s, &width)) {
+        return NULL;
+    } else if(width <= 0) {
+        PyErr_SetString(PyExc_ValueError, "The width must be positive");
+        return NULL;
+    }
+
+    PyObject * ret = PyBytes_FromStringAndSize(NULL, 2 * width);
+    if(ret != NULL) {
+        unsigned char * out = (unsigned char *)PyBytes_AS_STRING(ret);
+        if(pyLongToBytes(out, width, r) || pyLongToBytes(out + width, width, s)) {
+            Py_CLEAR(ret);
+        }
+    }
+    return ret;
+}
+
+
+static PyObject * _ecdsa_decode_raw(PyObject *self, PyObject *args) {
+    Py_buffer data;
+    Py_ssize_t width;
+
+    if (!PyArg_ParseTuple(args, "y*n", &data, &width)) {
+        return NULL;
+    } else if(width <= 0 || data.len != 2 * width) {
+        PyErr_Format(PyExc_ValueError, "Expected a signature of %zd bytes, got %zd", 2 * width, data.len);
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    const unsigned char * bytes = (const unsigned char *)data.buf;
+    PyObject * ret = Py_BuildValue("NN", pyLongFromBytes(bytes, width), pyLongFromBytes(bytes + width, width));
+    PyBuffer_Release(&data);
+    return ret;
+}
+
+
+static PyObject * _ecdsa_encode_raw_many(PyObject *self, PyObject *args) {
+    PyObject * rsObj, * ssObj;
+    Py_ssize_t width;
+
+    if (!PyArg_ParseTuple(args, "OOn", &rsObj, &ssObj, &width)) {
+        return NULL;
+    } else if(width <= 0) {
+        PyErr_SetString(PyExc_ValueError, "The width must be positive");
+        return NULL;
+    }
+
+    PyObject * rs = PySequence_Fast(rsObj, "r values must be a sequence");
+    if(rs == NULL) {
+        return NULL;
+    }
+    PyObject * ss = PySequence_Fast(ssObj, "s values must be a sequence");
+    if(ss == NULL) {
+        Py_DECREF(rs);
+        return NULL;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(rs), i;
+    PyObject * ret = NULL;
+    if(PySequence_Fast_GET_SIZE(ss) != n) {
+        PyErr_SetString(PyExc_ValueError, "There must be as many r values as s values");
+    } else {
+        ret = PyBytes_FromStringAndSize(NULL, n * 2 * width);
+    }
+
+    unsigned char * out = ret == NULL ? NULL : (unsigned char *)PyBytes_AS_STRING(ret);
+    for(i = 0; ret != NULL && i < n; i++, out += 2 * width) {
+        if(pyLongToBytes(out, width, PySequence_Fast_GET_ITEM(rs, i)) ||
+           pyLongToBytes(out + width, width, PySequence_Fast_GET_ITEM(ss, i))) {
+            Py_CLEAR(ret);
+        }
+    }
+
+    Py_DECREF(rs);
+    Py_DECREF(ss);
+    return ret;
+}
+
+
+static PyObject * _ecdsa_decode_raw_many(PyObject *self, PyObject *args) {
+    Py_buffer data;
+    Py_ssize_t width;
+
+    if (!PyArg_ParseTuple(args, "y*n", &data, &width)) {
+        return NULL;
+    } else if(width <= 0 || data.len % (2 * width)) {
+        PyErr_Format(PyExc_ValueError, "Expected a multiple of %zd bytes, got %zd", 2 * width, data.len);
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    Py_ssize_t n = data.len / (2 * width), i;
+    const unsigned char * bytes = (const unsigned char *)data.buf;
+    PyObject * rs = PyList_New(n), * ss = PyList_New(n);
+    for(i = 0; rs != NULL && ss != NULL && i < n; i++, bytes += 2 * width) {
+        PyObject * r = pyLongFromBytes(bytes, width), * s = pyLongFromBytes(bytes + width, width);
+        if(r == NULL || s == NULL) {
+            Py_XDECREF(r);
+            Py_XDECREF(s);
+            Py_CLEAR(rs);
+            break;
+        }
+        PyList_SET_ITEM(rs, i, r);
+        PyList_SET_ITEM(ss, i, s);
+    }
+    PyBuffer_Release(&data);
+
+    if(rs == NULL || ss == NULL) {
+        Py_XDECREF(rs);
+        Py_XDECREF(ss);
+        return NULL;
+    }
+    return Py_BuildValue("NN", rs, ss);
+}
+
+
+static PyObject * _ecdsa_der_encode(PyObject *self, PyObject *args) {
+    PyObject * r, * s;
+
+    if (!PyArg_ParseTuple(args, "OO", &r, &s)) {
+        return NULL;
+    }
+    return derEncodePyLongs(r, s);
+}
+
+
+static PyObject * _ecdsa_der_decode(PyObject *self, PyObject *args) {
+    PyObject * data;
+
+    if (!PyArg_ParseTuple(args, "O", &data)) {
+        return NULL;
+    }
+    return derDecodePyLongs(data, -1);
+}
+
+
+static PyObject * _ecdsa_der_encode_many(PyObject *self, PyObject *args) {
+    PyObject * sigsObj;
+
+    if (!PyArg_ParseTuple(args, "O", &sigsObj)) {
+        return NULL;
+    }
+
+    PyObject * sigs = PySequence_Fast(sigsObj, "signatures must be a sequence");
+    if(sigs == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(sigs), i;
+    PyObject * ret = PyList_New(n);
+    for(i = 0; ret != NULL && i < n; i++) {
+        PyObject * r, * s, * encoded = NULL;
+        if(PyArg_ParseTuple(PySequence_Fast_GET_ITEM(sigs, i), "OO", &r, &s)) {
+            encoded = derEncodePyLongs(r, s);
+        }
+        if(encoded == NULL) {
+            Py_CLEAR(ret);
+        } else {
+            PyList_SET_ITEM(ret, i, encoded);
+        }
+    }
+
+    Py_DECREF(sigs);
+    return ret;
+}
+
+
+static PyObject * _ecdsa_der_decode_many(PyObject *self, PyObject *args) {
+    PyObject * sigsObj;
+
+    if (!PyArg_ParseTuple(args, "O", &sigsObj)) {
+        return NULL;
+    }
+
+    PyObject * sigs = PySequence_Fast(sigsObj, "signatures must be a sequence");
+    if(sigs == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(sigs), i;
+    PyObject * ret = PyList_New(n);
+    for(i = 0; ret != NULL && i < n; i++) {
+        PyObject * decoded = derDecodePyLongs(PySequence_Fast_GET_ITEM(sigs, i), i);
+        if(decoded == NULL) {
+            Py_CLEAR(ret);
+        } else {
+            PyList_SET_ITEM(ret, i, decoded);
+        }
+    }
+
+    Py_DECREF(sigs);
+    return ret;
+}
+
+
 static PyMethodDef _ecdsa__methods__[] = {
     {"sign", _ecdsa_sign, METH_VARARGS, "Sign a message via ECDSA."},
     {"verify", _ecdsa_verify, METH_VARARGS, "Verify a signature via ECDSA."},
+    {"recover", _ecdsa_recover, METH_VARARGS, "Recover the public key(s) of an ECDSA signature."},
+    {"recover_batch", _ecdsa_recover_batch, METH_VARARGS, "Recover the public keys of many ECDSA signatures."},
+    {"sign_der", _ecdsa_sign_der, METH_VARARGS, "Sign a message via ECDSA and DER encode the signature."},
+    {"der_encode", _ecdsa_der_encode, METH_VARARGS, "DER encode a signature."},
+    {"der_decode", _ecdsa_der_decode, METH_VARARGS, "Decode a DER signature with BIP66 strictness."},
+    {"der_encode_many", _ecdsa_der_encode_many, METH_VARARGS, "DER encode many signatures."},
+    {"der_decode_many", _ecdsa_der_decode_many, METH_VARARGS, "Decode many DER signatures with BIP66 strictness."},
+    {"encode_raw", _ecdsa_encode_raw, METH_VARARGS, "Encode a signature as fixed width r || s."},
+    {"decode_raw", _ecdsa_decode_raw, METH_VARARGS, "Decode a fixed width r || s signature."},
+    {"encode_raw_many", _ecdsa_encode_raw_many, METH_VARARGS, "Encode many signatures as contiguous fixed width r || s."},
+    {"decode_raw_many", _ecdsa_decode_raw_many, METH_VARARGS, "Decode contiguous fixed width r || s signatures."},
+    {"precompute_nonces", _ecdsa_precompute_nonces, METH_VARARGS, "Compute r and the inverse of k for many ECDSA nonces."},
     {NULL, NULL, 0, NULL}        /* Sentinel */
 };
 
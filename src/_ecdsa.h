@@ -8,7 +8,8 @@
 #endif
 
 #include <gmp.h>
-#include "curveMath.h"
+#include "curve.h"
+#include "point.h"
 
 typedef struct {
     mpz_t r, s;
@@ -16,5 +17,6 @@ typedef struct {
 
 void signZZ_p(Sig * sig, char * msg, mpz_t d, mpz_t k, const CurveZZ_p * curve);
 int verifyZZ_p(Sig * sig, char * msg, PointZZ_p * Q, const CurveZZ_p * curve);
+int recoverZZ_p(PointZZ_p * keys, Sig * sig, char * msg, int recid, const CurveZZ_p * curve);
 
 #endif
@@ -0,0 +1,215 @@
+#include "convert.h"
+#include <string.h>
+
+
+/*
+ * Set rop to the value of a python int. Returns 0 on success and -1 (with a python exception set)
+ * if obj is not an int. Values that do not fit in a machine word go through a hex string, which
+ * is linear in the size of the number (unlike the decimal conversion).
+ */
+int mpzFromPyLong(mpz_t rop, PyObject * obj) {
+    if(!PyLong_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "expected an int, got %.200s", Py_TYPE(obj)->tp_name);
+        return -1;
+    }
+
+    int overflow;
+    long value = PyLong_AsLongAndOverflow(obj, &overflow);
+    if(!overflow) {
+        if(value == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        mpz_set_si(rop, value);
+        return 0;
+    }
+
+    PyObject * hex = PyNumber_ToBase(obj, 16);
+    if(hex == NULL) {
+        return -1;
+    }
+
+    const char * digits = PyUnicode_AsUTF8(hex);
+    if(digits == NULL) {
+        Py_DECREF(hex);
+        return -1;
+    }
+
+    // skip the "0x" or "-0x" prefix
+    int negative = digits[0] == '-';
+    mpz_set_str(rop, digits + (negative ? 3 : 2), 16);
+    if(negative) {
+        mpz_neg(rop, rop);
+    }
+
+    Py_DECREF(hex);
+    return 0;
+}
+
+
+PyObject * pyLongFromMpz(const mpz_t op) {
+    if(mpz_fits_slong_p(op)) {
+        return PyLong_FromLong(mpz_get_si(op));
+    }
+
+    void (*freefunc)(void *, size_t);
+    mp_get_memory_functions(NULL, NULL, &freefunc);
+
+    char * digits = mpz_get_str(NULL, 16, op);
+    PyObject * ret = PyLong_FromString(digits, NULL, 16);
+    freefunc(digits, strlen(digits) + 1);
+    return ret;
+}
+
+
+/*
+ * Write the non-negative op (which must fit in len bytes) to out as a big endian integer, left
+ * padded with zeros to len bytes.
+ */
+void mpzToBytes(unsigned char * out, size_t len, const mpz_t op) {
+    if(mpz_sgn(op) == 0) {
+        memset(out, 0, len);
+        return;
+    }
+
+    size_t count = (mpz_sizeinbase(op, 2) + 7) / 8;
+    memset(out, 0, len - count);
+    mpz_export(out + len - count, NULL, 1, 1, 1, 0, op);
+}
+
+
+/*
+ * Write the python int obj to out as a big endian integer, left padded with zeros to len bytes.
+ * Returns 0 on success and -1 (with a python exception set) if obj is not an int, is negative or
+ * doesn't fit in len bytes. Unlike mpzFromPyLong this copies the digits of the int directly.
+ */
+int pyLongToBytes(unsigned char * out, size_t len, PyObject * obj) {
+    if(!PyLong_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "expected an int, got %.200s", Py_TYPE(obj)->tp_name);
+        return -1;
+    }
+
+#if PY_VERSION_HEX >= 0x030D0000
+    Py_ssize_t size = PyLong_AsNativeBytes(obj, out, (Py_ssize_t)len,
+        Py_ASNATIVEBYTES_BIG_ENDIAN | Py_ASNATIVEBYTES_UNSIGNED_BUFFER | Py_ASNATIVEBYTES_REJECT_NEGATIVE);
+    if(size < 0) {
+        return -1;
+    } else if((size_t)size > len) {
+        PyErr_Format(PyExc_ValueError, "int does not fit in %zu bytes", len);
+        return -1;
+    }
+    return 0;
+#else
+    if(_PyLong_AsByteArray((PyLongObject *)obj, out, len, 0, 0) < 0) {
+        // raised for negative ints too
+        if(PyErr_ExceptionMatches(PyExc_OverflowError)) {
+            PyErr_Clear();
+            PyErr_Format(PyExc_ValueError, "int is negative or does not fit in %zu bytes", len);
+        }
+        return -1;
+    }
+    return 0;
+#endif
+}
+
+
+/*
+ * The length of the minimal two's complement encoding of the non-negative python int obj (e.g. as
+ * the content of an ASN.1 INTEGER), i.e. its byte length plus one if its top bit is set, and 1 for
+ * zero. Returns -1 (with a python exception set) if obj is not an int or is negative.
+ */
+Py_ssize_t pyLongSignedByteLength(PyObject * obj) {
+    if(!PyLong_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "expected an int, got %.200s", Py_TYPE(obj)->tp_name);
+        return -1;
+    }
+
+    PyObject * zero = PyLong_FromLong(0);
+    int negative = zero == NULL ? -1 : PyObject_RichCompareBool(obj, zero, Py_LT);
+    Py_XDECREF(zero);
+    if(negative != 0) {
+        if(negative > 0) {
+            PyErr_SetString(PyExc_ValueError, "expected a non-negative int");
+        }
+        return -1;
+    }
+
+#if PY_VERSION_HEX >= 0x030D0000
+    return PyLong_AsNativeBytes(obj, NULL, 0, Py_ASNATIVEBYTES_BIG_ENDIAN);
+#else
+    size_t bits = _PyLong_NumBits(obj);
+    if(bits == (size_t)-1 && PyErr_Occurred()) {
+        return -1;
+    }
+    return (Py_ssize_t)(bits / 8 + 1);
+#endif
+}
+
+
+// Read a non-negative big endian integer of len bytes.
+PyObject * pyLongFromBytes(const unsigned char * data, size_t len) {
+#if PY_VERSION_HEX >= 0x030D0000
+    return PyLong_FromUnsignedNativeBytes(data, len, Py_ASNATIVEBYTES_BIG_ENDIAN);
+#else
+    return _PyLong_FromByteArray(data, len, 0, 0);
+#endif
+}
+
+
+static void curveCapsuleDestructor(PyObject * capsule) {
+    CurveZZ_p * curve = (CurveZZ_p *)PyCapsule_GetPointer(capsule, CURVE_CAPSULE_NAME);
+    if(curve != NULL) {
+        destroyCurveZZ_p(curve);
+    }
+}
+
+
+PyObject * capsuleFromCurveZZ_p(CurveZZ_p * curve) {
+    PyObject * capsule = PyCapsule_New(curve, CURVE_CAPSULE_NAME, curveCapsuleDestructor);
+    if(capsule == NULL) {
+        destroyCurveZZ_p(curve);
+    }
+    return capsule;
+}
+
+
+/*
+ * Get the capsule of a native curve from either the capsule itself or an object (i.e. a
+ * fastecdsa.curve.Curve) holding one in its _native attribute. Returns a new reference.
+ */
+PyObject * curveCapsuleFromPyObject(PyObject * obj) {
+    PyObject * capsule;
+
+    if(PyCapsule_CheckExact(obj)) {
+        Py_INCREF(obj);
+        capsule = obj;
+    } else {
+        capsule = PyObject_GetAttrString(obj, "_native");
+        if(capsule == NULL) {
+            PyErr_Clear();
+        }
+    }
+
+    if(capsule == NULL || !PyCapsule_IsValid(capsule, CURVE_CAPSULE_NAME)) {
+        Py_XDECREF(capsule);
+        PyErr_Format(PyExc_TypeError, "expected a curve, got %.200s", Py_TYPE(obj)->tp_name);
+        return NULL;
+    }
+
+    return capsule;
+}
+
+
+/*
+ * Get the native curve from either a curve capsule or an object holding one in its _native
+ * attribute. The returned pointer is borrowed from obj.
+ */
+CurveZZ_p * curveZZ_pFromPyObject(PyObject * obj) {
+    PyObject * capsule = curveCapsuleFromPyObject(obj);
+    if(capsule == NULL) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = (CurveZZ_p *)PyCapsule_GetPointer(capsule, CURVE_CAPSULE_NAME);
+    Py_DECREF(capsule);
+    return curve;
+}
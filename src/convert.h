@@ -0,0 +1,22 @@
+#ifndef CONVERT_H
+#define CONVERT_H
+
+#include <Python.h>
+
+#include <gmp.h>
+#include "curve.h"
+
+// name of the capsules that hold a native curve, shared by the curvemath and _ecdsa modules
+#define CURVE_CAPSULE_NAME "fastecdsa.curvemath.CurveZZ_p"
+
+int mpzFromPyLong(mpz_t rop, PyObject * obj);
+PyObject * pyLongFromMpz(const mpz_t op);
+void mpzToBytes(unsigned char * out, size_t len, const mpz_t op);
+int pyLongToBytes(unsigned char * out, size_t len, PyObject * obj);
+Py_ssize_t pyLongSignedByteLength(PyObject * obj);
+PyObject * pyLongFromBytes(const unsigned char * data, size_t len);
+PyObject * capsuleFromCurveZZ_p(CurveZZ_p * curve);
+PyObject * curveCapsuleFromPyObject(PyObject * obj);
+CurveZZ_p * curveZZ_pFromPyObject(PyObject * obj);
+
+#endif
@@ -1,18 +1,43 @@
 #include "curve.h"
+#include "modSqrt.h"
+#include "fixedBase.h"
 #include <stdlib.h>
 
-CurveZZ_p * buildCurveZZ_p(char * p, char * a, char * b, char * q, char * gx, char * gy, int base) {
+CurveZZ_p * allocCurveZZ_p(void) {
     CurveZZ_p * curve = (CurveZZ_p *)malloc(sizeof(CurveZZ_p));
-    mpz_init_set_str(curve->p, p, base);
-    mpz_init_set_str(curve->a, a, base);
-    mpz_init_set_str(curve->b, b, base);
-    mpz_init_set_str(curve->q, q, base);
-    curve->g = buildPointZZ_p(gx, gy, base);
+    mpz_inits(curve->p, curve->a, curve->b, curve->q, NULL);
+    curve->g = (PointZZ_p *)malloc(sizeof(PointZZ_p));
+    mpz_inits(curve->g->x, curve->g->y, NULL);
+    mpz_init(curve->sqrtExp);
+    curve->sqrtTwoAdicity = 0;
+    curve->sqrtPowers = NULL;
+    curve->baseTable = NULL;
+    curve->baseTableWindows = 0;
+    return curve;
+}
+
+CurveZZ_p * buildCurveZZ_p(char * p, char * a, char * b, char * q, char * gx, char * gy, int base) {
+    CurveZZ_p * curve = allocCurveZZ_p();
+    mpz_set_str(curve->p, p, base);
+    mpz_set_str(curve->a, a, base);
+    mpz_set_str(curve->b, b, base);
+    mpz_set_str(curve->q, q, base);
+    mpz_set_str(curve->g->x, gx, base);
+    mpz_set_str(curve->g->y, gy, base);
+    curveZZ_pSqrtPrecompute(curve);
     return curve;
 }
 
 void destroyCurveZZ_p(CurveZZ_p * curve) {
-    mpz_clears(curve->p, curve->a, curve->b, curve->q, NULL);
+    mpz_clears(curve->p, curve->a, curve->b, curve->q, curve->sqrtExp, NULL);
+    if(curve->sqrtPowers != NULL) {
+        unsigned long i;
+        for(i = 0; i < curve->sqrtTwoAdicity; i++) {
+            mpz_clear(curve->sqrtPowers[i]);
+        }
+        free(curve->sqrtPowers);
+    }
+    curveZZ_pFixedBaseClear(curve);
     destroyPointZZ_p(curve->g);
     free(curve);
 }
@@ -1,6 +1,8 @@
 #ifndef CURVE_H
 #define CURVE_H
 
+#include <stddef.h>
+
 #include "gmp.h"
 
 #include "point.h"
@@ -9,8 +11,18 @@
 typedef struct {
     mpz_t p, a, b, q;
     PointZZ_p * g;
+
+    // square root constants for p, set by curveZZ_pSqrtPrecompute (see modSqrt.c)
+    mpz_t sqrtExp;
+    unsigned long sqrtTwoAdicity;
+    mpz_t * sqrtPowers;
+
+    // limbs of the odd multiples of g for fixed base multiplication, built on first use (see fixedBase.c)
+    mp_limb_t * baseTable;
+    size_t baseTableWindows;
 } CurveZZ_p;
 
+CurveZZ_p * allocCurveZZ_p(void);
 CurveZZ_p * buildCurveZZ_p(char * p, char * a, char * b, char * q, char * gx, char * gy, int base);
 void destroyCurveZZ_p(CurveZZ_p * curve);
 
@@ -1,4 +1,13 @@
 #include "curveMath.h"
+#include "convert.h"
+#include "fixedBase.h"
+#include "nativePoint.h"
+#include "jacobianMath.h"
+#include "modSqrt.h"
+#include "montgomery.h"
+#include "msm.h"
+#include "pointAccumulator.h"
+#include <stdlib.h>
 #include <string.h>
 
 int pointZZ_pEqual(const PointZZ_p * op1, const PointZZ_p * op2) {
@@ -207,73 +216,650 @@ void pointZZ_pShamirsTrick(PointZZ_p * rop, const PointZZ_p * point1, const mpz_
 /******************************************************************************
  PYTHON BINDINGS
  ******************************************************************************/
+static PyObject * curvemath_build_curve(PyObject *self, PyObject *args) {
+    PyObject * p, * a, * b, * q, * gx, * gy;
+
+    if (!PyArg_ParseTuple(args, "OOOOOO", &p, &a, &b, &q, &gx, &gy)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = allocCurveZZ_p();
+    if(mpzFromPyLong(curve->p, p) || mpzFromPyLong(curve->a, a) || mpzFromPyLong(curve->b, b) ||
+       mpzFromPyLong(curve->q, q) || mpzFromPyLong(curve->g->x, gx) || mpzFromPyLong(curve->g->y, gy)) {
+        destroyCurveZZ_p(curve);
+        return NULL;
+    }
+
+    curveZZ_pSqrtPrecompute(curve);
+    return capsuleFromCurveZZ_p(curve);
+}
+
+
 static PyObject * curvemath_mul(PyObject *self, PyObject *args) {
-    char * x, * y, * d, * p, * a, * b, * q, * gx, * gy;
+    PyObject * x, * y, * d, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OOOO", &x, &y, &d, &curveObj)) {
+        return NULL;
+    }
 
-    if (!PyArg_ParseTuple(args, "sssssssss", &x, &y, &d, &p, &a, &b, &q, &gx, &gy)) {
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
         return NULL;
     }
 
-    PointZZ_p result;
-    mpz_inits(result.x, result.y, NULL);
+    PointZZ_p point, result;
     mpz_t scalar;
-    mpz_init_set_str(scalar, d, 10);
-    CurveZZ_p * curve = buildCurveZZ_p(p, a, b, q, gx, gy, 10);;
+    mpz_inits(point.x, point.y, scalar, NULL);
 
-    PointZZ_p * point = buildPointZZ_p(x, y, 10);
-    pointZZ_pMul(&result, point, scalar, curve);
-    destroyPointZZ_p(point);
-    destroyCurveZZ_p(curve);
+    if(mpzFromPyLong(point.x, x) || mpzFromPyLong(point.y, y) || mpzFromPyLong(scalar, d)) {
+        mpz_clears(point.x, point.y, scalar, NULL);
+        return NULL;
+    }
+
+    pointZZ_pMul(&result, &point, scalar, curve);
+
+    PyObject * ret = Py_BuildValue("NN", pyLongFromMpz(result.x), pyLongFromMpz(result.y));
+    mpz_clears(point.x, point.y, scalar, result.x, result.y, NULL);
+    return ret;
+}
 
-    char * resultX = mpz_get_str(NULL, 10, result.x);
-    char * resultY = mpz_get_str(NULL, 10, result.y);
-    mpz_clears(result.x, result.y, scalar, NULL);
+static PyObject * curvemath_mul_x(PyObject *self, PyObject *args) {
+    PyObject * x, * y, * d, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OOOO", &x, &y, &d, &curveObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
+
+    PointZZ_p point;
+    mpz_t scalar, result;
+    mpz_inits(point.x, point.y, scalar, result, NULL);
+
+    PyObject * ret = NULL;
+    if(!mpzFromPyLong(point.x, x) && !mpzFromPyLong(point.y, y) && !mpzFromPyLong(scalar, d)) {
+        int found;
+
+        Py_BEGIN_ALLOW_THREADS
+        // the scalar is a (static) private key
+        found = pointZZ_pLadderX(result, &point, scalar, curve);
+        Py_END_ALLOW_THREADS
+
+        if(found) {
+            ret = pyLongFromMpz(result);
+        } else {
+            PyErr_SetString(PyExc_ValueError, "The product is the identity element");
+        }
+    }
+
+    mpz_clears(point.x, point.y, scalar, result, NULL);
+    return ret;
+}
+
+// peers are multiplied in chunks of this size by mul_x_many, bounding the memory used for them
+#define MUL_MANY_CHUNK_SIZE 256
+
+static PyObject * curvemath_mul_x_many(PyObject *self, PyObject *args) {
+    PyObject * pointsObj, * d, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OOO", &pointsObj, &d, &curveObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
+
+    PyObject * points = PySequence_Fast(pointsObj, "points must be a sequence");
+    if(points == NULL) {
+        return NULL;
+    }
+
+    mpz_t scalar, k;
+    mpz_inits(scalar, k, NULL);
+    if(mpzFromPyLong(scalar, d)) {
+        mpz_clears(scalar, k, NULL);
+        Py_DECREF(points);
+        return NULL;
+    } else if(mpz_sgn(scalar) <= 0) {
+        PyErr_SetString(PyExc_ValueError, "The scalar must be positive");
+        mpz_clears(scalar, k, NULL);
+        Py_DECREF(points);
+        return NULL;
+    }
+
+    /*
+     * The scalar is recoded once for all peers with regularRecode, which needs an odd scalar: it
+     * is made odd with k = d + 1 if d is even, and P is subtracted back from every k * P in
+     * constant time. Adding q instead (as jacobianZZ_pMulBase does) would be wrong for peers
+     * outside the subgroup of order q, which exist on curves with a cofactor. The number of
+     * windows only depends on the curve and the length of d, not on its digits.
+     */
+    mp_limb_t even = 1 - mpz_tstbit(scalar, 0);
+    mpz_add_ui(k, scalar, even);
+    size_t bits = mpz_sizeinbase(k, 2) > mpz_sizeinbase(curve->q, 2) ? mpz_sizeinbase(k, 2) : mpz_sizeinbase(curve->q, 2);
+    size_t windows = (bits + FIXED_BASE_WINDOW_BITS - 1) / FIXED_BASE_WINDOW_BITS;
+    unsigned char * indices = (unsigned char *)malloc(windows);
+    mp_limb_t * negative = (mp_limb_t *)malloc(windows * sizeof(mp_limb_t));
+    regularRecode(indices, negative, k, windows);
+
+    // every result is written as its x coordinate, padded to the byte length of p
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(points), start, i;
+    size_t coordinateBytes = (mpz_sizeinbase(curve->p, 2) + 7) / 8, tableSize = MUL_MANY_CHUNK_SIZE * FIXED_BASE_ENTRIES;
+    mp_size_t limbs = mpz_size(curve->p);
+    PyObject * ret = PyBytes_FromStringAndSize(NULL, n * coordinateBytes);
+    unsigned char * out = ret == NULL ? NULL : (unsigned char *)PyBytes_AS_STRING(ret);
+
+    // the chunk's peers and their products, and the tables of their odd multiples
+    JacobianZZ_p jacobian[MUL_MANY_CHUNK_SIZE], corrected;
+    PointZZ_p affine[MUL_MANY_CHUNK_SIZE], negated;
+    JacobianZZ_p * multiples = (JacobianZZ_p *)malloc(tableSize * sizeof(JacobianZZ_p));
+    PointZZ_p * affineMultiples = (PointZZ_p *)malloc(tableSize * sizeof(PointZZ_p));
+    mp_limb_t * tables = (mp_limb_t *)malloc(tableSize * 2 * limbs * sizeof(mp_limb_t));
+    for(i = 0; i < MUL_MANY_CHUNK_SIZE; i++) {
+        jacobianZZ_pInit(&jacobian[i]);
+        mpz_inits(affine[i].x, affine[i].y, NULL);
+    }
+    for(i = 0; i < (Py_ssize_t)tableSize; i++) {
+        jacobianZZ_pInit(&multiples[i]);
+        mpz_inits(affineMultiples[i].x, affineMultiples[i].y, NULL);
+    }
+    jacobianZZ_pInit(&corrected);
+    mpz_inits(negated.x, negated.y, NULL);
+
+    for(start = 0; ret != NULL && start < n; start += MUL_MANY_CHUNK_SIZE) {
+        Py_ssize_t count = n - start < MUL_MANY_CHUNK_SIZE ? n - start : MUL_MANY_CHUNK_SIZE, failed = -1;
+        int offCurve = 0, e;
+
+        for(i = 0; i < count; i++) {
+            PyObject * item = PySequence_Fast_GET_ITEM(points, start + i);
+            if(!NativePoint_Check(item)) {
+                PyErr_Format(PyExc_TypeError, "The point at index %zd is not a NativePoint", start + i);
+                Py_CLEAR(ret);
+                break;
+            } else if(nativePointToJacobian(&jacobian[i], item, curve)) {
+                Py_CLEAR(ret);
+                break;
+            }
+        }
+        if(ret == NULL) {
+            break;
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+        // the peers are normalized together and checked to be on the curve, a point that isn't
+        // could be of small order on another curve and leak the private key (invalid curve attack)
+        jacobianZZ_pBatchToAffine(affine, jacobian, count, curve);
+        for(i = 0; i < count && failed < 0; i++) {
+            if(jacobianZZ_pIsIdentityElement(&jacobian[i])) {
+                failed = i;
+            } else if(!pointZZ_pIsOnCurve(&affine[i], curve)) {
+                failed = i;
+                offCurve = 1;
+            }
+        }
+
+        if(failed < 0) {
+            // the odd multiples of all the peers of the chunk are normalized with one inversion
+            for(i = 0; i < count; i++) {
+                jacobianZZ_pOddMultiples(&multiples[i * FIXED_BASE_ENTRIES], &affine[i], curve);
+            }
+            jacobianZZ_pBatchToAffine(affineMultiples, multiples, count * FIXED_BASE_ENTRIES, curve);
+            memset(tables, 0, count * FIXED_BASE_ENTRIES * 2 * limbs * sizeof(mp_limb_t));
+            regularTablePack(tables, affineMultiples, count * FIXED_BASE_ENTRIES, limbs);
+
+            for(i = 0; i < count; i++) {
+                // a peer with an odd multiple that is the identity (a public property of the
+                // peer, only possible for points of small order) can't be stored in the table
+                for(e = 0; e < FIXED_BASE_ENTRIES; e++) {
+                    if(jacobianZZ_pIsIdentityElement(&multiples[i * FIXED_BASE_ENTRIES + e])) {
+                        break;
+                    }
+                }
+                if(e < FIXED_BASE_ENTRIES) {
+                    jacobianZZ_pSetAffine(&jacobian[i], &affine[i]);
+                    jacobianZZ_pMulSecret(&jacobian[i], &jacobian[i], scalar, curve);
+                    continue;
+                }
+
+                jacobianZZ_pMulRegular(&jacobian[i], &tables[i * FIXED_BASE_ENTRIES * 2 * limbs],
+                                       indices, negative, windows, curve);
+
+                // k * P - P, kept if d is even
+                mpz_set(negated.x, affine[i].x);
+                mpz_sub(negated.y, curve->p, affine[i].y);
+                jacobianZZ_pAddAffine(&corrected, &jacobian[i], &negated, curve);
+                mpz_cnd_swap(jacobian[i].x, corrected.x, even, limbs);
+                mpz_cnd_swap(jacobian[i].y, corrected.y, even, limbs);
+                mpz_cnd_swap(jacobian[i].z, corrected.z, even, limbs);
+            }
+            jacobianZZ_pBatchToAffine(affine, jacobian, count, curve);
+            for(i = 0; i < count && failed < 0; i++) {
+                if(jacobianZZ_pIsIdentityElement(&jacobian[i])) {
+                    failed = i;
+                } else {
+                    mpzToBytes(out + (start + i) * coordinateBytes, coordinateBytes, affine[i].x);
+                }
+            }
+        }
+        Py_END_ALLOW_THREADS
+
+        if(offCurve) {
+            PyErr_Format(PyExc_ValueError, "The point at index %zd is not on the curve", start + failed);
+            Py_CLEAR(ret);
+        } else if(failed >= 0) {
+            PyErr_Format(PyExc_ValueError, "The point at index %zd or its product is the identity element", start + failed);
+            Py_CLEAR(ret);
+        }
+    }
+
+    for(i = 0; i < MUL_MANY_CHUNK_SIZE; i++) {
+        jacobianZZ_pClear(&jacobian[i]);
+        mpz_clears(affine[i].x, affine[i].y, NULL);
+    }
+    for(i = 0; i < (Py_ssize_t)tableSize; i++) {
+        jacobianZZ_pClear(&multiples[i]);
+        mpz_clears(affineMultiples[i].x, affineMultiples[i].y, NULL);
+    }
+    jacobianZZ_pClear(&corrected);
+    mpz_clears(negated.x, negated.y, scalar, k, NULL);
+    free(multiples);
+    free(affineMultiples);
+    free(tables);
+    free(indices);
+    free(negative);
+    Py_DECREF(points);
+    return ret;
+}
+
+static PyObject * curvemath_mul_base_many(PyObject *self, PyObject *args) {
+    PyObject * scalarsObj, * curveObj, * offsetObj = Py_None;
+
+    if (!PyArg_ParseTuple(args, "OO|O", &scalarsObj, &curveObj, &offsetObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
+
+    // an optional point that is added to every product
+    JacobianZZ_p offset;
+    jacobianZZ_pInit(&offset);
+    if(offsetObj != Py_None && nativePointToJacobian(&offset, offsetObj, curve)) {
+        jacobianZZ_pClear(&offset);
+        return NULL;
+    }
+
+    PyObject * scalars = PySequence_Fast(scalarsObj, "scalars must be a sequence");
+    if(scalars == NULL) {
+        jacobianZZ_pClear(&offset);
+        return NULL;
+    }
+
+    // every product is written as its affine x and y coordinates, each padded to the byte length
+    // of p, the identity element as zeros
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(scalars), start, i;
+    size_t coordinateBytes = (mpz_sizeinbase(curve->p, 2) + 7) / 8;
+    PyObject * ret = PyBytes_FromStringAndSize(NULL, n * 2 * coordinateBytes);
+    unsigned char * out = ret == NULL ? NULL : (unsigned char *)PyBytes_AS_STRING(ret);
+
+    mpz_t k[MUL_MANY_CHUNK_SIZE];
+    JacobianZZ_p jacobian[MUL_MANY_CHUNK_SIZE];
+    PointZZ_p affine[MUL_MANY_CHUNK_SIZE];
+    for(i = 0; i < MUL_MANY_CHUNK_SIZE; i++) {
+        mpz_init(k[i]);
+        jacobianZZ_pInit(&jacobian[i]);
+        mpz_inits(affine[i].x, affine[i].y, NULL);
+    }
+
+    // the table is built while the GIL is held so concurrent callers don't race on it
+    curveZZ_pFixedBasePrecompute(curve);
+
+    for(start = 0; ret != NULL && start < n; start += MUL_MANY_CHUNK_SIZE) {
+        Py_ssize_t count = n - start < MUL_MANY_CHUNK_SIZE ? n - start : MUL_MANY_CHUNK_SIZE;
+
+        for(i = 0; i < count; i++) {
+            if(mpzFromPyLong(k[i], PySequence_Fast_GET_ITEM(scalars, start + i))) {
+                Py_CLEAR(ret);
+                break;
+            } else if(mpz_sgn(k[i]) < 0) {
+                PyErr_Format(PyExc_ValueError, "The scalar at index %zd is negative", start + i);
+                Py_CLEAR(ret);
+                break;
+            }
+        }
+        if(ret == NULL) {
+            break;
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+        for(i = 0; i < count; i++) {
+            jacobianZZ_pMulBase(&jacobian[i], k[i], curve);
+            if(offsetObj != Py_None) {
+                jacobianZZ_pAdd(&jacobian[i], &jacobian[i], &offset, curve);
+            }
+        }
+        jacobianZZ_pBatchToAffine(affine, jacobian, count, curve);
+        for(i = 0; i < count; i++) {
+            unsigned char * item = out + (start + i) * 2 * coordinateBytes;
+            mpzToBytes(item, coordinateBytes, affine[i].x);
+            mpzToBytes(item + coordinateBytes, coordinateBytes, affine[i].y);
+        }
+        Py_END_ALLOW_THREADS
+    }
+
+    for(i = 0; i < MUL_MANY_CHUNK_SIZE; i++) {
+        mpz_clear(k[i]);
+        jacobianZZ_pClear(&jacobian[i]);
+        mpz_clears(affine[i].x, affine[i].y, NULL);
+    }
+    jacobianZZ_pClear(&offset);
+    Py_DECREF(scalars);
+    return ret;
+}
+
+static PyObject * curvemath_montgomery_ladder(PyObject *self, PyObject *args) {
+    PyObject * kObj, * uObj, * pObj;
+    unsigned long a24, bits;
+
+    if (!PyArg_ParseTuple(args, "OOOkk", &kObj, &uObj, &pObj, &a24, &bits)) {
+        return NULL;
+    }
+
+    mpz_t k, u, p, result;
+    mpz_inits(k, u, p, result, NULL);
+
+    PyObject * ret = NULL;
+    if(!mpzFromPyLong(k, kObj) && !mpzFromPyLong(u, uObj) && !mpzFromPyLong(p, pObj)) {
+        if(mpz_sgn(k) < 0 || mpz_cmp_ui(p, 3) < 0) {
+            PyErr_SetString(PyExc_ValueError, "The scalar must be non-negative and the modulus an odd prime");
+        } else {
+            Py_BEGIN_ALLOW_THREADS
+            montgomeryZZ_pLadder(result, k, u, p, a24, bits);
+            Py_END_ALLOW_THREADS
+            ret = pyLongFromMpz(result);
+        }
+    }
 
-    PyObject * ret = Py_BuildValue("ss", resultX, resultY);
-    free(resultX);
-    free(resultY);
+    mpz_clears(k, u, p, result, NULL);
     return ret;
 }
 
 static PyObject * curvemath_add(PyObject *self, PyObject *args) {
-    char * px, * py, * qx, * qy, * p, * a, * b, * q, * gx, * gy;
+    PyObject * px, * py, * qx, * qy, * curveObj;
 
-    if (!PyArg_ParseTuple(args, "ssssssssss", &px, &py, &qx, &qy, &p, &a, &b, &q, &gx, &gy)) {
+    if (!PyArg_ParseTuple(args, "OOOOO", &px, &py, &qx, &qy, &curveObj)) {
         return NULL;
     }
 
-    PointZZ_p result;
-    mpz_inits(result.x, result.y, NULL);
-    CurveZZ_p * curve = buildCurveZZ_p(p, a, b, q, gx, gy, 10);;
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
 
-    PointZZ_p * P = buildPointZZ_p(px, py, 10);
-    PointZZ_p * Q = buildPointZZ_p(qx, qy, 10);
+    PointZZ_p P, Q, result;
+    mpz_inits(P.x, P.y, Q.x, Q.y, result.x, result.y, NULL);
 
-    if(pointZZ_pEqual(P, Q)) {
-        pointZZ_pDouble(&result, P, curve);
+    if(mpzFromPyLong(P.x, px) || mpzFromPyLong(P.y, py) ||
+       mpzFromPyLong(Q.x, qx) || mpzFromPyLong(Q.y, qy)) {
+        mpz_clears(P.x, P.y, Q.x, Q.y, result.x, result.y, NULL);
+        return NULL;
+    }
+
+    if(pointZZ_pEqual(&P, &Q)) {
+        pointZZ_pDouble(&result, &P, curve);
     }
     else {
-        pointZZ_pAdd(&result, P, Q, curve);
+        pointZZ_pAdd(&result, &P, &Q, curve);
     }
 
-    destroyPointZZ_p(P);
-    destroyPointZZ_p(Q);
-    destroyCurveZZ_p(curve);
+    PyObject * ret = Py_BuildValue("NN", pyLongFromMpz(result.x), pyLongFromMpz(result.y));
+    mpz_clears(P.x, P.y, Q.x, Q.y, result.x, result.y, NULL);
+    return ret;
+}
+
+
+static PyObject * curvemath_msm(PyObject *self, PyObject *args) {
+    PyObject * pointsObj, * scalarsObj, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OOO", &pointsObj, &scalarsObj, &curveObj)) {
+        return NULL;
+    }
 
-    char * resultX = mpz_get_str(NULL, 10, result.x);
-    char * resultY = mpz_get_str(NULL, 10, result.y);
-    mpz_clears(result.x, result.y, NULL);
+    PyObject * capsule = curveCapsuleFromPyObject(curveObj);
+    if(capsule == NULL) {
+        return NULL;
+    }
+    CurveZZ_p * curve = (CurveZZ_p *)PyCapsule_GetPointer(capsule, CURVE_CAPSULE_NAME);
+
+    PyObject * points = PySequence_Fast(pointsObj, "points must be a sequence");
+    PyObject * scalars = points == NULL ? NULL : PySequence_Fast(scalarsObj, "scalars must be a sequence");
+    if(scalars == NULL) {
+        Py_XDECREF(points);
+        Py_DECREF(capsule);
+        return NULL;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(points), i;
+    if(n != PySequence_Fast_GET_SIZE(scalars)) {
+        PyErr_SetString(PyExc_ValueError, "points and scalars must have the same length");
+        Py_DECREF(points);
+        Py_DECREF(scalars);
+        Py_DECREF(capsule);
+        return NULL;
+    }
+
+    JacobianZZ_p * terms = (JacobianZZ_p *)malloc((n ? n : 1) * sizeof(JacobianZZ_p));
+    mpz_t * k = (mpz_t *)malloc((n ? n : 1) * sizeof(mpz_t));
+    int status = 0;
+
+    for(i = 0; i < n; i++) {
+        jacobianZZ_pInit(&terms[i]);
+        mpz_init(k[i]);
+    }
+    for(i = 0; i < n && status == 0; i++) {
+        status = nativePointToJacobian(&terms[i], PySequence_Fast_GET_ITEM(points, i), curve) ||
+                 mpzFromPyLong(k[i], PySequence_Fast_GET_ITEM(scalars, i));
+    }
 
-    PyObject * ret = Py_BuildValue("ss", resultX, resultY);
-    free(resultX);
-    free(resultY);
+    NativePoint * result = status == 0 ? nativePointNew(capsule) : NULL;
+    if(result != NULL) {
+        Py_BEGIN_ALLOW_THREADS
+        jacobianZZ_pMultiMul(&result->point, terms, k, n, curve);
+        Py_END_ALLOW_THREADS
+    }
+
+    for(i = 0; i < n; i++) {
+        jacobianZZ_pClear(&terms[i]);
+        mpz_clear(k[i]);
+    }
+    free(terms);
+    free(k);
+    Py_DECREF(points);
+    Py_DECREF(scalars);
+    Py_DECREF(capsule);
+    return (PyObject *)result;
+}
+
+
+static PyObject * curvemath_decompress(PyObject *self, PyObject *args) {
+    PyObject * xObj, * curveObj;
+    int odd;
+
+    if (!PyArg_ParseTuple(args, "OpO", &xObj, &odd, &curveObj)) {
+        return NULL;
+    }
+
+    CurveZZ_p * curve = curveZZ_pFromPyObject(curveObj);
+    if(curve == NULL) {
+        return NULL;
+    }
+
+    PointZZ_p point;
+    mpz_inits(point.x, point.y, NULL);
+
+    PyObject * ret = NULL;
+    if(mpzFromPyLong(point.x, xObj) == 0) {
+        if(pointZZ_pDecompress(&point, point.x, odd, curve)) {
+            ret = pyLongFromMpz(point.y);
+        } else {
+            PyErr_SetString(PyExc_ValueError, "No point on the curve has this x coordinate and y parity");
+        }
+    }
+
+    mpz_clears(point.x, point.y, NULL);
     return ret;
 }
 
 
+/*
+ * Raise a ValueError for the key at position index of decode_public_keys, the position is given as
+ * the exception's index attribute (rather than only in the message) so that callers which decode
+ * a subset of their keys can map it back. Steals the reference to message.
+ */
+static void keyErrorSet(Py_ssize_t index, PyObject * message) {
+    if(message == NULL) {
+        return;
+    }
+
+    PyObject * error = PyObject_CallFunctionObjArgs(PyExc_ValueError, message, NULL);
+    Py_DECREF(message);
+    if(error == NULL) {
+        return;
+    }
+
+    PyObject * indexObj = PyLong_FromSsize_t(index);
+    if(indexObj != NULL && PyObject_SetAttrString(error, "index", indexObj) == 0) {
+        PyErr_SetObject(PyExc_ValueError, error);
+    }
+    Py_XDECREF(indexObj);
+    Py_DECREF(error);
+}
+
+
+/*
+ * Read the coordinates of a SEC1 encoded public key (04 + x + y or 02 / 03 + x), returns the prefix
+ * byte or -1 with a python exception set if the encoding is malformed.
+ */
+static int sec1Parse(PointZZ_p * rop, PyObject * obj, size_t bytelen, Py_ssize_t index) {
+    Py_buffer view;
+    if(PyObject_GetBuffer(obj, &view, PyBUF_SIMPLE) < 0) {
+        return -1;
+    }
+
+    const unsigned char * data = (const unsigned char *)view.buf;
+    size_t len = (size_t)view.len;
+    int prefix = len > 0 ? data[0] : -1;
+
+    if(prefix == 4 && len == 2 * bytelen + 1) {
+        mpz_import(rop->x, bytelen, 1, 1, 1, 0, data + 1);
+        mpz_import(rop->y, bytelen, 1, 1, 1, 0, data + 1 + bytelen);
+    } else if((prefix == 2 || prefix == 3) && len == bytelen + 1) {
+        mpz_import(rop->x, bytelen, 1, 1, 1, 0, data + 1);
+    } else {
+        keyErrorSet(index, PyUnicode_FromFormat(
+            "expected 04 + %zu bytes or 02 / 03 + %zu bytes", 2 * bytelen, bytelen
+        ));
+        prefix = -1;
+    }
+
+    PyBuffer_Release(&view);
+    return prefix;
+}
+
+
+static PyObject * curvemath_decode_public_keys(PyObject *self, PyObject *args) {
+    PyObject * keysObj, * curveObj;
+
+    if (!PyArg_ParseTuple(args, "OO", &keysObj, &curveObj)) {
+        return NULL;
+    }
+
+    PyObject * capsule = curveCapsuleFromPyObject(curveObj);
+    if(capsule == NULL) {
+        return NULL;
+    }
+    CurveZZ_p * curve = (CurveZZ_p *)PyCapsule_GetPointer(capsule, CURVE_CAPSULE_NAME);
+
+    PyObject * keys = PySequence_Fast(keysObj, "keys must be a sequence");
+    if(keys == NULL) {
+        Py_DECREF(capsule);
+        return NULL;
+    }
+
+    // coordinates are field elements, SEC 1 Section 2.3.5 sizes them by p
+    size_t bytelen = (mpz_sizeinbase(curve->p, 2) + 7) / 8;
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(keys), i, invalid = -1;
+    PointZZ_p * points = (PointZZ_p *)malloc((n ? n : 1) * sizeof(PointZZ_p));
+    int * prefixes = (int *)malloc((n ? n : 1) * sizeof(int));
+    int status = 0;
+
+    for(i = 0; i < n; i++) {
+        mpz_inits(points[i].x, points[i].y, NULL);
+    }
+    for(i = 0; i < n && status == 0; i++) {
+        prefixes[i] = sec1Parse(&points[i], PySequence_Fast_GET_ITEM(keys, i), bytelen, i);
+        status = prefixes[i] < 0 ? -1 : 0;
+    }
+
+    if(status == 0) {
+        Py_BEGIN_ALLOW_THREADS
+        for(i = 0; i < n; i++) {
+            int valid = prefixes[i] == 4 ?
+                pointZZ_pIsOnCurve(&points[i], curve) :
+                pointZZ_pDecompress(&points[i], points[i].x, prefixes[i] == 3, curve);
+            if(!valid) {
+                invalid = i;
+                break;
+            }
+        }
+        Py_END_ALLOW_THREADS
+
+        if(invalid >= 0) {
+            keyErrorSet(invalid, PyUnicode_FromString("not a point on the curve"));
+            status = -1;
+        }
+    }
+
+    PyObject * result = status == 0 ? PyList_New(n) : NULL;
+    for(i = 0; result != NULL && i < n; i++) {
+        NativePoint * point = nativePointNew(capsule);
+        if(point == NULL) {
+            Py_CLEAR(result);
+            break;
+        }
+        jacobianZZ_pSetAffine(&point->point, &points[i]);
+        PyList_SET_ITEM(result, i, (PyObject *)point);
+    }
+
+    for(i = 0; i < n; i++) {
+        mpz_clears(points[i].x, points[i].y, NULL);
+    }
+    free(points);
+    free(prefixes);
+    Py_DECREF(keys);
+    Py_DECREF(capsule);
+    return result;
+}
+
+
 static PyMethodDef curvemath__methods__[] = {
+    {"build_curve", curvemath_build_curve, METH_VARARGS, "Build the native representation of a curve."},
     {"mul", curvemath_mul, METH_VARARGS, "Multiply a curve point by an integer scalar."},
+    {"mul_x", curvemath_mul_x, METH_VARARGS, "Compute the x coordinate of a curve point multiplied by an integer scalar."},
+    {"mul_x_many", curvemath_mul_x_many, METH_VARARGS, "Compute the x coordinates of many curve points multiplied by the same integer scalar."},
+    {"mul_base_many", curvemath_mul_base_many, METH_VARARGS, "Multiply the base point of a curve by many integer scalars, optionally adding a point to every product."},
+    {"montgomery_ladder", curvemath_montgomery_ladder, METH_VARARGS, "Compute the u coordinate of a point on a Montgomery curve multiplied by an integer scalar."},
     {"add", curvemath_add, METH_VARARGS, "Add two points on a curve."},
+    {"msm", curvemath_msm, METH_VARARGS, "Compute the sum of several points multiplied by scalars."},
+    {"decompress", curvemath_decompress, METH_VARARGS, "Compute the y coordinate of a point from its x coordinate and y parity."},
+    {"decode_public_keys", curvemath_decode_public_keys, METH_VARARGS, "Decode SEC1 encoded public keys into NativePoints, the ValueError raised for an invalid key has its position as index attribute."},
     {NULL, NULL, 0, NULL}        /* Sentinel */
 };
 
@@ -293,7 +879,29 @@ static struct PyModuleDef moduledef = {
 
 
 PyMODINIT_FUNC PyInit_curvemath(void) {
+    if(PyType_Ready(&NativePointType) < 0 || PyType_Ready(&PointAccumulatorType) < 0) {
+        return NULL;
+    }
+
     PyObject * m = PyModule_Create(&moduledef);
+    if(m == NULL) {
+        return NULL;
+    }
+
+    Py_INCREF(&NativePointType);
+    if(PyModule_AddObject(m, "NativePoint", (PyObject *)&NativePointType) < 0) {
+        Py_DECREF(&NativePointType);
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    Py_INCREF(&PointAccumulatorType);
+    if(PyModule_AddObject(m, "PointAccumulator", (PyObject *)&PointAccumulatorType) < 0) {
+        Py_DECREF(&PointAccumulatorType);
+        Py_DECREF(m);
+        return NULL;
+    }
+
     return m;
 }
 
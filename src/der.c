@@ -0,0 +1,126 @@
+#include "der.h"
+
+
+// the size of the tag and the definite length of a DER element whose content is len bytes long
+size_t derHeaderSize(size_t len) {
+    size_t size = 2;
+
+    if(len >= 0x80) {
+        for(; len; len >>= 8) {
+            size++;
+        }
+    }
+    return size;
+}
+
+
+// write the tag and the (minimally encoded) length of a DER element, returns where its content goes
+unsigned char * derWriteHeader(unsigned char * out, unsigned char tag, size_t len) {
+    size_t size = derHeaderSize(len) - 2, i;
+
+    *out++ = tag;
+    if(size == 0) {
+        *out++ = (unsigned char)len;
+        return out;
+    }
+
+    *out++ = (unsigned char)(0x80 | size);
+    for(i = size; i-- > 0;) {
+        out[i] = (unsigned char)(len & 0xFF);
+        len >>= 8;
+    }
+    return out + size;
+}
+
+
+/*
+ * Read a DER length at *pos (which must be before end), advancing *pos past it. Only the minimal
+ * encoding is accepted: the short form below 0x80, otherwise the long form without leading zero
+ * bytes. Returns NULL on success and an error message otherwise.
+ */
+static const char * derReadLength(const unsigned char ** pos, const unsigned char * end, size_t * len) {
+    unsigned char first = *(*pos)++;
+    size_t count = first & 0x7F, i;
+
+    if(!(first & 0x80)) {
+        *len = first;
+        return NULL;
+    } else if(count == 0 || count > sizeof(size_t)) {
+        return "Unsupported ASN.1 length encoding";
+    } else if((size_t)(end - *pos) < count) {
+        return "ASN.1 length runs past the end of the data";
+    } else if((*pos)[0] == 0) {
+        return "ASN.1 length has a leading zero byte";
+    }
+
+    *len = 0;
+    for(i = 0; i < count; i++) {
+        *len = (*len << 8) | (*pos)[i];
+    }
+    *pos += count;
+
+    if(*len < 0x80) {
+        return "ASN.1 length should use the short form";
+    }
+    return NULL;
+}
+
+
+// read a DER INTEGER holding a positive value in its minimal encoding, as BIP66 requires
+static const char * derReadPositiveInteger(const unsigned char ** pos, const unsigned char * end, const unsigned char ** value, size_t * len) {
+    const char * error;
+
+    if(end - *pos < 2) {
+        return "ASN.1 encoded integer must be at least 3 bytes long";
+    } else if(**pos != DER_INTEGER) {
+        return "Value should be a ASN.1 INTEGER";
+    }
+
+    (*pos)++;
+    if((error = derReadLength(pos, end, len)) != NULL) {
+        return error;
+    } else if(*len == 0) {
+        return "ASN.1 INTEGER is empty";
+    } else if((size_t)(end - *pos) < *len) {
+        return "ASN.1 INTEGER runs past the end of the sequence";
+    }
+
+    *value = *pos;
+    *pos += *len;
+    if((*value)[0] & 0x80) {
+        return "Signature contains a negative value";
+    } else if(*len > 1 && (*value)[0] == 0x00 && !((*value)[1] & 0x80)) {
+        return "Invalid leading 0x00 byte in ASN.1 integer";
+    }
+    return NULL;
+}
+
+
+/*
+ * Parse a DER encoded ECDSA signature, SEQUENCE { INTEGER r, INTEGER s }, with the strictness of
+ * BIP66 (generalized to the long form lengths of large curves): every length is minimally encoded
+ * and matches the data exactly, both integers are positive and minimally encoded, and nothing
+ * follows the sequence. On success r and s point into data (big endian, possibly with a leading
+ * zero byte) and NULL is returned, otherwise an error message.
+ */
+const char * derDecodeSignature(const unsigned char * data, size_t len, const unsigned char ** r, size_t * rlen, const unsigned char ** s, size_t * slen) {
+    const unsigned char * pos = data, * end = data + len;
+    size_t seqlen;
+    const char * error;
+
+    if(len < 2 || *pos++ != DER_SEQUENCE) {
+        return "First byte should be ASN.1 SEQUENCE";
+    } else if((error = derReadLength(&pos, end, &seqlen)) != NULL) {
+        return error;
+    } else if(seqlen != (size_t)(end - pos)) {
+        return "The length of the sequence does not match the data";
+    }
+
+    if((error = derReadPositiveInteger(&pos, end, r, rlen)) != NULL ||
+       (error = derReadPositiveInteger(&pos, end, s, slen)) != NULL) {
+        return error;
+    } else if(pos != end) {
+        return "Unexpected data after the signature's integers";
+    }
+    return NULL;
+}
@@ -0,0 +1,13 @@
+#ifndef DER_H
+#define DER_H
+
+#include <stddef.h>
+
+#define DER_INTEGER 0x02
+#define DER_SEQUENCE 0x30
+
+size_t derHeaderSize(size_t len);
+unsigned char * derWriteHeader(unsigned char * out, unsigned char tag, size_t len);
+const char * derDecodeSignature(const unsigned char * data, size_t len, const unsigned char ** r, size_t * rlen, const unsigned char ** s, size_t * slen);
+
+#endif
@@ -0,0 +1,233 @@
+#include "fixedBase.h"
+#include "jacobianMath.h"
+#include <stdlib.h>
+#include <string.h>
+
+
+/*
+ * Pack n affine points into table as the limbs of x followed by the limbs of y, each zero padded
+ * to limbs (the size of p), the layout read by regularTableSelect. table must be zeroed.
+ */
+void regularTablePack(mp_limb_t * table, const PointZZ_p * points, size_t n, mp_size_t limbs) {
+    size_t i;
+
+    for(i = 0; i < n; i++) {
+        memcpy(&table[2 * i * limbs], mpz_limbs_read(points[i].x), mpz_size(points[i].x) * sizeof(mp_limb_t));
+        memcpy(&table[(2 * i + 1) * limbs], mpz_limbs_read(points[i].y), mpz_size(points[i].y) * sizeof(mp_limb_t));
+    }
+}
+
+
+/*
+ * Build the fixed base table of the curve's base point G if it hasn't been built yet: for every
+ * window j and every i < FIXED_BASE_ENTRIES, entry i of row j is (2i + 1) * 2^(j * FIXED_BASE_WINDOW_BITS) * G
+ * in affine coordinates, all normalized with one inversion. Each entry is stored as the limbs of x
+ * followed by the limbs of y, zero padded to the size of p, so that jacobianZZ_pMulBase can read a
+ * row with mpn_sec_tabselect. The table is built on first use (signing, multiplying the base point
+ * or precomputing nonces) so that curves which are only used for verification don't pay for it. It
+ * isn't synchronized: callers build it while they hold the GIL.
+ */
+void curveZZ_pFixedBasePrecompute(CurveZZ_p * curve) {
+    if(curve->baseTable != NULL || mpz_sgn(curve->q) <= 0) {
+        return;
+    }
+
+    // see jacobianZZ_pMulBase for the number of windows of the recoded scalars
+    size_t windows = mpz_sizeinbase(curve->q, 2) / FIXED_BASE_WINDOW_BITS + 1;
+    size_t tableSize = windows * FIXED_BASE_ENTRIES, i, j;
+    mp_size_t limbs = mpz_size(curve->p);
+    JacobianZZ_p * jacobianTable = (JacobianZZ_p *)calloc(tableSize, sizeof(JacobianZZ_p));
+    PointZZ_p * affine = (PointZZ_p *)malloc(tableSize * sizeof(PointZZ_p));
+    mp_limb_t * table = (mp_limb_t *)calloc(tableSize * 2 * limbs, sizeof(mp_limb_t));
+    JacobianZZ_p base, twice;
+    int d;
+
+    jacobianZZ_pInit(&base);
+    jacobianZZ_pInit(&twice);
+    for(i = 0; i < tableSize; i++) {
+        jacobianZZ_pInit(&jacobianTable[i]);
+        mpz_inits(affine[i].x, affine[i].y, NULL);
+    }
+
+    jacobianZZ_pSetAffine(&base, curve->g);
+    for(j = 0; j < windows; j++) {
+        JacobianZZ_p * multiples = &jacobianTable[j * FIXED_BASE_ENTRIES];
+
+        // multiples[d] = (2d + 1) * base, then base = 2^FIXED_BASE_WINDOW_BITS * base
+        jacobianZZ_pDouble(&twice, &base, curve);
+        jacobianZZ_pSet(&multiples[0], &base);
+        for(d = 1; d < FIXED_BASE_ENTRIES; d++) {
+            jacobianZZ_pAdd(&multiples[d], &multiples[d - 1], &twice, curve);
+        }
+        jacobianZZ_pAdd(&base, &multiples[FIXED_BASE_ENTRIES - 1], &base, curve);
+    }
+    jacobianZZ_pBatchToAffine(affine, jacobianTable, tableSize, curve);
+
+    regularTablePack(table, affine, tableSize, limbs);
+
+    for(i = 0; i < tableSize; i++) {
+        jacobianZZ_pClear(&jacobianTable[i]);
+        mpz_clears(affine[i].x, affine[i].y, NULL);
+    }
+    jacobianZZ_pClear(&base);
+    jacobianZZ_pClear(&twice);
+    free(jacobianTable);
+    free(affine);
+
+    curve->baseTable = table;
+    curve->baseTableWindows = windows;
+}
+
+
+void curveZZ_pFixedBaseClear(CurveZZ_p * curve) {
+    if(curve->baseTable != NULL) {
+        free(curve->baseTable);
+        curve->baseTable = NULL;
+        curve->baseTableWindows = 0;
+    }
+}
+
+
+/*
+ * Recode the odd scalar k, 0 < k < 2^(windows * FIXED_BASE_WINDOW_BITS), into one signed, odd and
+ * thus nonzero digit per window (see Joye and Tunstall, "Exponent Recoding and Regular
+ * Exponentiation Algorithms"): |d_j| = 2 * indices[j] + 1 and d_j < 0 iff negative[j] is 1.
+ *
+ * With k_0 = k and k_{j+1} = 2 * floor(k_j / 2^(w + 1)) + 1 every k_j is odd and
+ * k_j = d_j + 2^w * k_{j+1} with the odd digit d_j = (k_j mod 2^(w + 1)) - 2^w. Unrolled,
+ * k_j = 2 * floor(k / 2^(j * w + 1)) + 1 for j > 0 (and for j = 0 as k is odd), so digit j
+ * only depends on the bits j * w + 1, ..., (j + 1) * w of k. The last window keeps d = k_j,
+ * which is smaller than 2^w by the bound on k.
+ */
+void regularRecode(unsigned char * indices, mp_limb_t * negative, const mpz_t k, size_t windows) {
+    size_t j;
+    int b;
+
+    for(j = 0; j < windows; j++) {
+        mp_limb_t v = 0, neg;
+
+        for(b = FIXED_BASE_WINDOW_BITS; b > 0; b--) {
+            v = (v << 1) | mpz_tstbit(k, j * FIXED_BASE_WINDOW_BITS + b);
+        }
+
+        // d = 2v + 1 - 2^w is negative iff the top bit of v is clear, |d| = 2 * index + 1
+        neg = ((v >> (FIXED_BASE_WINDOW_BITS - 1)) ^ 1) & (j + 1 < windows);
+        indices[j] = (v ^ (neg * (FIXED_BASE_ENTRIES - 1))) & (FIXED_BASE_ENTRIES - 1);
+        negative[j] = neg;
+    }
+}
+
+
+/*
+ * Read entry index of a packed row of FIXED_BASE_ENTRIES points with mpn_sec_tabselect, which
+ * touches every entry, and negate it if negative is 1 with mpn_cnd_swap. entry is scratch space
+ * of 3 * mpz_size(p) limbs.
+ */
+static void regularTableSelect(PointZZ_p * rop, mp_limb_t * entry, const mp_limb_t * row,
+                               mp_limb_t index, mp_limb_t negative, const CurveZZ_p * curve) {
+    mp_size_t limbs = mpz_size(curve->p);
+    mp_limb_t * negY = entry + 2 * limbs;
+
+    mpn_sec_tabselect(entry, row, 2 * limbs, FIXED_BASE_ENTRIES, index);
+    mpn_sub_n(negY, mpz_limbs_read(curve->p), entry + limbs, limbs);
+    mpn_cnd_swap(negative, entry + limbs, negY, limbs);
+
+    memcpy(mpz_limbs_write(rop->x, limbs), entry, limbs * sizeof(mp_limb_t));
+    mpz_limbs_finish(rop->x, limbs);
+    memcpy(mpz_limbs_write(rop->y, limbs), entry + limbs, limbs * sizeof(mp_limb_t));
+    mpz_limbs_finish(rop->y, limbs);
+}
+
+
+/*
+ * Compute scalar * G with the fixed base table. As the scalar is usually secret (a nonce or a
+ * private key) it is first made odd by adding q if it is even, then recoded with regularRecode.
+ * Every window then costs exactly one mixed addition of a table entry read with
+ * regularTableSelect, and no doublings. Negative scalars, scalars not smaller than the order and
+ * curves without a table fall back to jacobianZZ_pMulSecret.
+ */
+void jacobianZZ_pMulBase(JacobianZZ_p * rop, const mpz_t scalar, const CurveZZ_p * curve) {
+    if(curve->baseTable == NULL || mpz_sgn(scalar) < 0 || mpz_cmp(scalar, curve->q) >= 0) {
+        jacobianZZ_pSetAffine(rop, curve->g);
+        jacobianZZ_pMulSecret(rop, rop, scalar, curve);
+        return;
+    }
+
+    size_t windows = curve->baseTableWindows, j;
+    mp_size_t limbs = mpz_size(curve->p);
+    mp_limb_t * entry = (mp_limb_t *)malloc((3 * limbs + windows) * sizeof(mp_limb_t));
+    mp_limb_t * negative = entry + 3 * limbs;
+    unsigned char * indices = (unsigned char *)malloc(windows);
+    PointZZ_p selected;
+    mpz_t k;
+
+    mpz_inits(k, selected.x, selected.y, NULL);
+
+    // k = scalar or scalar + q, whichever is odd (q is an odd prime), so 0 < k < 2q and the
+    // bits(q) / w + 1 windows of the table are enough
+    mpz_set(k, scalar);
+    mpz_addmul_ui(k, curve->q, 1 - mpz_tstbit(scalar, 0));
+    regularRecode(indices, negative, k, windows);
+
+    for(j = 0; j < windows; j++) {
+        regularTableSelect(&selected, entry, &curve->baseTable[j * FIXED_BASE_ENTRIES * 2 * limbs],
+                           indices[j], negative[j], curve);
+        if(j == 0) {
+            jacobianZZ_pSetAffine(rop, &selected);
+        } else {
+            jacobianZZ_pAddAffine(rop, rop, &selected, curve);
+        }
+    }
+
+    mpz_clears(k, selected.x, selected.y, NULL);
+    free(entry);
+    free(indices);
+}
+
+
+/*
+ * Set multiples[i] = (2i + 1) * point for i < FIXED_BASE_ENTRIES, the table read by
+ * jacobianZZ_pMulRegular once normalized and packed with regularTablePack.
+ */
+void jacobianZZ_pOddMultiples(JacobianZZ_p * multiples, const PointZZ_p * point, const CurveZZ_p * curve) {
+    JacobianZZ_p twice;
+    int d;
+
+    jacobianZZ_pInit(&twice);
+    jacobianZZ_pSetAffine(&multiples[0], point);
+    jacobianZZ_pDouble(&twice, &multiples[0], curve);
+    for(d = 1; d < FIXED_BASE_ENTRIES; d++) {
+        jacobianZZ_pAdd(&multiples[d], &multiples[d - 1], &twice, curve);
+    }
+    jacobianZZ_pClear(&twice);
+}
+
+
+/*
+ * Compute k * P from the packed table of the odd multiples of P and the digits of k given by
+ * regularRecode: Horner's rule from the top digit, so every window costs FIXED_BASE_WINDOW_BITS
+ * doublings and one mixed addition of an entry read with regularTableSelect, whatever the digits.
+ */
+void jacobianZZ_pMulRegular(JacobianZZ_p * rop, const mp_limb_t * table, const unsigned char * indices,
+                            const mp_limb_t * negative, size_t windows, const CurveZZ_p * curve) {
+    mp_size_t limbs = mpz_size(curve->p);
+    mp_limb_t * entry = (mp_limb_t *)malloc(3 * limbs * sizeof(mp_limb_t));
+    PointZZ_p selected;
+    size_t j;
+    int b;
+
+    mpz_inits(selected.x, selected.y, NULL);
+
+    regularTableSelect(&selected, entry, table, indices[windows - 1], negative[windows - 1], curve);
+    jacobianZZ_pSetAffine(rop, &selected);
+    for(j = windows - 1; j-- > 0;) {
+        for(b = 0; b < FIXED_BASE_WINDOW_BITS; b++) {
+            jacobianZZ_pDouble(rop, rop, curve);
+        }
+        regularTableSelect(&selected, entry, table, indices[j], negative[j], curve);
+        jacobianZZ_pAddAffine(rop, rop, &selected, curve);
+    }
+
+    mpz_clears(selected.x, selected.y, NULL);
+    free(entry);
+}
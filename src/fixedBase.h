@@ -0,0 +1,24 @@
+#ifndef FIXEDBASE_H
+#define FIXEDBASE_H
+
+#include <gmp.h>
+#include "curve.h"
+#include "point.h"
+
+// width (in bits) of the windows of the fixed base table
+#define FIXED_BASE_WINDOW_BITS 4
+#define FIXED_BASE_WINDOW_SIZE (1 << FIXED_BASE_WINDOW_BITS)
+// the tables store the odd multiples 1, 3, ..., 2^FIXED_BASE_WINDOW_BITS - 1 of every window's base
+#define FIXED_BASE_ENTRIES (FIXED_BASE_WINDOW_SIZE / 2)
+
+void curveZZ_pFixedBasePrecompute(CurveZZ_p * curve);
+void curveZZ_pFixedBaseClear(CurveZZ_p * curve);
+void jacobianZZ_pMulBase(JacobianZZ_p * rop, const mpz_t scalar, const CurveZZ_p * curve);
+
+void regularRecode(unsigned char * indices, mp_limb_t * negative, const mpz_t k, size_t windows);
+void regularTablePack(mp_limb_t * table, const PointZZ_p * points, size_t n, mp_size_t limbs);
+void jacobianZZ_pOddMultiples(JacobianZZ_p * multiples, const PointZZ_p * point, const CurveZZ_p * curve);
+void jacobianZZ_pMulRegular(JacobianZZ_p * rop, const mp_limb_t * table, const unsigned char * indices,
+                            const mp_limb_t * negative, size_t windows, const CurveZZ_p * curve);
+
+#endif
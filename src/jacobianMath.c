@@ -0,0 +1,602 @@
+#include "jacobianMath.h"
+#include <stdlib.h>
+
+// width (in bits) of the windows used when multiplying a point by a scalar
+#define WINDOW_BITS 4
+#define WINDOW_SIZE (1 << WINDOW_BITS)
+
+
+int jacobianZZ_pIsIdentityElement(const JacobianZZ_p * op) {
+    return mpz_sgn(op->z) == 0;
+}
+
+
+void jacobianZZ_pSetToIdentityElement(JacobianZZ_p * op) {
+    mpz_set_ui(op->x, 1);
+    mpz_set_ui(op->y, 1);
+    mpz_set_ui(op->z, 0);
+}
+
+
+void jacobianZZ_pSet(JacobianZZ_p * rop, const JacobianZZ_p * op) {
+    mpz_set(rop->x, op->x);
+    mpz_set(rop->y, op->y);
+    mpz_set(rop->z, op->z);
+}
+
+
+void jacobianZZ_pSetAffine(JacobianZZ_p * rop, const PointZZ_p * op) {
+    // (0, 0) represents the identity element in affine coordinates
+    if(mpz_sgn(op->x) == 0 && mpz_sgn(op->y) == 0) {
+        return jacobianZZ_pSetToIdentityElement(rop);
+    }
+
+    mpz_set(rop->x, op->x);
+    mpz_set(rop->y, op->y);
+    mpz_set_ui(rop->z, 1);
+}
+
+
+void jacobianZZ_pToAffine(PointZZ_p * rop, const JacobianZZ_p * op, const CurveZZ_p * curve) {
+    if(jacobianZZ_pIsIdentityElement(op)) {
+        mpz_set_ui(rop->x, 0);
+        mpz_set_ui(rop->y, 0);
+        return;
+    }
+
+    if(mpz_cmp_ui(op->z, 1) == 0) {
+        mpz_set(rop->x, op->x);
+        mpz_set(rop->y, op->y);
+        return;
+    }
+
+    mpz_t zinv, zinv2;
+    mpz_inits(zinv, zinv2, NULL);
+
+    mpz_invert(zinv, op->z, curve->p);
+    mpz_mul(zinv2, zinv, zinv);
+    mpz_mod(zinv2, zinv2, curve->p);
+
+    mpz_mul(rop->x, op->x, zinv2);
+    mpz_mod(rop->x, rop->x, curve->p);
+
+    mpz_mul(zinv2, zinv2, zinv);
+    mpz_mul(rop->y, op->y, zinv2);
+    mpz_mod(rop->y, rop->y, curve->p);
+
+    mpz_clears(zinv, zinv2, NULL);
+}
+
+
+/*
+ * Compute only the affine x coordinate of op (x / z^2), for callers that don't need y (e.g. ECDH).
+ * Returns 0 if op is the identity element (rop is left unchanged), 1 otherwise.
+ */
+int jacobianZZ_pToAffineX(mpz_t rop, const JacobianZZ_p * op, const CurveZZ_p * curve) {
+    if(jacobianZZ_pIsIdentityElement(op)) {
+        return 0;
+    }
+
+    mpz_t zinv;
+    mpz_init(zinv);
+
+    mpz_invert(zinv, op->z, curve->p);
+    mpz_mul(zinv, zinv, zinv);
+    mpz_mod(zinv, zinv, curve->p);
+    mpz_mul(rop, op->x, zinv);
+    mpz_mod(rop, rop, curve->p);
+
+    mpz_clear(zinv);
+    return 1;
+}
+
+
+void jacobianZZ_pNormalize(JacobianZZ_p * op, const CurveZZ_p * curve) {
+    if(jacobianZZ_pIsIdentityElement(op) || mpz_cmp_ui(op->z, 1) == 0) {
+        return;
+    }
+
+    PointZZ_p affine;
+    mpz_inits(affine.x, affine.y, NULL);
+    jacobianZZ_pToAffine(&affine, op, curve);
+    mpz_swap(op->x, affine.x);
+    mpz_swap(op->y, affine.y);
+    mpz_set_ui(op->z, 1);
+    mpz_clears(affine.x, affine.y, NULL);
+}
+
+
+/*
+ * Convert n points to affine coordinates with a single modular inversion (Montgomery's trick).
+ * Identity elements are skipped and returned as (0, 0).
+ */
+void jacobianZZ_pBatchToAffine(PointZZ_p * rops, const JacobianZZ_p * ops, size_t n, const CurveZZ_p * curve) {
+    if(n == 0) {
+        return;
+    }
+
+    // prefix[i] is the product of the z coordinates of the non identity points in ops[0..i]
+    mpz_t * prefix = (mpz_t *)malloc(n * sizeof(mpz_t));
+    mpz_t inv, zinv, zinv2;
+    mpz_inits(inv, zinv, zinv2, NULL);
+    mpz_set_ui(inv, 1);
+
+    size_t i;
+    for(i = 0; i < n; i++) {
+        mpz_init(prefix[i]);
+        if(!jacobianZZ_pIsIdentityElement(&ops[i])) {
+            mpz_mul(inv, inv, ops[i].z);
+            mpz_mod(inv, inv, curve->p);
+        }
+        mpz_set(prefix[i], inv);
+    }
+
+    mpz_invert(inv, inv, curve->p);
+
+    for(i = n; i-- > 0;) {
+        if(jacobianZZ_pIsIdentityElement(&ops[i])) {
+            mpz_set_ui(rops[i].x, 0);
+            mpz_set_ui(rops[i].y, 0);
+            continue;
+        }
+
+        // inv is the inverse of prefix[i], strip the other z coordinates from it
+        if(i > 0) {
+            mpz_mul(zinv, inv, prefix[i - 1]);
+            mpz_mod(zinv, zinv, curve->p);
+        } else {
+            mpz_set(zinv, inv);
+        }
+        mpz_mul(inv, inv, ops[i].z);
+        mpz_mod(inv, inv, curve->p);
+
+        mpz_mul(zinv2, zinv, zinv);
+        mpz_mod(zinv2, zinv2, curve->p);
+        mpz_mul(rops[i].x, ops[i].x, zinv2);
+        mpz_mod(rops[i].x, rops[i].x, curve->p);
+        mpz_mul(zinv2, zinv2, zinv);
+        mpz_mul(rops[i].y, ops[i].y, zinv2);
+        mpz_mod(rops[i].y, rops[i].y, curve->p);
+    }
+
+    for(i = 0; i < n; i++) {
+        mpz_clear(prefix[i]);
+    }
+    free(prefix);
+    mpz_clears(inv, zinv, zinv2, NULL);
+}
+
+
+int jacobianZZ_pEqual(const JacobianZZ_p * op1, const JacobianZZ_p * op2, const CurveZZ_p * curve) {
+    int id1 = jacobianZZ_pIsIdentityElement(op1), id2 = jacobianZZ_pIsIdentityElement(op2);
+    if(id1 || id2) {
+        return id1 && id2;
+    }
+
+    // compare x1 * z2^2 with x2 * z1^2 and y1 * z2^3 with y2 * z1^3
+    mpz_t z1z1, z2z2, lhs, rhs;
+    mpz_inits(z1z1, z2z2, lhs, rhs, NULL);
+    mpz_mul(z1z1, op1->z, op1->z);
+    mpz_mul(z2z2, op2->z, op2->z);
+
+    mpz_mul(lhs, op1->x, z2z2);
+    mpz_mod(lhs, lhs, curve->p);
+    mpz_mul(rhs, op2->x, z1z1);
+    mpz_mod(rhs, rhs, curve->p);
+    int equal = mpz_cmp(lhs, rhs) == 0;
+
+    if(equal) {
+        mpz_mul(z2z2, z2z2, op2->z);
+        mpz_mul(lhs, op1->y, z2z2);
+        mpz_mod(lhs, lhs, curve->p);
+        mpz_mul(z1z1, z1z1, op1->z);
+        mpz_mul(rhs, op2->y, z1z1);
+        mpz_mod(rhs, rhs, curve->p);
+        equal = mpz_cmp(lhs, rhs) == 0;
+    }
+
+    mpz_clears(z1z1, z2z2, lhs, rhs, NULL);
+    return equal;
+}
+
+
+void jacobianZZ_pNeg(JacobianZZ_p * rop, const JacobianZZ_p * op, const CurveZZ_p * curve) {
+    mpz_set(rop->x, op->x);
+    mpz_neg(rop->y, op->y);
+    mpz_mod(rop->y, rop->y, curve->p);
+    mpz_set(rop->z, op->z);
+}
+
+
+void jacobianZZ_pDouble(JacobianZZ_p * rop, const JacobianZZ_p * op, const CurveZZ_p * curve) {
+    // handle the identity element and 2P = identity case
+    if(jacobianZZ_pIsIdentityElement(op) || mpz_sgn(op->y) == 0) {
+        return jacobianZZ_pSetToIdentityElement(rop);
+    }
+
+    mpz_t yy, s, m, t;
+    mpz_inits(yy, s, m, t, NULL);
+
+    // s = 4 * x * y^2
+    mpz_mul(yy, op->y, op->y);
+    mpz_mod(yy, yy, curve->p);
+    mpz_mul(s, op->x, yy);
+    mpz_mul_2exp(s, s, 2);
+    mpz_mod(s, s, curve->p);
+
+    // m = 3 * x^2 + a * z^4
+    mpz_mul(m, op->x, op->x);
+    mpz_mul_ui(m, m, 3);
+    if(mpz_sgn(curve->a) != 0) {
+        mpz_mul(t, op->z, op->z);
+        mpz_mod(t, t, curve->p);
+        mpz_mul(t, t, t);
+        mpz_mod(t, t, curve->p);
+        mpz_addmul(m, t, curve->a);
+    }
+    mpz_mod(m, m, curve->p);
+
+    // z' = 2 * y * z, the last use of op so rop may alias it
+    mpz_mul(rop->z, op->y, op->z);
+    mpz_mul_2exp(rop->z, rop->z, 1);
+    mpz_mod(rop->z, rop->z, curve->p);
+
+    // x' = m^2 - 2 * s
+    mpz_mul(t, m, m);
+    mpz_submul_ui(t, s, 2);
+    mpz_mod(t, t, curve->p);
+
+    // y' = m * (s - x') - 8 * y^4
+    mpz_sub(s, s, t);
+    mpz_mul(s, s, m);
+    mpz_mul(yy, yy, yy);
+    mpz_submul_ui(s, yy, 8);
+    mpz_mod(s, s, curve->p);
+
+    mpz_swap(rop->x, t);
+    mpz_swap(rop->y, s);
+    mpz_clears(yy, s, m, t, NULL);
+}
+
+
+void jacobianZZ_pAdd(JacobianZZ_p * rop, const JacobianZZ_p * op1, const JacobianZZ_p * op2, const CurveZZ_p * curve) {
+    // handle identity element cases
+    if(jacobianZZ_pIsIdentityElement(op1)) {
+        return jacobianZZ_pSet(rop, op2);
+    } else if(jacobianZZ_pIsIdentityElement(op2)) {
+        return jacobianZZ_pSet(rop, op1);
+    }
+
+    mpz_t z1z1, z2z2, u1, u2, s1, s2, h, r;
+    mpz_inits(z1z1, z2z2, u1, u2, s1, s2, h, r, NULL);
+
+    mpz_mul(z1z1, op1->z, op1->z);
+    mpz_mod(z1z1, z1z1, curve->p);
+    mpz_mul(z2z2, op2->z, op2->z);
+    mpz_mod(z2z2, z2z2, curve->p);
+
+    // u1 = x1 * z2^2, u2 = x2 * z1^2, s1 = y1 * z2^3, s2 = y2 * z1^3
+    mpz_mul(u1, op1->x, z2z2);
+    mpz_mod(u1, u1, curve->p);
+    mpz_mul(u2, op2->x, z1z1);
+    mpz_mod(u2, u2, curve->p);
+    mpz_mul(s1, op1->y, op2->z);
+    mpz_mul(s1, s1, z2z2);
+    mpz_mod(s1, s1, curve->p);
+    mpz_mul(s2, op2->y, op1->z);
+    mpz_mul(s2, s2, z1z1);
+    mpz_mod(s2, s2, curve->p);
+
+    mpz_sub(h, u2, u1);
+    mpz_mod(h, h, curve->p);
+    mpz_sub(r, s2, s1);
+    mpz_mod(r, r, curve->p);
+
+    // equal x coordinates, the points are either equal or each other's negation
+    if(mpz_sgn(h) == 0) {
+        if(mpz_sgn(r) == 0) {
+            jacobianZZ_pDouble(rop, op1, curve);
+        } else {
+            jacobianZZ_pSetToIdentityElement(rop);
+        }
+        mpz_clears(z1z1, z2z2, u1, u2, s1, s2, h, r, NULL);
+        return;
+    }
+
+    // z' = z1 * z2 * h
+    mpz_mul(z1z1, op1->z, op2->z);
+    mpz_mul(z1z1, z1z1, h);
+    mpz_mod(z1z1, z1z1, curve->p);
+
+    // hh = h^2, hhh = h^3, v = u1 * h^2
+    mpz_mul(z2z2, h, h);
+    mpz_mod(z2z2, z2z2, curve->p);
+    mpz_mul(h, h, z2z2);
+    mpz_mod(h, h, curve->p);
+    mpz_mul(u2, u1, z2z2);
+    mpz_mod(u2, u2, curve->p);
+
+    // x' = r^2 - h^3 - 2 * v
+    mpz_mul(u1, r, r);
+    mpz_sub(u1, u1, h);
+    mpz_submul_ui(u1, u2, 2);
+    mpz_mod(u1, u1, curve->p);
+
+    // y' = r * (v - x') - s1 * h^3
+    mpz_sub(u2, u2, u1);
+    mpz_mul(u2, u2, r);
+    mpz_mul(s1, s1, h);
+    mpz_sub(u2, u2, s1);
+    mpz_mod(u2, u2, curve->p);
+
+    mpz_swap(rop->x, u1);
+    mpz_swap(rop->y, u2);
+    mpz_swap(rop->z, z1z1);
+    mpz_clears(z1z1, z2z2, u1, u2, s1, s2, h, r, NULL);
+}
+
+
+void jacobianZZ_pAddAffine(JacobianZZ_p * rop, const JacobianZZ_p * op1, const PointZZ_p * op2, const CurveZZ_p * curve) {
+    // handle identity element cases, (0, 0) is the affine identity
+    if(mpz_sgn(op2->x) == 0 && mpz_sgn(op2->y) == 0) {
+        return jacobianZZ_pSet(rop, op1);
+    } else if(jacobianZZ_pIsIdentityElement(op1)) {
+        return jacobianZZ_pSetAffine(rop, op2);
+    }
+
+    mpz_t z1z1, u2, s2, h, r;
+    mpz_inits(z1z1, u2, s2, h, r, NULL);
+
+    // u2 = x2 * z1^2, s2 = y2 * z1^3 (u1 = x1 and s1 = y1 as z2 = 1)
+    mpz_mul(z1z1, op1->z, op1->z);
+    mpz_mod(z1z1, z1z1, curve->p);
+    mpz_mul(u2, op2->x, z1z1);
+    mpz_mod(u2, u2, curve->p);
+    mpz_mul(s2, op2->y, op1->z);
+    mpz_mul(s2, s2, z1z1);
+    mpz_mod(s2, s2, curve->p);
+
+    mpz_sub(h, u2, op1->x);
+    mpz_mod(h, h, curve->p);
+    mpz_sub(r, s2, op1->y);
+    mpz_mod(r, r, curve->p);
+
+    // equal x coordinates, the points are either equal or each other's negation
+    if(mpz_sgn(h) == 0) {
+        if(mpz_sgn(r) == 0) {
+            jacobianZZ_pDouble(rop, op1, curve);
+        } else {
+            jacobianZZ_pSetToIdentityElement(rop);
+        }
+        mpz_clears(z1z1, u2, s2, h, r, NULL);
+        return;
+    }
+
+    // z' = z1 * h
+    mpz_mul(z1z1, op1->z, h);
+    mpz_mod(z1z1, z1z1, curve->p);
+
+    // hh = h^2 (in s2), hhh = h^3 (in h), v = x1 * h^2 (in u2)
+    mpz_mul(s2, h, h);
+    mpz_mod(s2, s2, curve->p);
+    mpz_mul(h, h, s2);
+    mpz_mod(h, h, curve->p);
+    mpz_mul(u2, op1->x, s2);
+    mpz_mod(u2, u2, curve->p);
+
+    // x' = r^2 - h^3 - 2 * v
+    mpz_mul(s2, r, r);
+    mpz_sub(s2, s2, h);
+    mpz_submul_ui(s2, u2, 2);
+    mpz_mod(s2, s2, curve->p);
+
+    // y' = r * (v - x') - y1 * h^3
+    mpz_sub(u2, u2, s2);
+    mpz_mul(u2, u2, r);
+    mpz_mul(h, h, op1->y);
+    mpz_sub(u2, u2, h);
+    mpz_mod(u2, u2, curve->p);
+
+    mpz_swap(rop->x, s2);
+    mpz_swap(rop->y, u2);
+    mpz_swap(rop->z, z1z1);
+    mpz_clears(z1z1, u2, s2, h, r, NULL);
+}
+
+
+/*
+ * Fixed window scalar multiplication. The multiples 1P .. 15P are normalized with one inversion so
+ * that the main loop only needs doublings and mixed additions. Negative scalars multiply -P. The
+ * running time and memory accesses depend on the scalar, so it must only be used for public
+ * scalars (verification, recovery, multi-scalar multiplication), see jacobianZZ_pMulSecret.
+ */
+void jacobianZZ_pMul(JacobianZZ_p * rop, const JacobianZZ_p * point, const mpz_t scalar, const CurveZZ_p * curve) {
+    if(mpz_sgn(scalar) == 0 || jacobianZZ_pIsIdentityElement(point)) {
+        return jacobianZZ_pSetToIdentityElement(rop);
+    }
+
+    JacobianZZ_p table[WINDOW_SIZE], acc;
+    PointZZ_p affine[WINDOW_SIZE];
+    mpz_t k;
+    int i, j;
+
+    mpz_init(k);
+    mpz_abs(k, scalar);
+
+    for(i = 0; i < WINDOW_SIZE; i++) {
+        jacobianZZ_pInit(&table[i]);
+        mpz_inits(affine[i].x, affine[i].y, NULL);
+    }
+    jacobianZZ_pInit(&acc);
+
+    if(mpz_sgn(scalar) < 0) {
+        jacobianZZ_pNeg(&table[1], point, curve);
+    } else {
+        jacobianZZ_pSet(&table[1], point);
+    }
+    jacobianZZ_pDouble(&table[2], &table[1], curve);
+    for(i = 3; i < WINDOW_SIZE; i++) {
+        jacobianZZ_pAdd(&table[i], &table[i - 1], &table[1], curve);
+    }
+    jacobianZZ_pBatchToAffine(&affine[1], &table[1], WINDOW_SIZE - 1, curve);
+
+    jacobianZZ_pSetToIdentityElement(&acc);
+    int windows = (mpz_sizeinbase(k, 2) + WINDOW_BITS - 1) / WINDOW_BITS;
+
+    for(i = windows - 1; i >= 0; i--) {
+        int digit = 0;
+
+        for(j = WINDOW_BITS - 1; j >= 0; j--) {
+            jacobianZZ_pDouble(&acc, &acc, curve);
+            digit = (digit << 1) | mpz_tstbit(k, i * WINDOW_BITS + j);
+        }
+
+        if(digit) {
+            jacobianZZ_pAddAffine(&acc, &acc, &affine[digit], curve);
+        }
+    }
+
+    jacobianZZ_pSet(rop, &acc);
+
+    for(i = 0; i < WINDOW_SIZE; i++) {
+        jacobianZZ_pClear(&table[i]);
+        mpz_clears(affine[i].x, affine[i].y, NULL);
+    }
+    jacobianZZ_pClear(&acc);
+    mpz_clear(k);
+}
+
+
+/*
+ * Swap a and b if cnd is 1 and leave them if it is 0, without branching on cnd or accessing memory
+ * that depends on it. Both values must be non-negative and fit in n limbs.
+ */
+void mpz_cnd_swap(mpz_t a, mpz_t b, mp_limb_t cnd, mp_size_t n) {
+    mp_size_t aSize = mpz_size(a), bSize = mpz_size(b), i;
+    mp_limb_t * ap = mpz_limbs_modify(a, n);
+    mp_limb_t * bp = mpz_limbs_modify(b, n);
+
+    // the limbs above the size of a value are undefined
+    for(i = aSize; i < n; i++) {
+        ap[i] = 0;
+    }
+    for(i = bSize; i < n; i++) {
+        bp[i] = 0;
+    }
+
+    mpn_cnd_swap(cnd, ap, bp, n);
+    mpz_limbs_finish(a, n);
+    mpz_limbs_finish(b, n);
+}
+
+
+static void jacobianZZ_pCndSwap(JacobianZZ_p * op1, JacobianZZ_p * op2, mp_limb_t cnd, mp_size_t n) {
+    mpz_cnd_swap(op1->x, op2->x, cnd, n);
+    mpz_cnd_swap(op1->y, op2->y, cnd, n);
+    mpz_cnd_swap(op1->z, op2->z, cnd, n);
+}
+
+
+/*
+ * Montgomery ladder for secret scalars (private keys, nonces, ECDH). Every bit costs one addition
+ * and one doubling, for as many bits as the curve order has, and the two running points are swapped
+ * with a constant time conditional swap instead of branching on the bits. The leading zero bits of a
+ * scalar are only visible as additions of the identity element (ecdsa.sign pads nonces to a fixed
+ * bit length). Negative scalars multiply -P.
+ */
+void jacobianZZ_pMulSecret(JacobianZZ_p * rop, const JacobianZZ_p * point, const mpz_t scalar, const CurveZZ_p * curve) {
+    JacobianZZ_p R0, R1;
+    mpz_t k;
+    mp_size_t limbs = mpz_size(curve->p);
+    size_t bits = mpz_sizeinbase(curve->q, 2), i;
+    mp_limb_t swap = 0;
+
+    mpz_init(k);
+    mpz_abs(k, scalar);
+    if(mpz_sizeinbase(k, 2) > bits) {
+        bits = mpz_sizeinbase(k, 2);
+    }
+
+    jacobianZZ_pInit(&R0);
+    jacobianZZ_pInit(&R1);
+    jacobianZZ_pSetToIdentityElement(&R0);
+    if(mpz_sgn(scalar) < 0) {
+        jacobianZZ_pNeg(&R1, point, curve);
+    } else {
+        jacobianZZ_pSet(&R1, point);
+    }
+
+    // the coordinates are reduced so that they fit in the limbs swapped by jacobianZZ_pCndSwap
+    mpz_mod(R1.x, R1.x, curve->p);
+    mpz_mod(R1.y, R1.y, curve->p);
+    mpz_mod(R1.z, R1.z, curve->p);
+
+    // R1 - R0 = P throughout, R0 = (the bits of k read so far) * P
+    for(i = bits; i-- > 0;) {
+        mp_limb_t bit = mpz_tstbit(k, i);
+
+        jacobianZZ_pCndSwap(&R0, &R1, swap ^ bit, limbs);
+        swap = bit;
+
+        jacobianZZ_pAdd(&R1, &R0, &R1, curve);
+        jacobianZZ_pDouble(&R0, &R0, curve);
+    }
+    jacobianZZ_pCndSwap(&R0, &R1, swap, limbs);
+
+    jacobianZZ_pSet(rop, &R0);
+
+    jacobianZZ_pClear(&R0);
+    jacobianZZ_pClear(&R1);
+    mpz_clear(k);
+}
+
+
+/*
+ * Invert n values modulo a prime with a single modular inversion (Montgomery's trick). Values that
+ * are 0 are skipped and their inverse is set to 0. rops and ops may be the same array.
+ */
+void mpz_batch_invert(mpz_t * rops, mpz_t * ops, size_t n, const mpz_t modulus) {
+    if(n == 0) {
+        return;
+    }
+
+    mpz_t * prefix = (mpz_t *)malloc(n * sizeof(mpz_t));
+    mpz_t inv, tmp;
+    mpz_inits(inv, tmp, NULL);
+    mpz_set_ui(inv, 1);
+
+    size_t i;
+    for(i = 0; i < n; i++) {
+        mpz_init(prefix[i]);
+        if(mpz_sgn(ops[i]) != 0) {
+            mpz_mul(inv, inv, ops[i]);
+            mpz_mod(inv, inv, modulus);
+        }
+        mpz_set(prefix[i], inv);
+    }
+
+    mpz_invert(inv, inv, modulus);
+
+    for(i = n; i-- > 0;) {
+        if(mpz_sgn(ops[i]) == 0) {
+            mpz_set_ui(rops[i], 0);
+            continue;
+        }
+
+        if(i > 0) {
+            mpz_mul(tmp, inv, prefix[i - 1]);
+            mpz_mod(tmp, tmp, modulus);
+        } else {
+            mpz_set(tmp, inv);
+        }
+        mpz_mul(inv, inv, ops[i]);
+        mpz_mod(inv, inv, modulus);
+        mpz_set(rops[i], tmp);
+    }
+
+    for(i = 0; i < n; i++) {
+        mpz_clear(prefix[i]);
+    }
+    free(prefix);
+    mpz_clears(inv, tmp, NULL);
+}
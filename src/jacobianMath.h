@@ -0,0 +1,29 @@
+#ifndef JACOBIANMATH_H
+#define JACOBIANMATH_H
+
+#include <stddef.h>
+
+#include <gmp.h>
+#include "curve.h"
+#include "point.h"
+
+int jacobianZZ_pIsIdentityElement(const JacobianZZ_p * op);
+void jacobianZZ_pSetToIdentityElement(JacobianZZ_p * op);
+void jacobianZZ_pSet(JacobianZZ_p * rop, const JacobianZZ_p * op);
+void jacobianZZ_pSetAffine(JacobianZZ_p * rop, const PointZZ_p * op);
+void jacobianZZ_pToAffine(PointZZ_p * rop, const JacobianZZ_p * op, const CurveZZ_p * curve);
+int jacobianZZ_pToAffineX(mpz_t rop, const JacobianZZ_p * op, const CurveZZ_p * curve);
+void jacobianZZ_pNormalize(JacobianZZ_p * op, const CurveZZ_p * curve);
+void jacobianZZ_pBatchToAffine(PointZZ_p * rops, const JacobianZZ_p * ops, size_t n, const CurveZZ_p * curve);
+int jacobianZZ_pEqual(const JacobianZZ_p * op1, const JacobianZZ_p * op2, const CurveZZ_p * curve);
+void jacobianZZ_pNeg(JacobianZZ_p * rop, const JacobianZZ_p * op, const CurveZZ_p * curve);
+void jacobianZZ_pDouble(JacobianZZ_p * rop, const JacobianZZ_p * op, const CurveZZ_p * curve);
+void jacobianZZ_pAdd(JacobianZZ_p * rop, const JacobianZZ_p * op1, const JacobianZZ_p * op2, const CurveZZ_p * curve);
+void jacobianZZ_pAddAffine(JacobianZZ_p * rop, const JacobianZZ_p * op1, const PointZZ_p * op2, const CurveZZ_p * curve);
+void jacobianZZ_pMul(JacobianZZ_p * rop, const JacobianZZ_p * point, const mpz_t scalar, const CurveZZ_p * curve);
+void jacobianZZ_pMulSecret(JacobianZZ_p * rop, const JacobianZZ_p * point, const mpz_t scalar, const CurveZZ_p * curve);
+
+void mpz_batch_invert(mpz_t * rops, mpz_t * ops, size_t n, const mpz_t modulus);
+void mpz_cnd_swap(mpz_t a, mpz_t b, mp_limb_t cnd, mp_size_t n);
+
+#endif
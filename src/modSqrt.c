@@ -0,0 +1,226 @@
+#include "modSqrt.h"
+#include <stdlib.h>
+
+
+/*
+ * Precompute the constants used to take square roots modulo the curve's prime:
+ *   p = 3 mod 4: sqrtExp = (p + 1) / 4
+ *   p = 5 mod 8: sqrtExp = (p - 5) / 8 (Atkin's algorithm)
+ *   otherwise:   p - 1 = q * 2^s with q odd, sqrtExp = q, sqrtTwoAdicity = s and
+ *                sqrtPowers[i] = z^(q * 2^i) for a quadratic non-residue z (Tonelli-Shanks)
+ * Nothing is computed for moduli that are not odd primes (e.g. placeholder curves in tests).
+ */
+void curveZZ_pSqrtPrecompute(CurveZZ_p * curve) {
+    const mpz_srcptr p = curve->p;
+
+    if(mpz_cmp_ui(p, 3) < 0 || mpz_even_p(p)) {
+        return;
+    } else if(mpz_tstbit(p, 1)) {
+        mpz_add_ui(curve->sqrtExp, p, 1);
+        mpz_fdiv_q_2exp(curve->sqrtExp, curve->sqrtExp, 2);
+    } else if(mpz_tstbit(p, 2)) {
+        mpz_sub_ui(curve->sqrtExp, p, 5);
+        mpz_fdiv_q_2exp(curve->sqrtExp, curve->sqrtExp, 3);
+    } else {
+        unsigned long s, i;
+        mpz_t z;
+        mpz_init_set_ui(z, 2);
+
+        mpz_sub_ui(curve->sqrtExp, p, 1);
+        s = mpz_scan1(curve->sqrtExp, 0);
+        mpz_fdiv_q_2exp(curve->sqrtExp, curve->sqrtExp, s);
+
+        while(mpz_jacobi(z, p) != -1) {
+            mpz_add_ui(z, z, 1);
+            if(mpz_cmp(z, p) >= 0) {
+                mpz_clear(z);
+                return;
+            }
+        }
+
+        curve->sqrtTwoAdicity = s;
+        curve->sqrtPowers = (mpz_t *)malloc(s * sizeof(mpz_t));
+        mpz_init(curve->sqrtPowers[0]);
+        mpz_powm(curve->sqrtPowers[0], z, curve->sqrtExp, p);
+        for(i = 1; i < s; i++) {
+            mpz_init(curve->sqrtPowers[i]);
+            mpz_mul(curve->sqrtPowers[i], curve->sqrtPowers[i - 1], curve->sqrtPowers[i - 1]);
+            mpz_mod(curve->sqrtPowers[i], curve->sqrtPowers[i], p);
+        }
+
+        mpz_clear(z);
+    }
+}
+
+
+/*
+ * Tonelli-Shanks using the precomputed constants, a must be non-zero and reduced modulo p. The
+ * c = z^(q * 2^(s - m)) of the textbook version is always one of the precomputed powers, so is the
+ * b = c^(2^(m - i - 1)) needed in each step. Returns 0 if a is not a square.
+ */
+static int tonelliShanks(mpz_t rop, const mpz_t a, const CurveZZ_p * curve) {
+    if(curve->sqrtPowers == NULL) {
+        return 0;
+    }
+
+    unsigned long s = curve->sqrtTwoAdicity, m = s, i;
+    mpz_t t, t2i, e;
+    mpz_inits(t, t2i, e, NULL);
+
+    mpz_powm(t, a, curve->sqrtExp, curve->p);
+    mpz_add_ui(e, curve->sqrtExp, 1);
+    mpz_fdiv_q_2exp(e, e, 1);
+    mpz_powm(rop, a, e, curve->p);
+
+    int found = 1;
+    while(mpz_cmp_ui(t, 1) != 0) {
+        // find the least i such that t^(2^i) = 1, for a non-residue that is i = m
+        mpz_set(t2i, t);
+        for(i = 0; i < m && mpz_cmp_ui(t2i, 1) != 0; i++) {
+            mpz_mul(t2i, t2i, t2i);
+            mpz_mod(t2i, t2i, curve->p);
+        }
+        if(i == m) {
+            found = 0;
+            break;
+        }
+
+        const mpz_srcptr b = curve->sqrtPowers[s - i - 1];
+        m = i;
+        mpz_mul(t, t, b);
+        mpz_mul(t, t, b);
+        mpz_mod(t, t, curve->p);
+        mpz_mul(rop, rop, b);
+        mpz_mod(rop, rop, curve->p);
+    }
+
+    mpz_clears(t, t2i, e, NULL);
+    return found;
+}
+
+
+/*
+ * Atkin's algorithm for p = 5 mod 8, a must be reduced modulo p. With v = (2a)^((p - 5) / 8) and
+ * i = 2av^2 the root is av(i - 1). Returns 0 if a is not a square.
+ */
+static int atkin(mpz_t rop, const mpz_t a, const CurveZZ_p * curve) {
+    mpz_t a2, v, i;
+    mpz_inits(a2, v, i, NULL);
+
+    mpz_mul_2exp(a2, a, 1);
+    mpz_mod(a2, a2, curve->p);
+    mpz_powm(v, a2, curve->sqrtExp, curve->p);
+
+    mpz_mul(i, v, v);
+    mpz_mul(i, i, a2);
+    mpz_sub_ui(i, i, 1);
+    mpz_mod(i, i, curve->p);
+
+    mpz_mul(rop, a, v);
+    mpz_mod(rop, rop, curve->p);
+    mpz_mul(rop, rop, i);
+    mpz_mod(rop, rop, curve->p);
+
+    // the formula only gives a root if a is a square
+    mpz_mul(i, rop, rop);
+    mpz_mod(i, i, curve->p);
+    int found = mpz_cmp(i, a) == 0;
+
+    mpz_clears(a2, v, i, NULL);
+    return found;
+}
+
+
+/*
+ * Set rop to a square root of a modulo the curve's prime. Returns 1 if a is a square and 0 (leaving
+ * rop undefined) otherwise.
+ */
+int mpz_sqrt_mod(mpz_t rop, const mpz_t a, const CurveZZ_p * curve) {
+    if(mpz_cmp_ui(curve->p, 3) < 0 || mpz_even_p(curve->p)) {
+        return 0;
+    }
+
+    mpz_t r;
+    mpz_init(r);
+    mpz_mod(r, a, curve->p);
+
+    int found = 1;
+    if(mpz_sgn(r) == 0) {
+        mpz_set_ui(rop, 0);
+    } else if(mpz_tstbit(curve->p, 1)) {
+        // p = 3 mod 4, the root is a^((p + 1) / 4) if a is a square, which is checked by squaring it
+        mpz_t check;
+        mpz_init(check);
+        mpz_powm(rop, r, curve->sqrtExp, curve->p);
+        mpz_mul(check, rop, rop);
+        mpz_mod(check, check, curve->p);
+        found = mpz_cmp(check, r) == 0;
+        mpz_clear(check);
+    } else if(mpz_tstbit(curve->p, 2)) {
+        found = atkin(rop, r, curve);
+    } else {
+        found = tonelliShanks(rop, r, curve);
+    }
+
+    mpz_clear(r);
+    return found;
+}
+
+
+/*
+ * Check whether y^2 = x^3 + ax + b with both coordinates reduced modulo p.
+ */
+int pointZZ_pIsOnCurve(const PointZZ_p * op, const CurveZZ_p * curve) {
+    if(mpz_sgn(op->x) < 0 || mpz_cmp(op->x, curve->p) >= 0 || mpz_sgn(op->y) < 0 || mpz_cmp(op->y, curve->p) >= 0) {
+        return 0;
+    }
+
+    mpz_t lhs, rhs;
+    mpz_inits(lhs, rhs, NULL);
+
+    mpz_mul(lhs, op->y, op->y);
+    mpz_mod(lhs, lhs, curve->p);
+
+    mpz_mul(rhs, op->x, op->x);
+    mpz_add(rhs, rhs, curve->a);
+    mpz_mul(rhs, rhs, op->x);
+    mpz_add(rhs, rhs, curve->b);
+    mpz_mod(rhs, rhs, curve->p);
+
+    int onCurve = mpz_cmp(lhs, rhs) == 0;
+    mpz_clears(lhs, rhs, NULL);
+    return onCurve;
+}
+
+
+/*
+ * Recover the point with the given x coordinate and y coordinate of the given parity. Returns 1 on
+ * success and 0 if there is no such point on the curve.
+ */
+int pointZZ_pDecompress(PointZZ_p * rop, const mpz_t x, int odd, const CurveZZ_p * curve) {
+    if(mpz_sgn(x) < 0 || mpz_cmp(x, curve->p) >= 0) {
+        return 0;
+    }
+
+    mpz_t rhs;
+    mpz_init(rhs);
+
+    // y^2 = x^3 + ax + b
+    mpz_mul(rhs, x, x);
+    mpz_add(rhs, rhs, curve->a);
+    mpz_mul(rhs, rhs, x);
+    mpz_add(rhs, rhs, curve->b);
+
+    int found = mpz_sqrt_mod(rop->y, rhs, curve);
+    mpz_clear(rhs);
+
+    if(!found || (mpz_sgn(rop->y) == 0 && odd)) {
+        return 0;
+    }
+
+    if(mpz_odd_p(rop->y) != (odd != 0)) {
+        mpz_sub(rop->y, curve->p, rop->y);
+    }
+    mpz_set(rop->x, x);
+    return 1;
+}
@@ -0,0 +1,12 @@
+#ifndef MODSQRT_H
+#define MODSQRT_H
+
+#include <gmp.h>
+#include "curve.h"
+
+void curveZZ_pSqrtPrecompute(CurveZZ_p * curve);
+int mpz_sqrt_mod(mpz_t rop, const mpz_t a, const CurveZZ_p * curve);
+int pointZZ_pDecompress(PointZZ_p * rop, const mpz_t x, int odd, const CurveZZ_p * curve);
+int pointZZ_pIsOnCurve(const PointZZ_p * op, const CurveZZ_p * curve);
+
+#endif
@@ -0,0 +1,203 @@
+#include "montgomery.h"
+#include "jacobianMath.h"
+
+
+/*
+ * Compute the u coordinate of scalar * P on the Montgomery curve v^2 = u^3 + A * u^2 + u modulo p,
+ * where u is the u coordinate of P and a24 = (A - 2) / 4, as described in RFC 7748 Section 5. The
+ * ladder runs over the low bits bits of the scalar, every bit costs one differential addition and
+ * one doubling in projective (x : z) coordinates, and a single inversion is done at the end. The
+ * identity element (z = 0) gives u = 0, as in the RFC. The scalar is secret, so the points are
+ * exchanged with a constant time conditional swap rather than a branch on its bits.
+ */
+void montgomeryZZ_pLadder(mpz_t rop, const mpz_t scalar, const mpz_t u, const mpz_t p, unsigned long a24, unsigned long bits) {
+    mpz_t x1, x2, z2, x3, z3, a, aa, b, bb, e, c, d;
+    unsigned long t;
+    mp_limb_t swap = 0;
+    mp_size_t limbs = mpz_size(p);
+
+    mpz_inits(x1, x2, z2, x3, z3, a, aa, b, bb, e, c, d, NULL);
+    mpz_mod(x1, u, p);
+    mpz_set_ui(x2, 1);
+    mpz_set_ui(z2, 0);
+    mpz_set(x3, x1);
+    mpz_set_ui(z3, 1);
+
+    for(t = bits; t-- > 0;) {
+        mp_limb_t bit = mpz_tstbit(scalar, t);
+
+        swap ^= bit;
+        mpz_cnd_swap(x2, x3, swap, limbs);
+        mpz_cnd_swap(z2, z3, swap, limbs);
+        swap = bit;
+
+        // a = x2 + z2, aa = a^2, b = x2 - z2, bb = b^2, e = aa - bb
+        mpz_add(a, x2, z2);
+        mpz_mul(aa, a, a);
+        mpz_mod(aa, aa, p);
+        mpz_sub(b, x2, z2);
+        mpz_mul(bb, b, b);
+        mpz_mod(bb, bb, p);
+        mpz_sub(e, aa, bb);
+
+        // c = (x3 + z3) * b, d = (x3 - z3) * a
+        mpz_add(c, x3, z3);
+        mpz_mul(c, c, b);
+        mpz_mod(c, c, p);
+        mpz_sub(d, x3, z3);
+        mpz_mul(d, d, a);
+        mpz_mod(d, d, p);
+
+        // x3 = (d + c)^2, z3 = x1 * (d - c)^2
+        mpz_add(x3, d, c);
+        mpz_mul(x3, x3, x3);
+        mpz_mod(x3, x3, p);
+        mpz_sub(z3, d, c);
+        mpz_mul(z3, z3, z3);
+        mpz_mod(z3, z3, p);
+        mpz_mul(z3, z3, x1);
+        mpz_mod(z3, z3, p);
+
+        // x2 = aa * bb, z2 = e * (aa + a24 * e)
+        mpz_mul(x2, aa, bb);
+        mpz_mod(x2, x2, p);
+        mpz_addmul_ui(aa, e, a24);
+        mpz_mul(z2, e, aa);
+        mpz_mod(z2, z2, p);
+    }
+
+    mpz_cnd_swap(x2, x3, swap, limbs);
+    mpz_cnd_swap(z2, z3, swap, limbs);
+
+    if(mpz_invert(z2, z2, p)) {
+        mpz_mul(rop, x2, z2);
+        mpz_mod(rop, rop, p);
+    } else {
+        mpz_set_ui(rop, 0);
+    }
+
+    mpz_clears(x1, x2, z2, x3, z3, a, aa, b, bb, e, c, d, NULL);
+}
+
+
+/*
+ * Compute the affine x coordinate of scalar * point on the short Weierstrass curve with the x only
+ * ladder of Brier and Joye ("Weierstrass Elliptic Curves and Side-Channel Attacks", PKC 2002), the
+ * counterpart of montgomeryZZ_pLadder. The running points R0 and R1 = R0 + P are kept as (X : Z)
+ * with x = X / Z, starting from R0 = (1 : 0), the identity element. Every bit costs one addition
+ * using the known difference x(P) and one doubling, for as many bits as the curve order (or the
+ * scalar, if longer) has, the points are exchanged with a constant time conditional swap and a
+ * single inversion is done at the end. The addition formula needs x(P) != 0, a public property of
+ * the point, so such points use jacobianZZ_pMulSecret. Returns 0 if the product is the identity
+ * element (rop is left unchanged), 1 otherwise.
+ */
+int pointZZ_pLadderX(mpz_t rop, const PointZZ_p * point, const mpz_t scalar, const CurveZZ_p * curve) {
+    if(mpz_sgn(point->x) == 0) {
+        JacobianZZ_p product;
+        int found;
+
+        jacobianZZ_pInit(&product);
+        jacobianZZ_pSetAffine(&product, point);
+        jacobianZZ_pMulSecret(&product, &product, scalar, curve);
+        found = jacobianZZ_pToAffineX(rop, &product, curve);
+        jacobianZZ_pClear(&product);
+        return found;
+    }
+
+    mpz_t k, xd, a, b4, b8, x2, z2, x3, z3, t1, t2, t3, t4, xx, zz, xz;
+    unsigned long t, bits;
+    mp_limb_t swap = 0;
+    mp_size_t limbs = mpz_size(curve->p);
+    int found;
+
+    mpz_inits(k, xd, a, b4, b8, x2, z2, x3, z3, t1, t2, t3, t4, xx, zz, xz, NULL);
+
+    // x(-dP) = x(dP)
+    mpz_abs(k, scalar);
+    bits = mpz_sizeinbase(curve->q, 2);
+    if(mpz_sizeinbase(k, 2) > bits) {
+        bits = mpz_sizeinbase(k, 2);
+    }
+
+    mpz_mod(xd, point->x, curve->p);
+    mpz_mod(a, curve->a, curve->p);
+    mpz_mul_ui(b4, curve->b, 4);
+    mpz_mod(b4, b4, curve->p);
+    mpz_mul_ui(b8, curve->b, 8);
+    mpz_mod(b8, b8, curve->p);
+    mpz_set_ui(x2, 1);
+    mpz_set_ui(z2, 0);
+    mpz_set(x3, xd);
+    mpz_set_ui(z3, 1);
+
+    for(t = bits; t-- > 0;) {
+        mp_limb_t bit = mpz_tstbit(k, t);
+
+        swap ^= bit;
+        mpz_cnd_swap(x2, x3, swap, limbs);
+        mpz_cnd_swap(z2, z3, swap, limbs);
+        swap = bit;
+
+        // t1 = x2 * z3, t2 = x3 * z2, t3 = z2 * z3, t4 = x2 * x3
+        mpz_mul(t1, x2, z3);
+        mpz_mod(t1, t1, curve->p);
+        mpz_mul(t2, x3, z2);
+        mpz_mod(t2, t2, curve->p);
+        mpz_mul(t3, z2, z3);
+        mpz_mod(t3, t3, curve->p);
+        mpz_mul(t4, x2, x3);
+        mpz_mod(t4, t4, curve->p);
+
+        // x3 = (t4 - a * t3)^2 - 4b * t3 * (t1 + t2), z3 = x(P) * (t1 - t2)^2
+        mpz_submul(t4, a, t3);
+        mpz_mod(t4, t4, curve->p);
+        mpz_mul(x3, t4, t4);
+        mpz_add(t4, t1, t2);
+        mpz_mul(t3, t3, b4);
+        mpz_mod(t3, t3, curve->p);
+        mpz_submul(x3, t3, t4);
+        mpz_mod(x3, x3, curve->p);
+        mpz_sub(t1, t1, t2);
+        mpz_mul(z3, t1, t1);
+        mpz_mod(z3, z3, curve->p);
+        mpz_mul(z3, z3, xd);
+        mpz_mod(z3, z3, curve->p);
+
+        // xx = x2^2, zz = z2^2, xz = x2 * z2, t1 = a * zz
+        mpz_mul(xx, x2, x2);
+        mpz_mod(xx, xx, curve->p);
+        mpz_mul(zz, z2, z2);
+        mpz_mod(zz, zz, curve->p);
+        mpz_mul(xz, x2, z2);
+        mpz_mod(xz, xz, curve->p);
+        mpz_mul(t1, a, zz);
+        mpz_mod(t1, t1, curve->p);
+
+        // x2 = (xx - a * zz)^2 - 8b * xz * zz, z2 = 4 * (xz * (xx + a * zz) + b * zz^2)
+        mpz_sub(t2, xx, t1);
+        mpz_mul(x2, t2, t2);
+        mpz_mul(t2, xz, zz);
+        mpz_mod(t2, t2, curve->p);
+        mpz_submul(x2, t2, b8);
+        mpz_mod(x2, x2, curve->p);
+        mpz_add(t2, xx, t1);
+        mpz_mul(t2, t2, xz);
+        mpz_mul(zz, zz, zz);
+        mpz_mod(zz, zz, curve->p);
+        mpz_addmul(t2, zz, curve->b);
+        mpz_mul_2exp(t2, t2, 2);
+        mpz_mod(z2, t2, curve->p);
+    }
+
+    mpz_cnd_swap(x2, x3, swap, limbs);
+    mpz_cnd_swap(z2, z3, swap, limbs);
+
+    found = mpz_invert(z2, z2, curve->p);
+    if(found) {
+        mpz_mul(rop, x2, z2);
+        mpz_mod(rop, rop, curve->p);
+    }
+
+    mpz_clears(k, xd, a, b4, b8, x2, z2, x3, z3, t1, t2, t3, t4, xx, zz, xz, NULL);
+    return found != 0;
+}
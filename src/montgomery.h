@@ -0,0 +1,11 @@
+#ifndef MONTGOMERY_H
+#define MONTGOMERY_H
+
+#include <gmp.h>
+#include "curve.h"
+#include "point.h"
+
+void montgomeryZZ_pLadder(mpz_t rop, const mpz_t scalar, const mpz_t u, const mpz_t p, unsigned long a24, unsigned long bits);
+int pointZZ_pLadderX(mpz_t rop, const PointZZ_p * point, const mpz_t scalar, const CurveZZ_p * curve);
+
+#endif
@@ -0,0 +1,232 @@
+#include "msm.h"
+#include "jacobianMath.h"
+#include <stdlib.h>
+
+// largest bucket window considered for Pippenger's method
+#define PIPPENGER_MAX_WINDOW_BITS 16
+
+
+static unsigned long scalarDigit(const mpz_t scalar, size_t offset, int width) {
+    unsigned long digit = 0;
+    int j;
+
+    for(j = width - 1; j >= 0; j--) {
+        digit = (digit << 1) | mpz_tstbit(scalar, offset + j);
+    }
+    return digit;
+}
+
+
+static size_t maxScalarBits(mpz_t * scalars, size_t n) {
+    size_t bits = 0, i;
+
+    for(i = 0; i < n; i++) {
+        size_t scalarBits = mpz_sizeinbase(scalars[i], 2);
+        if(scalarBits > bits) {
+            bits = scalarBits;
+        }
+    }
+    return bits;
+}
+
+
+/*
+ * Set multiples[d] = d * point for d < STRAUS_WINDOW_SIZE (multiples must be initialized).
+ */
+void jacobianZZ_pStrausTable(JacobianZZ_p * multiples, const PointZZ_p * point, const CurveZZ_p * curve) {
+    int d;
+
+    jacobianZZ_pSetToIdentityElement(&multiples[0]);
+    jacobianZZ_pSetAffine(&multiples[1], point);
+    jacobianZZ_pDouble(&multiples[2], &multiples[1], curve);
+    for(d = 3; d < STRAUS_WINDOW_SIZE; d++) {
+        jacobianZZ_pAddAffine(&multiples[d], &multiples[d - 1], point, curve);
+    }
+}
+
+
+/*
+ * The main loop of Straus' method, tables[i] holds the affine multiples of the i-th point as set by
+ * jacobianZZ_pStrausTable. Scalars must be non-negative.
+ */
+void jacobianZZ_pStrausEvaluate(JacobianZZ_p * rop, PointZZ_p * const * tables, mpz_t * scalars, size_t n, const CurveZZ_p * curve) {
+    JacobianZZ_p acc;
+    size_t i;
+    int j, d;
+
+    jacobianZZ_pInit(&acc);
+    jacobianZZ_pSetToIdentityElement(&acc);
+    int windows = (maxScalarBits(scalars, n) + STRAUS_WINDOW_BITS - 1) / STRAUS_WINDOW_BITS;
+
+    for(j = windows - 1; j >= 0; j--) {
+        for(d = 0; d < STRAUS_WINDOW_BITS; d++) {
+            jacobianZZ_pDouble(&acc, &acc, curve);
+        }
+
+        for(i = 0; i < n; i++) {
+            unsigned long digit = scalarDigit(scalars[i], (size_t)j * STRAUS_WINDOW_BITS, STRAUS_WINDOW_BITS);
+            if(digit) {
+                jacobianZZ_pAddAffine(&acc, &acc, &tables[i][digit], curve);
+            }
+        }
+    }
+
+    jacobianZZ_pSet(rop, &acc);
+    jacobianZZ_pClear(&acc);
+}
+
+
+/*
+ * Straus' (interleaved window) method. Every point gets a table of its multiples 0P .. 15P, all
+ * tables are normalized together with one inversion and then share a single chain of doublings.
+ * Scalars must be non-negative, points are affine with (0, 0) as the identity element.
+ */
+void jacobianZZ_pStraus(JacobianZZ_p * rop, const PointZZ_p * points, mpz_t * scalars, size_t n, const CurveZZ_p * curve) {
+    size_t tableSize = n * STRAUS_WINDOW_SIZE, i;
+    JacobianZZ_p * jacobianTable = (JacobianZZ_p *)calloc(tableSize, sizeof(JacobianZZ_p));
+    PointZZ_p * table = (PointZZ_p *)malloc(tableSize * sizeof(PointZZ_p));
+    PointZZ_p ** tables = (PointZZ_p **)malloc(n * sizeof(PointZZ_p *));
+
+    for(i = 0; i < tableSize; i++) {
+        jacobianZZ_pInit(&jacobianTable[i]);
+        mpz_inits(table[i].x, table[i].y, NULL);
+    }
+    for(i = 0; i < n; i++) {
+        jacobianZZ_pStrausTable(&jacobianTable[i * STRAUS_WINDOW_SIZE], &points[i], curve);
+        tables[i] = &table[i * STRAUS_WINDOW_SIZE];
+    }
+    jacobianZZ_pBatchToAffine(table, jacobianTable, tableSize, curve);
+
+    jacobianZZ_pStrausEvaluate(rop, tables, scalars, n, curve);
+
+    for(i = 0; i < tableSize; i++) {
+        jacobianZZ_pClear(&jacobianTable[i]);
+        mpz_clears(table[i].x, table[i].y, NULL);
+    }
+    free(jacobianTable);
+    free(table);
+    free(tables);
+}
+
+
+static size_t pippengerCost(size_t n, size_t bits, int c) {
+    return ((bits + c - 1) / c) * (n + ((size_t)2 << c));
+}
+
+
+static int pippengerWindowBits(size_t n, size_t bits) {
+    int c, best = 1;
+
+    for(c = 2; c <= PIPPENGER_MAX_WINDOW_BITS; c++) {
+        if(pippengerCost(n, bits, c) < pippengerCost(n, bits, best)) {
+            best = c;
+        }
+    }
+    return best;
+}
+
+
+/*
+ * Pippenger's (bucket) method. For each c bit window the points are added into the bucket of their
+ * digit and the buckets are combined with a running sum, so the cost per window is n additions
+ * plus 2^(c+1) for the buckets instead of n * 2^c / c precomputed multiples.
+ * Scalars must be non-negative, points are affine with (0, 0) as the identity element.
+ */
+void jacobianZZ_pPippenger(JacobianZZ_p * rop, const PointZZ_p * points, mpz_t * scalars, size_t n, const CurveZZ_p * curve) {
+    size_t bits = maxScalarBits(scalars, n), i;
+    int c = pippengerWindowBits(n, bits), j, k;
+    size_t bucketCount = ((size_t)1 << c) - 1, b;
+    JacobianZZ_p * buckets = (JacobianZZ_p *)malloc(bucketCount * sizeof(JacobianZZ_p));
+    JacobianZZ_p acc, running, sum;
+
+    for(b = 0; b < bucketCount; b++) {
+        jacobianZZ_pInit(&buckets[b]);
+    }
+    jacobianZZ_pInit(&acc);
+    jacobianZZ_pInit(&running);
+    jacobianZZ_pInit(&sum);
+    jacobianZZ_pSetToIdentityElement(&acc);
+
+    int windows = (bits + c - 1) / c;
+
+    for(j = windows - 1; j >= 0; j--) {
+        for(k = 0; k < c; k++) {
+            jacobianZZ_pDouble(&acc, &acc, curve);
+        }
+
+        // bucket b holds the sum of the points whose digit in this window is b + 1
+        for(b = 0; b < bucketCount; b++) {
+            jacobianZZ_pSetToIdentityElement(&buckets[b]);
+        }
+        for(i = 0; i < n; i++) {
+            unsigned long digit = scalarDigit(scalars[i], (size_t)j * c, c);
+            if(digit) {
+                jacobianZZ_pAddAffine(&buckets[digit - 1], &buckets[digit - 1], &points[i], curve);
+            }
+        }
+
+        // sum of (b + 1) * bucket[b], computed as the sum of the running suffix sums
+        jacobianZZ_pSetToIdentityElement(&running);
+        jacobianZZ_pSetToIdentityElement(&sum);
+        for(b = bucketCount; b-- > 0;) {
+            jacobianZZ_pAdd(&running, &running, &buckets[b], curve);
+            jacobianZZ_pAdd(&sum, &sum, &running, curve);
+        }
+        jacobianZZ_pAdd(&acc, &acc, &sum, curve);
+    }
+
+    jacobianZZ_pSet(rop, &acc);
+
+    for(b = 0; b < bucketCount; b++) {
+        jacobianZZ_pClear(&buckets[b]);
+    }
+    free(buckets);
+    jacobianZZ_pClear(&acc);
+    jacobianZZ_pClear(&running);
+    jacobianZZ_pClear(&sum);
+}
+
+
+/*
+ * Compute scalars[0] * points[0] + ... + scalars[n - 1] * points[n - 1]. The points are normalized
+ * with one inversion, negative scalars are handled by negating their point and the cheaper of
+ * Straus' and Pippenger's method (by estimated number of point additions) is used.
+ */
+void jacobianZZ_pMultiMul(JacobianZZ_p * rop, const JacobianZZ_p * points, mpz_t * scalars, size_t n, const CurveZZ_p * curve) {
+    if(n == 0) {
+        return jacobianZZ_pSetToIdentityElement(rop);
+    }
+
+    PointZZ_p * affine = (PointZZ_p *)malloc(n * sizeof(PointZZ_p));
+    mpz_t * k = (mpz_t *)malloc(n * sizeof(mpz_t));
+    size_t i;
+
+    for(i = 0; i < n; i++) {
+        mpz_inits(affine[i].x, affine[i].y, NULL);
+        mpz_init(k[i]);
+        mpz_abs(k[i], scalars[i]);
+    }
+    jacobianZZ_pBatchToAffine(affine, points, n, curve);
+
+    for(i = 0; i < n; i++) {
+        if(mpz_sgn(scalars[i]) < 0 && mpz_sgn(affine[i].y) != 0) {
+            mpz_sub(affine[i].y, curve->p, affine[i].y);
+        }
+    }
+
+    size_t bits = maxScalarBits(k, n);
+    size_t straus = n * (STRAUS_WINDOW_SIZE + bits / STRAUS_WINDOW_BITS);
+    size_t pippenger = pippengerCost(n, bits, pippengerWindowBits(n, bits));
+
+    if(straus <= pippenger) {
+        jacobianZZ_pStraus(rop, affine, k, n, curve);
+    } else {
+        jacobianZZ_pPippenger(rop, affine, k, n, curve);
+    }
+
+    for(i = 0; i < n; i++) {
+        mpz_clears(affine[i].x, affine[i].y, k[i], NULL);
+    }
+    free(affine);
+    free(k);
+}
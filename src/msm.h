@@ -0,0 +1,20 @@
+#ifndef MSM_H
+#define MSM_H
+
+#include <stddef.h>
+
+#include <gmp.h>
+#include "curve.h"
+#include "point.h"
+
+// width (in bits) of the per point windows used by Straus' method
+#define STRAUS_WINDOW_BITS 4
+#define STRAUS_WINDOW_SIZE (1 << STRAUS_WINDOW_BITS)
+
+void jacobianZZ_pStrausTable(JacobianZZ_p * multiples, const PointZZ_p * point, const CurveZZ_p * curve);
+void jacobianZZ_pStrausEvaluate(JacobianZZ_p * rop, PointZZ_p * const * tables, mpz_t * scalars, size_t n, const CurveZZ_p * curve);
+void jacobianZZ_pStraus(JacobianZZ_p * rop, const PointZZ_p * points, mpz_t * scalars, size_t n, const CurveZZ_p * curve);
+void jacobianZZ_pPippenger(JacobianZZ_p * rop, const PointZZ_p * points, mpz_t * scalars, size_t n, const CurveZZ_p * curve);
+void jacobianZZ_pMultiMul(JacobianZZ_p * rop, const JacobianZZ_p * points, mpz_t * scalars, size_t n, const CurveZZ_p * curve);
+
+#endif
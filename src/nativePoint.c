@@ -0,0 +1,311 @@
+#include "nativePoint.h"
+#include "convert.h"
+#include "fixedBase.h"
+#include "jacobianMath.h"
+
+
+/*
+ * Allocate a point (set to the identity element) on the curve held by capsule.
+ */
+NativePoint * nativePointNew(PyObject * capsule) {
+    NativePoint * self = (NativePoint *)NativePointType.tp_alloc(&NativePointType, 0);
+    if(self == NULL) {
+        return NULL;
+    }
+
+    Py_INCREF(capsule);
+    self->capsule = capsule;
+    self->curve = (CurveZZ_p *)PyCapsule_GetPointer(capsule, CURVE_CAPSULE_NAME);
+    jacobianZZ_pInit(&self->point);
+    jacobianZZ_pSetToIdentityElement(&self->point);
+    return self;
+}
+
+
+/*
+ * Get the affine coordinates of either a NativePoint or an object with integer x and y attributes
+ * (i.e. a fastecdsa.point.Point). Returns 0 on success and -1 with a python exception set.
+ */
+int nativePointToAffine(PointZZ_p * rop, PyObject * obj, const CurveZZ_p * curve) {
+    if(NativePoint_Check(obj)) {
+        NativePoint * point = (NativePoint *)obj;
+        if(point->curve != curve) {
+            PyErr_SetString(PyExc_ValueError, "Point is on a different curve");
+            return -1;
+        }
+        jacobianZZ_pToAffine(rop, &point->point, curve);
+        return 0;
+    }
+
+    PyObject * x = PyObject_GetAttrString(obj, "x");
+    PyObject * y = x == NULL ? NULL : PyObject_GetAttrString(obj, "y");
+    int status = (x == NULL || y == NULL || mpzFromPyLong(rop->x, x) || mpzFromPyLong(rop->y, y)) ? -1 : 0;
+    Py_XDECREF(x);
+    Py_XDECREF(y);
+    return status;
+}
+
+
+/*
+ * Like nativePointToAffine, but a NativePoint is copied as is instead of being normalized. For a
+ * fastecdsa.point.Point its NativePoint is used if it has one, otherwise its curve is checked and
+ * its affine coordinates are read.
+ */
+int nativePointToJacobian(JacobianZZ_p * rop, PyObject * obj, const CurveZZ_p * curve) {
+    if(NativePoint_Check(obj)) {
+        NativePoint * point = (NativePoint *)obj;
+        if(point->curve != curve) {
+            PyErr_SetString(PyExc_ValueError, "Point is on a different curve");
+            return -1;
+        }
+        jacobianZZ_pSet(rop, &point->point);
+        return 0;
+    }
+
+    PyObject * native = PyObject_GetAttrString(obj, "_native");
+    if(native == NULL) {
+        PyErr_Clear();
+    } else if(NativePoint_Check(native)) {
+        int status = nativePointToJacobian(rop, native, curve);
+        Py_DECREF(native);
+        return status;
+    } else {
+        Py_DECREF(native);
+    }
+
+    // the identity element has no curve
+    PyObject * curveObj = PyObject_GetAttrString(obj, "curve");
+    if(curveObj == NULL) {
+        PyErr_Clear();
+    } else if(curveObj != Py_None) {
+        CurveZZ_p * pointCurve = curveZZ_pFromPyObject(curveObj);
+        Py_DECREF(curveObj);
+        if(pointCurve == NULL) {
+            return -1;
+        } else if(pointCurve != curve) {
+            PyErr_SetString(PyExc_ValueError, "Point is on a different curve");
+            return -1;
+        }
+    } else {
+        Py_DECREF(curveObj);
+    }
+
+    PointZZ_p affine;
+    mpz_inits(affine.x, affine.y, NULL);
+    int status = nativePointToAffine(&affine, obj, curve);
+    if(status == 0) {
+        jacobianZZ_pSetAffine(rop, &affine);
+    }
+    mpz_clears(affine.x, affine.y, NULL);
+    return status;
+}
+
+
+static PyObject * NativePoint_new(PyTypeObject * type, PyObject * args, PyObject * kwds) {
+    static char * kwlist[] = {"x", "y", "curve", NULL};
+    PyObject * x, * y, * curveObj;
+
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "OOO", kwlist, &x, &y, &curveObj)) {
+        return NULL;
+    }
+
+    PyObject * capsule = curveCapsuleFromPyObject(curveObj);
+    if(capsule == NULL) {
+        return NULL;
+    }
+
+    NativePoint * self = nativePointNew(capsule);
+    Py_DECREF(capsule);
+    if(self == NULL) {
+        return NULL;
+    }
+
+    PointZZ_p affine;
+    mpz_inits(affine.x, affine.y, NULL);
+    if(mpzFromPyLong(affine.x, x) || mpzFromPyLong(affine.y, y)) {
+        mpz_clears(affine.x, affine.y, NULL);
+        Py_DECREF(self);
+        return NULL;
+    }
+
+    jacobianZZ_pSetAffine(&self->point, &affine);
+    mpz_clears(affine.x, affine.y, NULL);
+    return (PyObject *)self;
+}
+
+
+static void NativePoint_dealloc(NativePoint * self) {
+    jacobianZZ_pClear(&self->point);
+    Py_XDECREF(self->capsule);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static int checkSameCurve(NativePoint * op1, NativePoint * op2) {
+    if(op1->curve != op2->curve) {
+        PyErr_SetString(PyExc_ValueError, "Points are on different curves");
+        return -1;
+    }
+    return 0;
+}
+
+
+static PyObject * NativePoint_add(PyObject * op1, PyObject * op2) {
+    if(!NativePoint_Check(op1) || !NativePoint_Check(op2)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    NativePoint * P = (NativePoint *)op1, * Q = (NativePoint *)op2;
+    if(checkSameCurve(P, Q)) {
+        return NULL;
+    }
+
+    NativePoint * result = nativePointNew(P->capsule);
+    if(result != NULL) {
+        jacobianZZ_pAdd(&result->point, &P->point, &Q->point, P->curve);
+    }
+    return (PyObject *)result;
+}
+
+
+static PyObject * NativePoint_subtract(PyObject * op1, PyObject * op2) {
+    if(!NativePoint_Check(op1) || !NativePoint_Check(op2)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    NativePoint * P = (NativePoint *)op1, * Q = (NativePoint *)op2;
+    if(checkSameCurve(P, Q)) {
+        return NULL;
+    }
+
+    NativePoint * result = nativePointNew(P->capsule);
+    if(result != NULL) {
+        jacobianZZ_pNeg(&result->point, &Q->point, P->curve);
+        jacobianZZ_pAdd(&result->point, &P->point, &result->point, P->curve);
+    }
+    return (PyObject *)result;
+}
+
+
+static PyObject * NativePoint_multiply(PyObject * op1, PyObject * op2) {
+    PyObject * scalarObj;
+    NativePoint * P;
+
+    if(NativePoint_Check(op1) && PyLong_Check(op2)) {
+        P = (NativePoint *)op1;
+        scalarObj = op2;
+    } else if(NativePoint_Check(op2) && PyLong_Check(op1)) {
+        P = (NativePoint *)op2;
+        scalarObj = op1;
+    } else {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    mpz_t scalar;
+    mpz_init(scalar);
+    if(mpzFromPyLong(scalar, scalarObj)) {
+        mpz_clear(scalar);
+        return NULL;
+    }
+
+    NativePoint * result = nativePointNew(P->capsule);
+    if(result != NULL && mpz_cmp_ui(P->point.z, 1) == 0 && mpz_cmp(P->point.x, P->curve->g->x) == 0 &&
+       mpz_cmp(P->point.y, P->curve->g->y) == 0) {
+        // a multiple of the base point (e.g. a public key), the table is built while the GIL is held
+        curveZZ_pFixedBasePrecompute(P->curve);
+        jacobianZZ_pMulBase(&result->point, scalar, P->curve);
+    } else if(result != NULL) {
+        // the scalar may be secret (e.g. a private key times the base point)
+        jacobianZZ_pMulSecret(&result->point, &P->point, scalar, P->curve);
+    }
+    mpz_clear(scalar);
+    return (PyObject *)result;
+}
+
+
+static PyObject * NativePoint_negative(NativePoint * self) {
+    NativePoint * result = nativePointNew(self->capsule);
+    if(result != NULL) {
+        jacobianZZ_pNeg(&result->point, &self->point, self->curve);
+    }
+    return (PyObject *)result;
+}
+
+
+static PyObject * NativePoint_richcompare(PyObject * op1, PyObject * op2, int op) {
+    if(!NativePoint_Check(op1) || !NativePoint_Check(op2) || (op != Py_EQ && op != Py_NE)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    NativePoint * P = (NativePoint *)op1, * Q = (NativePoint *)op2;
+    int equal = P->curve == Q->curve && jacobianZZ_pEqual(&P->point, &Q->point, P->curve);
+    return PyBool_FromLong(op == Py_EQ ? equal : !equal);
+}
+
+
+static PyObject * NativePoint_get_x(NativePoint * self, void * closure) {
+    jacobianZZ_pNormalize(&self->point, self->curve);
+    return jacobianZZ_pIsIdentityElement(&self->point) ? PyLong_FromLong(0) : pyLongFromMpz(self->point.x);
+}
+
+
+static PyObject * NativePoint_get_y(NativePoint * self, void * closure) {
+    jacobianZZ_pNormalize(&self->point, self->curve);
+    return jacobianZZ_pIsIdentityElement(&self->point) ? PyLong_FromLong(0) : pyLongFromMpz(self->point.y);
+}
+
+
+static PyObject * NativePoint_affine(NativePoint * self, PyObject * Py_UNUSED(ignored)) {
+    jacobianZZ_pNormalize(&self->point, self->curve);
+    if(jacobianZZ_pIsIdentityElement(&self->point)) {
+        return Py_BuildValue("ii", 0, 0);
+    }
+    return Py_BuildValue("NN", pyLongFromMpz(self->point.x), pyLongFromMpz(self->point.y));
+}
+
+
+static PyObject * NativePoint_is_identity(NativePoint * self, PyObject * Py_UNUSED(ignored)) {
+    return PyBool_FromLong(jacobianZZ_pIsIdentityElement(&self->point));
+}
+
+
+static PyNumberMethods NativePoint_as_number = {
+    .nb_add = NativePoint_add,
+    .nb_subtract = NativePoint_subtract,
+    .nb_multiply = NativePoint_multiply,
+    .nb_negative = (unaryfunc)NativePoint_negative,
+};
+
+
+static PyGetSetDef NativePoint_getset[] = {
+    {"x", (getter)NativePoint_get_x, NULL, "The affine x coordinate (0 for the identity element).", NULL},
+    {"y", (getter)NativePoint_get_y, NULL, "The affine y coordinate (0 for the identity element).", NULL},
+    {NULL}  /* Sentinel */
+};
+
+
+static PyMethodDef NativePoint_methods[] = {
+    {"affine", (PyCFunction)NativePoint_affine, METH_NOARGS, "Return the affine coordinates (x, y) of the point."},
+    {"is_identity", (PyCFunction)NativePoint_is_identity, METH_NOARGS, "Check if the point is the identity element."},
+    {NULL}  /* Sentinel */
+};
+
+
+PyTypeObject NativePointType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "fastecdsa.curvemath.NativePoint",
+    .tp_doc = PyDoc_STR(
+        "NativePoint(x, y, curve)\n--\n\n"
+        "A point kept in native (jacobian) coordinates. Affine coordinates are only computed when x, y\n"
+        "or affine() are accessed. The coordinates are not validated, (0, 0) is the identity element."
+    ),
+    .tp_basicsize = sizeof(NativePoint),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = NativePoint_new,
+    .tp_dealloc = (destructor)NativePoint_dealloc,
+    .tp_as_number = &NativePoint_as_number,
+    .tp_richcompare = NativePoint_richcompare,
+    .tp_getset = NativePoint_getset,
+    .tp_methods = NativePoint_methods,
+};
@@ -0,0 +1,26 @@
+#ifndef NATIVEPOINT_H
+#define NATIVEPOINT_H
+
+#include <Python.h>
+
+#include <gmp.h>
+#include "curve.h"
+#include "point.h"
+
+// a point kept in jacobian coordinates, exposed to python as curvemath.NativePoint
+typedef struct {
+    PyObject_HEAD
+    PyObject * capsule;     // keeps the native curve alive
+    CurveZZ_p * curve;      // borrowed from the capsule
+    JacobianZZ_p point;
+} NativePoint;
+
+extern PyTypeObject NativePointType;
+
+#define NativePoint_Check(op) PyObject_TypeCheck(op, &NativePointType)
+
+NativePoint * nativePointNew(PyObject * capsule);
+int nativePointToAffine(PointZZ_p * rop, PyObject * obj, const CurveZZ_p * curve);
+int nativePointToJacobian(JacobianZZ_p * rop, PyObject * obj, const CurveZZ_p * curve);
+
+#endif
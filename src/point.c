@@ -13,3 +13,13 @@ void destroyPointZZ_p(PointZZ_p * point) {
     mpz_clears(point->x, point->y, NULL);
     free(point);
 }
+
+
+void jacobianZZ_pInit(JacobianZZ_p * point) {
+    mpz_inits(point->x, point->y, point->z, NULL);
+}
+
+
+void jacobianZZ_pClear(JacobianZZ_p * point) {
+    mpz_clears(point->x, point->y, point->z, NULL);
+}
@@ -8,7 +8,15 @@ typedef struct {
     mpz_t x, y;
 } PointZZ_p;
 
+// point in a prime field in jacobian coordinates (x / z^2, y / z^3), z = 0 is the identity
+typedef struct {
+    mpz_t x, y, z;
+} JacobianZZ_p;
+
 PointZZ_p * buildPointZZ_p(char * x, char * y, int base);
 void destroyPointZZ_p(PointZZ_p * point);
 
+void jacobianZZ_pInit(JacobianZZ_p * point);
+void jacobianZZ_pClear(JacobianZZ_p * point);
+
 #endif
@@ -0,0 +1,200 @@
+#include "pointAccumulator.h"
+#include "convert.h"
+#include "jacobianMath.h"
+#include "nativePoint.h"
+
+
+/*
+ * Add (or subtract) a NativePoint or fastecdsa.point.Point to the running sum. Returns 0 on success
+ * and -1 with a python exception set.
+ */
+static int accumulate(PointAccumulator * self, PyObject * obj, int negate) {
+    JacobianZZ_p term;
+    jacobianZZ_pInit(&term);
+
+    int status = nativePointToJacobian(&term, obj, self->curve);
+    if(status == 0) {
+        if(negate) {
+            jacobianZZ_pNeg(&term, &term, self->curve);
+        }
+        jacobianZZ_pAdd(&self->sum, &self->sum, &term, self->curve);
+    }
+
+    jacobianZZ_pClear(&term);
+    return status;
+}
+
+
+static PyObject * PointAccumulator_new(PyTypeObject * type, PyObject * args, PyObject * kwds) {
+    static char * kwlist[] = {"curve", NULL};
+    PyObject * curveObj;
+
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &curveObj)) {
+        return NULL;
+    }
+
+    PyObject * capsule = curveCapsuleFromPyObject(curveObj);
+    if(capsule == NULL) {
+        return NULL;
+    }
+
+    PointAccumulator * self = (PointAccumulator *)type->tp_alloc(type, 0);
+    if(self == NULL) {
+        Py_DECREF(capsule);
+        return NULL;
+    }
+
+    self->capsule = capsule;
+    self->curve = (CurveZZ_p *)PyCapsule_GetPointer(capsule, CURVE_CAPSULE_NAME);
+    jacobianZZ_pInit(&self->sum);
+    jacobianZZ_pSetToIdentityElement(&self->sum);
+    return (PyObject *)self;
+}
+
+
+static int PointAccumulator_init(PyObject * self, PyObject * args, PyObject * kwds) {
+    // everything is set up in tp_new, this only keeps object.__init__ from rejecting the arguments
+    return 0;
+}
+
+
+static void PointAccumulator_dealloc(PointAccumulator * self) {
+    jacobianZZ_pClear(&self->sum);
+    Py_XDECREF(self->capsule);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * PointAccumulator_add(PointAccumulator * self, PyObject * point) {
+    if(accumulate(self, point, 0)) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * PointAccumulator_sub(PointAccumulator * self, PyObject * point) {
+    if(accumulate(self, point, 1)) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * PointAccumulator_add_many(PointAccumulator * self, PyObject * points) {
+    PyObject * iterator = PyObject_GetIter(points), * point;
+    if(iterator == NULL) {
+        return NULL;
+    }
+
+    while((point = PyIter_Next(iterator)) != NULL) {
+        int status = accumulate(self, point, 0);
+        Py_DECREF(point);
+        if(status) {
+            Py_DECREF(iterator);
+            return NULL;
+        }
+    }
+
+    Py_DECREF(iterator);
+    if(PyErr_Occurred()) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * PointAccumulator_add_scaled(PointAccumulator * self, PyObject * args) {
+    PyObject * pointObj, * scalarObj;
+
+    if(!PyArg_ParseTuple(args, "OO", &pointObj, &scalarObj)) {
+        return NULL;
+    }
+
+    JacobianZZ_p term;
+    mpz_t scalar;
+    jacobianZZ_pInit(&term);
+    mpz_init(scalar);
+
+    int status = nativePointToJacobian(&term, pointObj, self->curve) || mpzFromPyLong(scalar, scalarObj);
+    if(status == 0) {
+        jacobianZZ_pMulSecret(&term, &term, scalar, self->curve);
+        jacobianZZ_pAdd(&self->sum, &self->sum, &term, self->curve);
+    }
+
+    jacobianZZ_pClear(&term);
+    mpz_clear(scalar);
+    if(status) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * PointAccumulator_result(PointAccumulator * self, PyObject * Py_UNUSED(ignored)) {
+    NativePoint * result = nativePointNew(self->capsule);
+    if(result != NULL) {
+        jacobianZZ_pSet(&result->point, &self->sum);
+    }
+    return (PyObject *)result;
+}
+
+
+static PyObject * PointAccumulator_reset(PointAccumulator * self, PyObject * Py_UNUSED(ignored)) {
+    jacobianZZ_pSetToIdentityElement(&self->sum);
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * PointAccumulator_inplace_add(PyObject * self, PyObject * point) {
+    if(accumulate((PointAccumulator *)self, point, 0)) {
+        return NULL;
+    }
+    Py_INCREF(self);
+    return self;
+}
+
+
+static PyObject * PointAccumulator_inplace_subtract(PyObject * self, PyObject * point) {
+    if(accumulate((PointAccumulator *)self, point, 1)) {
+        return NULL;
+    }
+    Py_INCREF(self);
+    return self;
+}
+
+
+static PyNumberMethods PointAccumulator_as_number = {
+    .nb_inplace_add = PointAccumulator_inplace_add,
+    .nb_inplace_subtract = PointAccumulator_inplace_subtract,
+};
+
+
+static PyMethodDef PointAccumulator_methods[] = {
+    {"add", (PyCFunction)PointAccumulator_add, METH_O, "Add a point to the sum."},
+    {"sub", (PyCFunction)PointAccumulator_sub, METH_O, "Subtract a point from the sum."},
+    {"add_many", (PyCFunction)PointAccumulator_add_many, METH_O, "Add every point of an iterable to the sum."},
+    {"add_scaled", (PyCFunction)PointAccumulator_add_scaled, METH_VARARGS, "Add scalar * point to the sum."},
+    {"result", (PyCFunction)PointAccumulator_result, METH_NOARGS, "Return the sum as a NativePoint."},
+    {"reset", (PyCFunction)PointAccumulator_reset, METH_NOARGS, "Reset the sum to the identity element."},
+    {NULL}  /* Sentinel */
+};
+
+
+PyTypeObject PointAccumulatorType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "fastecdsa.curvemath.PointAccumulator",
+    .tp_doc = PyDoc_STR(
+        "PointAccumulator(curve)\n--\n\n"
+        "A mutable sum of points on a curve. The sum is kept in native (jacobian) coordinates so adding a\n"
+        "point needs no modular inversion, the result is only normalized when its coordinates are read."
+    ),
+    .tp_basicsize = sizeof(PointAccumulator),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    .tp_new = PointAccumulator_new,
+    .tp_init = PointAccumulator_init,
+    .tp_dealloc = (destructor)PointAccumulator_dealloc,
+    .tp_as_number = &PointAccumulator_as_number,
+    .tp_methods = PointAccumulator_methods,
+};
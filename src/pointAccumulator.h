@@ -0,0 +1,20 @@
+#ifndef POINTACCUMULATOR_H
+#define POINTACCUMULATOR_H
+
+#include <Python.h>
+
+#include <gmp.h>
+#include "curve.h"
+#include "point.h"
+
+// a running sum of points kept in jacobian coordinates, exposed as curvemath.PointAccumulator
+typedef struct {
+    PyObject_HEAD
+    PyObject * capsule;     // keeps the native curve alive
+    CurveZZ_p * curve;      // borrowed from the capsule
+    JacobianZZ_p sum;
+} PointAccumulator;
+
+extern PyTypeObject PointAccumulatorType;
+
+#endif
@@ -1,7 +1,15 @@
 from unittest import TestCase
 
-from fastecdsa.curve import Curve
-from fastecdsa.encoding.asn1 import asn1_oid
+from fastecdsa.curve import Curve, P256
+from fastecdsa.encoding.asn1 import (
+    ASN1EncodingError,
+    asn1_oid,
+    asn1_structure,
+    iter_asn1,
+    parse_asn1_int,
+    parse_asn1_length,
+    read_asn1_header,
+)
 
 
 class TestAsn1(TestCase):
@@ -12,3 +20,51 @@ class TestAsn1(TestCase):
         actual = asn1_oid(curve)
 
         self.assertEqual(expected, actual)
+
+    def test_parse_asn1_length(self):
+        self.assertEqual(parse_asn1_length(b"\x02abc"), (2, b"ab", b"c"))
+
+        # multi byte lengths are big endian
+        data = b"\x82\x01\x00" + bytes(256) + b"tail"
+        self.assertEqual(parse_asn1_length(data), (256, bytes(256), b"tail"))
+        data = b"\x83\x01\x00\x01" + bytes(65537)
+        self.assertEqual(parse_asn1_length(data)[0], 65537)
+
+        for bad in (b"", b"\x03ab", b"\x82\x01", b"\x80", b"\x89" + bytes(9)):
+            with self.assertRaises(ASN1EncodingError):
+                parse_asn1_length(bad)
+
+    def test_parse_asn1_int(self):
+        self.assertEqual(parse_asn1_int(b"\x02\x01\x05rest"), (1, b"\x05", b"rest"))
+        with self.assertRaises(ASN1EncodingError):
+            parse_asn1_int(b"\x04\x01\x05")
+        with self.assertRaises(ASN1EncodingError):
+            parse_asn1_int(b"\x02\x02\x05")
+
+    def test_read_asn1_header(self):
+        data = b"junk" + asn1_structure(b"\x04", bytes(300))
+        self.assertEqual(read_asn1_header(data, 4), (0x04, 8, 308))
+        self.assertEqual(read_asn1_header(memoryview(data), 4), (0x04, 8, 308))
+
+        with self.assertRaises(ASN1EncodingError):
+            read_asn1_header(data, 4, 307)
+        with self.assertRaises(ASN1EncodingError):
+            read_asn1_header(data, len(data))
+
+    def test_iter_asn1(self):
+        inner = asn1_structure(b"\x06", P256.oid) + asn1_structure(b"\x30", b"")
+        data = asn1_structure(
+            b"\x30",
+            asn1_structure(b"\x02", b"\x01")
+            + asn1_structure(b"\xa0", inner)
+            + asn1_structure(b"\x03", b"\x00\x04"),
+        )
+
+        tag, start, stop = read_asn1_header(data)
+        self.assertEqual(tag, 0x30)
+        self.assertEqual(
+            [tag for tag, _, _ in iter_asn1(data, start, stop)], [0x02, 0xA0, 0x03]
+        )
+
+        with self.assertRaises(ASN1EncodingError):
+            list(iter_asn1(data, start, stop + 1))
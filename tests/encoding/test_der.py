@@ -1,11 +1,34 @@
-from binascii import unhexlify
+from binascii import a2b_base64, unhexlify
 from random import randint
 from unittest import TestCase
 
 from .. import CURVES
-from fastecdsa.curve import secp256k1
+from fastecdsa.curve import P256, Curve, secp256k1
 from fastecdsa.ecdsa import sign
-from fastecdsa.encoding.der import DEREncoder, InvalidDerSignature
+from fastecdsa.encoding.der import (
+    DEREncoder,
+    DERKeyEncoder,
+    InvalidDerKey,
+    InvalidDerSignature,
+)
+from fastecdsa.encoding.pem import PEMEncoder
+from fastecdsa.keys import gen_keypair
+from fastecdsa.point import Point
+
+# generated with openssl ecparam -name prime256v1 -genkey -outform DER, and openssl ec -pubout
+OPENSSL_PRIVATE_KEY = unhexlify(
+    "307702010104208427557a320db08fdf4658a97b527b948639d63119a6da96a1923913ec252917a00a06082a8648"
+    "ce3d030107a14403420004540688351795958b2eb3bd105c1f1e7d1103a6a0cc623401c6b2f84ef9079792bb2850"
+    "dc041c1221db0bdc7675edb360ed81b9d66217afb2e27a5149e802d126"
+)
+OPENSSL_PUBLIC_KEY = unhexlify(
+    "3059301306072a8648ce3d020106082a8648ce3d03010703420004540688351795958b2eb3bd105c1f1e7d1103a6"
+    "a0cc623401c6b2f84ef9079792bb2850dc041c1221db0bdc7675edb360ed81b9d66217afb2e27a5149e802d126"
+)
+OPENSSL_COMPRESSED_PUBLIC_KEY = unhexlify(
+    "3039301306072a8648ce3d020106082a8648ce3d03010703220002540688351795958b2eb3bd105c1f1e7d1103a6"
+    "a0cc623401c6b2f84ef9079792"
+)
 
 
 class TestDEREncoder(TestCase):
@@ -156,3 +179,174 @@ class TestDEREncoder(TestCase):
 
             self.assertEqual(decoded_r, r)
             self.assertEqual(decoded_s, s)
+
+    def test_decode_signature_bip66_strictness(self):
+        invalid = [
+            b"\x30\x81\x06\x02\x01\x01\x02\x01\x02",  # long form length below 128
+            b"\x30\x82\x00\x06\x02\x01\x01\x02\x01\x02",  # length with a leading zero byte
+            b"\x30\x80\x02\x01\x01\x02\x01\x02\x00\x00",  # indefinite length
+            b"\x30\x06\x02\x01\x01\x02\x01\x02\x00",  # data after the sequence
+            b"\x30\x07\x02\x01\x01\x02\x01\x02\x00",  # data after s
+            b"\x30\x07\x02\x81\x01\x01\x02\x01\x02",  # long form length of r
+            b"\x30\x04\x02\x01\x01\x02",  # missing s
+        ]
+        for data in invalid:
+            with self.assertRaises(InvalidDerSignature):
+                DEREncoder.decode_signature(data)
+
+        with self.assertRaises(TypeError):
+            DEREncoder.decode_signature("0\x06\x02\x01\x01\x02\x01\x02")  # type: ignore[arg-type]
+
+        data = b"\x30\x06\x02\x01\x01\x02\x01\x02"
+        self.assertEqual(DEREncoder.decode_signature(bytearray(data)), (1, 2))
+        self.assertEqual(DEREncoder.decode_signature(memoryview(data)), (1, 2))
+
+    def test_long_form_lengths(self):
+        # a sequence of 128 bytes or more (e.g. signatures on large curves) has a long form length
+        r = s = (1 << 520) - 1
+        encoded = DEREncoder.encode_signature(r, s)
+        self.assertEqual(encoded[:3], b"\x30\x81\x88")
+        self.assertEqual(encoded[3:6], b"\x02\x42\x00")
+        self.assertEqual(DEREncoder.decode_signature(encoded), (r, s))
+
+        r = s = 1 << 1100
+        encoded = DEREncoder.encode_signature(r, s)
+        self.assertEqual(encoded[:4], b"\x30\x82\x01\x1a")
+        self.assertEqual(DEREncoder.decode_signature(encoded), (r, s))
+
+    def test_encode_signature_errors(self):
+        with self.assertRaises(ValueError):
+            DEREncoder.encode_signature(-1, 1)
+        with self.assertRaises(TypeError):
+            DEREncoder.encode_signature(1.0, 1)  # type: ignore[arg-type]
+        self.assertEqual(
+            DEREncoder.encode_signature(0, 0), b"\x30\x06\x02\x01\x00\x02\x01\x00"
+        )
+
+    def test_bulk(self):
+        sigs = [(randint(1, 2**256), randint(1, 2**256)) for _ in range(50)]
+        encoded = DEREncoder.encode_signatures(sigs)
+        self.assertEqual(encoded, [DEREncoder.encode_signature(r, s) for r, s in sigs])
+        self.assertEqual(DEREncoder.decode_signatures(encoded), sigs)
+        self.assertEqual(DEREncoder.encode_signatures([]), [])
+        self.assertEqual(DEREncoder.decode_signatures([]), [])
+
+        encoded[7] = encoded[7] + b"\x00"
+        with self.assertRaisesRegex(InvalidDerSignature, "index 7"):
+            DEREncoder.decode_signatures(encoded)
+        with self.assertRaises(TypeError):
+            DEREncoder.encode_signatures([(1, 2, 3)])
+
+    def test_sign_with_encoder(self):
+        for curve in CURVES:
+            d = randint(1, curve.q - 1)
+            sig = sign("sign me", d, curve=curve)
+            self.assertEqual(
+                sign("sign me", d, curve=curve, encoder=DEREncoder),
+                DEREncoder.encode_signature(*sig),
+            )
+            self.assertEqual(
+                sign("sign me", d, curve=curve, encoder=DEREncoder()),
+                DEREncoder.encode_signature(*sig),
+            )
+
+
+class TestDERKeyEncoder(TestCase):
+    def setUp(self):
+        self.encoder = DERKeyEncoder()
+
+    def test_openssl_keys(self):
+        d = self.encoder.decode_private_key(OPENSSL_PRIVATE_KEY)
+        Q = self.encoder.decode_public_key(OPENSSL_PUBLIC_KEY)
+        self.assertEqual(Q, d * P256.G)
+        self.assertEqual(
+            self.encoder.decode_public_key(OPENSSL_COMPRESSED_PUBLIC_KEY), Q
+        )
+        self.assertEqual(self.encoder.encode_private_key(d, P256), OPENSSL_PRIVATE_KEY)
+        self.assertEqual(self.encoder.encode_public_key(Q), OPENSSL_PUBLIC_KEY)
+
+    def test_round_trip(self):
+        for curve in CURVES:
+            d, Q = gen_keypair(curve)
+            private = self.encoder.encode_private_key(d, curve)
+            public = self.encoder.encode_public_key(Q)
+            self.assertEqual(self.encoder.decode_private_key(private), d)
+            self.assertEqual(self.encoder.decode_public_key(memoryview(public)), Q)
+            # the curve comes from the key, not the argument
+            self.assertEqual(
+                self.encoder.decode_public_key(public, secp256k1).curve, curve
+            )
+
+            # PEM is the base64 armored DER
+            pem = PEMEncoder().encode_public_key(Q)
+            self.assertEqual(a2b_base64(b"".join(pem.split(b"\n")[1:-1])), public)
+
+    def test_unnamed_curve(self):
+        curve = Curve("unnamed", P256.p, P256.a, P256.b, P256.q, P256.gx, P256.gy)
+        _, Q = gen_keypair(P256)
+        public = self.encoder.encode_public_key(Point(Q.x, Q.y, curve))
+        with self.assertRaises(InvalidDerKey):
+            self.encoder.decode_public_key(public)
+        self.assertEqual(self.encoder.decode_public_key(public, P256), Q)
+
+    def test_bulk(self):
+        keypairs = [gen_keypair(curve) for curve in CURVES * 3]
+        public = [self.encoder.encode_public_key(Q) for _, Q in keypairs]
+        private = [self.encoder.encode_private_key(d, Q.curve) for d, Q in keypairs]
+
+        self.assertEqual(
+            self.encoder.decode_public_keys(public), [Q for _, Q in keypairs]
+        )
+        self.assertEqual(
+            self.encoder.decode_private_keys(private), [d for d, _ in keypairs]
+        )
+        self.assertEqual(self.encoder.decode_public_keys([]), [])
+
+        # a point that isn't on its curve
+        invalid = bytearray(public[5])
+        invalid[-1] ^= 1
+        with self.assertRaisesRegex(InvalidDerKey, "index 5"):
+            self.encoder.decode_public_keys(public[:5] + [bytes(invalid)])
+
+        # the index among all the keys, not among the keys of the same curve
+        with self.assertRaisesRegex(InvalidDerKey, f"index {len(CURVES) + 5}"):
+            self.encoder.decode_public_keys(
+                public[: len(CURVES) + 5] + [bytes(invalid)]
+            )
+        with self.assertRaisesRegex(InvalidDerKey, "index 1"):
+            self.encoder.decode_private_keys([private[0], private[1][:-1]])
+
+    def test_invalid_keys(self):
+        invalid_public = (
+            b"",
+            OPENSSL_PUBLIC_KEY[:-1],
+            OPENSSL_PUBLIC_KEY + b"\x00",
+            OPENSSL_PUBLIC_KEY.replace(b"\x3d\x02\x01", b"\x3d\x02\x02"),
+            OPENSSL_PUBLIC_KEY.replace(b"\x42\x00\x04", b"\x42\x00\x05"),
+            OPENSSL_PUBLIC_KEY.replace(b"\x42\x00\x04", b"\x42\x01\x04"),
+            OPENSSL_PRIVATE_KEY,
+            OPENSSL_PUBLIC_KEY[:-1]
+            + bytes([OPENSSL_PUBLIC_KEY[-1] ^ 1]),  # not on the curve
+            # a compressed secp256k1 key with an x that no point has
+            b"\x30\x36"
+            + self.encoder.encode_public_key(secp256k1.G)[2:20]
+            + b"\x03\x22\x00\x02"
+            + (5).to_bytes(32, "big"),
+        )
+        for key in invalid_public:
+            with self.assertRaises(InvalidDerKey):
+                self.encoder.decode_public_key(key)
+
+        invalid_private = (
+            b"",
+            OPENSSL_PRIVATE_KEY[:-1],
+            OPENSSL_PRIVATE_KEY.replace(b"\x02\x01\x01", b"\x02\x01\x02", 1),
+            OPENSSL_PUBLIC_KEY,
+            OPENSSL_PRIVATE_KEY[:7] + bytes(32) + OPENSSL_PRIVATE_KEY[39:],
+            OPENSSL_PRIVATE_KEY[:7]
+            + P256.q.to_bytes(32, "big")
+            + OPENSSL_PRIVATE_KEY[39:],
+        )
+        for key in invalid_private:
+            with self.assertRaises(InvalidDerKey):
+                self.encoder.decode_private_key(key)
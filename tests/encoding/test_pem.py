@@ -0,0 +1,89 @@
+from mmap import ACCESS_READ, mmap
+from os import remove
+from threading import Thread
+from unittest import TestCase
+
+from .. import CURVES
+from fastecdsa.curve import P256, secp256k1
+from fastecdsa.encoding.pem import PEMEncoder, PEMEncoderError
+from fastecdsa.keys import gen_keypair
+
+TEST_FILE_PATH = "fastecdsa_test_bundle.pem"
+
+EC_PARAMETERS = (
+    b"-----BEGIN EC PARAMETERS-----\nBggqhkjOPQMBBw==\n-----END EC PARAMETERS-----\n"
+)
+
+
+class TestPEMEncoder(TestCase):
+    def setUp(self):
+        self.encoder = PEMEncoder()
+        self.keys = []
+        blocks = []
+        for i, curve in enumerate(CURVES * 2):
+            d, Q = gen_keypair(curve)
+            if i % 2:
+                self.keys.append(Q)
+                blocks.append(self.encoder.encode_public_key(Q) + b"\n")
+            else:
+                self.keys.append(d)
+                blocks.append(b"comment line\n" + EC_PARAMETERS)
+                blocks.append(self.encoder.encode_private_key(d, curve) + b"\r\n")
+        self.bundle = b"".join(blocks)
+
+    def test_public_key_curve_from_oid(self):
+        _, Q = gen_keypair(secp256k1)
+        encoded = self.encoder.encode_public_key(Q)
+        self.assertEqual(self.encoder.decode_public_key(encoded, P256), Q)
+
+    def test_iter_keys(self):
+        self.assertEqual(list(self.encoder.iter_keys(self.bundle)), self.keys)
+        self.assertEqual(
+            list(self.encoder.iter_keys(bytearray(self.bundle))), self.keys
+        )
+        self.assertEqual(list(self.encoder.iter_keys(b"")), [])
+
+    def test_iter_keys_from_file(self):
+        with open(TEST_FILE_PATH, "wb") as f:
+            f.write(self.bundle)
+        try:
+            self.assertEqual(list(self.encoder.iter_keys(TEST_FILE_PATH)), self.keys)
+            with open(TEST_FILE_PATH, "rb") as f:
+                self.assertEqual(list(self.encoder.iter_keys(f)), self.keys)
+            with (
+                open(TEST_FILE_PATH, "rb") as f,
+                mmap(f.fileno(), 0, access=ACCESS_READ) as m,
+            ):
+                self.assertEqual(list(self.encoder.iter_keys(m)), self.keys)
+        finally:
+            remove(TEST_FILE_PATH)
+
+    def test_iter_keys_is_lazy(self):
+        first = self.encoder.encode_public_key(self.keys[1])
+        keys = self.encoder.iter_keys(first + b"\n-----BEGIN PUBLIC KEY-----\nAAAA\n")
+        self.assertEqual(next(keys), self.keys[1])
+        with self.assertRaises(PEMEncoderError):
+            next(keys)
+
+    def test_iter_keys_errors(self):
+        truncated = self.encoder.encode_public_key(self.keys[1])[:-30]
+        with self.assertRaises(PEMEncoderError):
+            list(self.encoder.iter_keys(truncated))
+
+        invalid = b"-----BEGIN PUBLIC KEY-----\nA\n-----END PUBLIC KEY-----\n"
+        with self.assertRaises(PEMEncoderError):
+            list(self.encoder.iter_keys(invalid))
+
+    def test_shared_between_threads(self):
+        results = []
+
+        def decode():
+            results.append(list(self.encoder.iter_keys(self.bundle)))
+
+        threads = [Thread(target=decode) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [self.keys] * 4)
@@ -0,0 +1,76 @@
+from random import randint
+from unittest import TestCase
+
+from .. import CURVES
+from fastecdsa.curve import P256, P521
+from fastecdsa.ecdsa import sign, verify
+from fastecdsa.encoding.raw import InvalidRawSignature, RawSigEncoder
+from fastecdsa.keys import gen_keypair
+
+
+class TestRawSigEncoder(TestCase):
+    def test_encode_signature(self):
+        encoder = RawSigEncoder(P256)
+        self.assertEqual(encoder.width, 32)
+        self.assertEqual(
+            encoder.encode_signature(1, 2),
+            b"\x00" * 31 + b"\x01" + b"\x00" * 31 + b"\x02",
+        )
+        self.assertEqual(RawSigEncoder(P521).encode_signature(1, 2)[65], 1)
+
+        for r, s in ((-1, 1), (1, -1), (2**256, 1), (1, 2**256)):
+            with self.assertRaises(ValueError):
+                encoder.encode_signature(r, s)
+        with self.assertRaises(TypeError):
+            encoder.encode_signature(1.0, 2)
+
+    def test_decode_signature(self):
+        encoder = RawSigEncoder(P256)
+        data = bytes(range(64))
+        self.assertEqual(
+            encoder.decode_signature(data),
+            (int.from_bytes(data[:32], "big"), int.from_bytes(data[32:], "big")),
+        )
+        self.assertEqual(
+            encoder.decode_signature(bytearray(data)), encoder.decode_signature(data)
+        )
+        self.assertEqual(
+            encoder.decode_signature(memoryview(data)), encoder.decode_signature(data)
+        )
+
+        for bad in (b"", data[:63], data + b"\x00"):
+            with self.assertRaises(InvalidRawSignature):
+                encoder.decode_signature(bad)
+
+    def test_round_trip(self):
+        for curve in CURVES:
+            encoder = RawSigEncoder(curve)
+            d, Q = gen_keypair(curve)
+            sig = sign("message", d, curve=curve)
+            encoded = encoder.encode_signature(*sig)
+            self.assertEqual(len(encoded), 2 * curve.q_bytes)
+            self.assertEqual(encoder.decode_signature(encoded), sig)
+            self.assertTrue(
+                verify(encoder.decode_signature(encoded), "message", Q, curve)
+            )
+
+    def test_bulk(self):
+        encoder = RawSigEncoder(P256)
+        rs = [randint(0, P256.q - 1) for _ in range(50)]
+        ss = [randint(0, P256.q - 1) for _ in range(50)]
+
+        encoded = encoder.encode_signatures(rs, ss)
+        self.assertEqual(
+            encoded,
+            b"".join(encoder.encode_signature(r, s) for r, s in zip(rs, ss)),
+        )
+        self.assertEqual(encoder.decode_signatures(encoded), (rs, ss))
+        self.assertEqual(encoder.encode_signatures([], []), b"")
+        self.assertEqual(encoder.decode_signatures(b""), ([], []))
+
+        with self.assertRaises(ValueError):
+            encoder.encode_signatures(rs, ss[:-1])
+        with self.assertRaises(ValueError):
+            encoder.encode_signatures([1, -1], [1, 1])
+        with self.assertRaises(InvalidRawSignature):
+            encoder.decode_signatures(encoded[:-1])
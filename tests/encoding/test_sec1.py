@@ -1,7 +1,8 @@
 from binascii import hexlify, unhexlify
 from unittest import TestCase
 
-from fastecdsa.curve import P256, secp192k1, secp256k1
+from fastecdsa import curvemath
+from fastecdsa.curve import P224, P256, secp192k1, secp224k1, secp256k1
 from fastecdsa.encoding.sec1 import InvalidSEC1PublicKey, SEC1Encoder
 from fastecdsa.point import Point
 
@@ -142,3 +143,52 @@ class TestSEC1Encoder(TestCase):
             unhexlify(b"03a3bec5fba6d13e51fb55bd88dd097cb9b04f827bc151d22d"), secp192k1
         )
         self.assertEqual(public_from_compressed, expected_secp192k1)
+
+    def test_decode_public_key_not_on_curve(self):
+        # x = 5 is not the x coordinate of a point on secp256k1
+        with self.assertRaises(InvalidSEC1PublicKey):
+            self.encoder.decode_public_key(b"\x02" + (5).to_bytes(32, "big"), secp256k1)
+
+    def test_decode_public_keys(self):
+        # secp224k1's order is one byte longer than its field elements
+        for curve in (P256, P224, secp192k1, secp224k1, secp256k1):
+            points = [curve.G * d for d in range(1, 21)]
+            keys = [
+                self.encoder.encode_public_key(point, compressed=d % 2 == 0)
+                for d, point in enumerate(points)
+            ]
+            keys[1] = bytearray(keys[1])
+            keys[2] = memoryview(keys[2])
+
+            decoded = self.encoder.decode_public_keys(keys, curve)
+            self.assertEqual(decoded, points)
+            self.assertEqual(
+                decoded,
+                [self.encoder.decode_public_key(bytes(key), curve) for key in keys],
+            )
+
+        self.assertEqual(self.encoder.decode_public_keys([], P256), [])
+
+    def test_coordinates_are_sized_by_the_field(self):
+        key = self.encoder.encode_public_key(secp224k1.G, compressed=False)
+        self.assertEqual(len(key), 1 + 2 * secp224k1.p_bytes)
+        self.assertEqual(self.encoder.decode_public_key(key, secp224k1), secp224k1.G)
+
+    def test_decode_public_keys_invalid(self):
+        key = self.encoder.encode_public_key(secp256k1.G)
+        for invalid in (
+            b"\x02",  # invalid compressed length
+            b"\x05" + key[1:],  # invalid prefix value
+            b"\x02" + (5).to_bytes(32, "big"),  # not on the curve
+            b"\x04"
+            + (5).to_bytes(32, "big")
+            + (5).to_bytes(32, "big"),  # not on the curve
+        ):
+            with self.assertRaises(InvalidSEC1PublicKey) as e:
+                self.encoder.decode_public_keys([key, invalid], secp256k1)
+            self.assertIn("index 1", e.exception.args[0])
+
+            # the native decoder reports the position as an attribute
+            with self.assertRaises(ValueError) as e:
+                curvemath.decode_public_keys([key, key, invalid], secp256k1)
+            self.assertEqual(e.exception.index, 2)
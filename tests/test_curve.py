@@ -1,6 +1,9 @@
+import subprocess
+import sys
+from pickle import dumps, loads
 from unittest import TestCase
 
-from fastecdsa.curve import Curve
+from fastecdsa.curve import P256, P521, W25519, Curve, secp224k1, secp256k1
 
 
 class TestCurve(TestCase):
@@ -11,3 +14,68 @@ class TestCurve(TestCase):
         actual = str(curve)
 
         self.assertEqual(expected, actual)
+
+    def test_derived_lengths(self):
+        self.assertEqual((P256.p_bits, P256.p_bytes), (256, 32))
+        self.assertEqual((P521.q_bits, P521.q_bytes), (521, 66))
+        self.assertEqual((secp224k1.q_bits, secp224k1.q_bytes), (225, 29))
+
+    def test_cached_generator(self):
+        self.assertEqual(P256.G, P256.G)
+        self.assertEqual((P256.G.x, P256.G.y), (P256.gx, P256.gy))
+
+        # the generator is a new point every time, changing one doesn't change the curve
+        G = P256.G
+        with self.assertWarns(DeprecationWarning):
+            G.x = 0
+        self.assertEqual((P256.G.x, P256.G.y), (P256.gx, P256.gy))
+        self.assertEqual((2 * P256.G).x, (P256.G + P256.G).x)
+
+    def test_get_curve_by_name(self):
+        self.assertIs(Curve.get_curve_by_name("P256"), P256)
+        self.assertIs(Curve.get_curve_by_name("secp224k1"), secp224k1)
+        self.assertIsNone(Curve.get_curve_by_name("not a curve"))
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            P256.extra = 1
+
+    def test_pickle(self):
+        self.assertIs(loads(dumps(P256)), P256)
+        self.assertIs(loads(dumps(W25519)), W25519)
+
+        # a curve shadowed by a later one with the same name is rebuilt from its parameters
+        params = (W25519.p, W25519.a, W25519.b, W25519.q, W25519.gx, W25519.gy)
+        shadowed = Curve("shadowed", *params)
+        Curve("shadowed", *params)
+        unregistered = loads(dumps(shadowed))
+        self.assertEqual(unregistered.name, shadowed.name)
+        self.assertEqual(unregistered.p, W25519.p)
+        self.assertEqual(unregistered.G.x, W25519.gx)
+
+    def test_pickle_user_curve(self):
+        params = (P256.p, P256.a, P256.b, P256.q, P256.gx, P256.gy)
+        custom = Curve("custom", *params, b"\x2b\x06\x01\x04\x01\x00")
+        data = dumps(custom)
+
+        # the name and OID now belong to a different curve, which the pickle must not bind to
+        other = Curve(
+            "custom",
+            secp256k1.p,
+            secp256k1.a,
+            secp256k1.b,
+            secp256k1.q,
+            secp256k1.gx,
+            secp256k1.gy,
+            custom.oid,
+        )
+        restored = loads(data)
+        self.assertIsNot(restored, other)
+        self.assertEqual(restored._params(), custom._params())
+
+        # a fresh process doesn't know the curve
+        code = "import pickle, sys; print(pickle.loads(sys.stdin.buffer.read()).q)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], input=data, capture_output=True, check=True
+        )
+        self.assertEqual(int(result.stdout), P256.q)
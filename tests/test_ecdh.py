@@ -0,0 +1,158 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from . import CURVES
+from fastecdsa.curve import P256, W448, W25519, brainpoolP256r1, secp256k1
+from fastecdsa.curvemath import NativePoint, mul, mul_x, mul_x_many
+from fastecdsa.ecdh import EcdhError, shared_secret, shared_secrets
+from fastecdsa.keys import gen_keypair
+from fastecdsa.point import Point
+from fastecdsa.util import mod_sqrt
+
+
+class TestSharedSecret(TestCase):
+    def test_rfc5903_p256(self):
+        # https://tools.ietf.org/html/rfc5903#section-8.1
+        i = 0xC88F01F510D9AC3F70A292DAA2316DE544E9AAB8AFE84049C62A9C57862D1433
+        gr = Point(
+            0xD12DFB5289C8D4F81208B70270398C342296970A0BCCB74C736FC7554494BF63,
+            0x56FBF3CA366CC23E8157854C13C58D6AAC23F046ADA30F8353E74F33039872AB,
+            P256,
+        )
+        self.assertEqual(
+            shared_secret(i, gr, P256),
+            bytes.fromhex(
+                "D6840F6B42F6EDAFD13116E0E12565202FEF8E9ECE7DCE03812464D04B9442DE"
+            ),
+        )
+
+    def test_rfc7027_brainpool(self):
+        # https://tools.ietf.org/html/rfc7027#appendix-A.1
+        dA = 0x81DB1EE100150FF2EA338D708271BE38300CB54241D79950F77B063039804F1D
+        qB = Point(
+            0x8D2D688C6CF93E1160AD04CC4429117DC2C41825E1E9FCA0ADDD34E6F1B39F7B,
+            0x990C57520812BE512641E47034832106BC7D3E8DD0E4C7F1136D7006547CEC6A,
+            brainpoolP256r1,
+        )
+        self.assertEqual(
+            shared_secret(dA, qB, brainpoolP256r1),
+            bytes.fromhex(
+                "89AFC39D41D3B327814B80940B042590F96556EC91E6AE7939BCE31F3A18BF2B"
+            ),
+        )
+
+    def test_key_agreement(self):
+        for curve in CURVES:
+            dA, QA = gen_keypair(curve)
+            dB, QB = gen_keypair(curve)
+
+            secret = shared_secret(dA, QB, curve)
+            self.assertEqual(secret, shared_secret(dB, QA, curve))
+            self.assertEqual(len(secret), curve.p_bytes)
+            self.assertEqual(int.from_bytes(secret, "big"), (dA * QB).x)
+
+    def test_mul_x(self):
+        for curve in CURVES:
+            _, Q = gen_keypair(curve)
+            d = gen_keypair(curve)[0]
+            for k in (1, 2, d, curve.q - 1, curve.q + 1, 3 * curve.q + d, -d):
+                self.assertEqual(
+                    mul_x(Q.x, Q.y, k, curve), mul(Q.x, Q.y, abs(k), curve)[0]
+                )
+            with self.assertRaises(ValueError):
+                mul_x(Q.x, Q.y, curve.q, curve)
+
+        # x = 0 can't be the difference in the x only ladder
+        y = mod_sqrt(P256.b, P256.p)[0]
+        for k in (1, 2, P256.q - 1):
+            self.assertEqual(mul_x(0, y, k, P256), mul(0, y, k, P256)[0])
+
+    def test_invalid(self):
+        d, Q = gen_keypair(P256)
+
+        with self.assertRaises(EcdhError):
+            shared_secret(0, Q, P256)
+        with self.assertRaises(EcdhError):
+            shared_secret(P256.q, Q, P256)
+        with self.assertRaises(EcdhError):
+            shared_secret(d, Point._identity_element(), P256)
+        with self.assertRaises(EcdhError):
+            shared_secret(d, secp256k1.G, P256)
+
+
+class TestSharedSecrets(TestCase):
+    def test_shared_secrets(self):
+        for curve in CURVES:
+            d, _ = gen_keypair(curve)
+            peers = [gen_keypair(curve)[1] for _ in range(5)]
+            expected = [shared_secret(d, Q, curve) for Q in peers]
+
+            self.assertEqual(shared_secrets(d, peers, curve), expected)
+            self.assertEqual(
+                shared_secrets(d, peers, curve, contiguous=True), b"".join(expected)
+            )
+
+    def test_shared_secrets_chunks(self):
+        # more peers than are multiplied in one native pass, and small scalars
+        peers = [gen_keypair(secp256k1)[1] for _ in range(300)]
+        for d in (1, 2, 15, 16, 17, secp256k1.q - 1):
+            secrets = shared_secrets(d, peers, secp256k1)
+            self.assertEqual(len(secrets), 300)
+            self.assertEqual(secrets[0], shared_secret(d, peers[0], secp256k1))
+            self.assertEqual(secrets[-1], shared_secret(d, peers[-1], secp256k1))
+
+        self.assertEqual(shared_secrets(1, [], secp256k1), [])
+
+    def test_shared_secrets_cofactor(self):
+        # peers outside the subgroup of order q, which the recoding of the scalar must not assume
+        for curve in (W25519, W448):
+            # q * P for a point P outside the subgroup, curvemath.mul doesn't reduce the scalar
+            torsion, x = (0, 0), 1
+            while torsion == (0, 0):
+                x += 1
+                y2 = (x**3 + curve.a * x + curve.b) % curve.p
+                if y2 != 0 and pow(y2, (curve.p - 1) // 2, curve.p) == 1:
+                    torsion = mul(x, mod_sqrt(y2, curve.p)[0], curve.q, curve)
+            torsion = Point(*torsion, curve)
+
+            peers = [curve.G + torsion, gen_keypair(curve)[1] + torsion]
+            for d in (3, 4, gen_keypair(curve)[0], curve.q - 1):
+                expected = [shared_secret(d, Q, curve) for Q in peers]
+                self.assertEqual(shared_secrets(d, peers, curve), expected)
+
+            # the torsion point itself, whose products are the identity for some scalars
+            for d in range(1, 9):
+                try:
+                    expected = shared_secret(d, torsion, curve)
+                except EcdhError:
+                    with self.assertRaises(EcdhError):
+                        shared_secrets(d, [torsion], curve)
+                else:
+                    self.assertEqual(shared_secrets(d, [torsion], curve), [expected])
+
+    def test_shared_secrets_invalid(self):
+        d, Q = gen_keypair(P256)
+
+        with self.assertRaises(EcdhError):
+            shared_secrets(0, [Q], P256)
+        with self.assertRaisesRegex(EcdhError, "index 1"):
+            shared_secrets(d, [Q, Point._identity_element()], P256)
+        with self.assertRaises(EcdhError):
+            shared_secrets(d, [Q, secp256k1.G], P256)
+
+    def test_shared_secrets_invalid_curve(self):
+        d, Q = gen_keypair(P256)
+
+        # a point whose coordinates were changed after it was validated
+        off_curve = Point(Q.x, Q.y, P256)
+        with self.assertWarns(DeprecationWarning):
+            off_curve.x = 5
+        with self.assertRaisesRegex(EcdhError, "index 1 is not on the curve"):
+            shared_secrets(d, [Q, off_curve], P256)
+        with self.assertRaisesRegex(EcdhError, "index 0 is not on the curve"):
+            shared_secrets(d, [NativePoint(5, 7, P256)], P256)
+
+        with self.assertRaises(TypeError):
+            shared_secrets(d, [SimpleNamespace(x=5, y=7)], P256)
+        with self.assertRaises(TypeError):
+            mul_x_many([SimpleNamespace(x=5, y=7)], d, P256)
@@ -0,0 +1,112 @@
+import os
+import threading
+from unittest import TestCase, skipUnless
+
+from fastecdsa.curve import P256
+from fastecdsa.entropy import BufferedRandom, _after_fork_in_child
+from fastecdsa.keys import gen_private_key
+
+
+class CountingSource:
+    def __init__(self) -> None:
+        self.calls = []
+        self.counter = 0
+
+    def __call__(self, n: int) -> bytes:
+        self.calls.append(n)
+        result = bytes((self.counter + i) % 256 for i in range(n))
+        self.counter += n
+        return result
+
+
+class TestBufferedRandom(TestCase):
+    def test_reads_in_blocks(self):
+        source = CountingSource()
+        random = BufferedRandom(block_size=64, source=source)
+
+        chunks = [random(10) for _ in range(13)]
+        self.assertEqual(source.calls, [64, 64, 64])
+        self.assertEqual(b"".join(chunks), bytes(range(130)))
+
+    def test_large_requests_bypass_the_buffer(self):
+        source = CountingSource()
+        random = BufferedRandom(block_size=64, source=source)
+
+        self.assertEqual(len(random(64)), 64)
+        self.assertEqual(len(random(1000)), 1000)
+        self.assertEqual(source.calls, [64, 1000])
+        self.assertEqual(random(0), b"")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            BufferedRandom(block_size=0)
+        with self.assertRaises(ValueError):
+            BufferedRandom()(-1)
+
+    def test_private_keys(self):
+        calls = []
+
+        def source(n: int) -> bytes:
+            calls.append(n)
+            return os.urandom(n)
+
+        random = BufferedRandom(block_size=64 * 1024, source=source)
+        keys = {gen_private_key(P256, random) for _ in range(100)}
+        self.assertEqual(len(keys), 100)
+        self.assertEqual(calls, [64 * 1024])
+
+    def test_threads_never_share_bytes(self):
+        random = BufferedRandom(block_size=256)
+        results = []
+
+        def draw():
+            results.extend(random(16) for _ in range(200))
+
+        threads = [threading.Thread(target=draw) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(results)), 800)
+
+    def test_served_bytes_are_wiped(self):
+        random = BufferedRandom(block_size=64, source=CountingSource())
+        self.assertEqual(random(10), bytes(range(10)))
+        self.assertEqual(random._buffer[:10].tobytes(), bytes(10))
+
+        old = random._buffer
+        self.assertEqual(random(60), bytes(range(10, 70)))
+        self.assertEqual(old.tobytes(), bytes(64))
+
+    def test_after_fork_discards_the_buffer(self):
+        # the reset the child runs, called in this process so that it is measured
+        source = CountingSource()
+        random = BufferedRandom(block_size=64, source=source)
+        random(10)
+
+        old = random._buffer
+        _after_fork_in_child()
+        self.assertEqual(old.tobytes(), bytes(64))
+        self.assertEqual(random(10), bytes(range(64, 74)))
+        self.assertEqual(source.calls, [64, 64])
+
+    @skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork_discards_the_buffer(self):
+        random = BufferedRandom(block_size=1024)
+        random(1)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+            os.write(write_fd, random(32))
+            os._exit(0)
+
+        os.close(write_fd)
+        child_bytes = os.read(read_fd, 32)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        self.assertEqual(len(child_bytes), 32)
+        self.assertNotEqual(child_bytes, random(32))
@@ -0,0 +1,263 @@
+import hmac
+from unittest import TestCase
+from unittest.mock import patch
+
+from fastecdsa import hd
+from fastecdsa.curve import P256, secp256k1
+from fastecdsa.hd import HARDENED, HDError, HDKey, NodeCache, parse_path
+
+# https://github.com/bitcoin/bips/blob/master/bip-0032.mediawiki#test-vector-1
+SEED_1 = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+VECTOR_1 = [
+    (
+        "m",
+        "xpub661MyMwAqRbcFtXgS5sYJABqqG9YLmC4Q1Rdap9gSE8NqtwybGhePY2gZ29ESFjqJoCu1Rupje8YtGqsefD265TMg7"
+        "usUDFdp6W1EGMcet8",
+        "xprv9s21ZrQH143K3QTDL4LXw2F7HEK3wJUD2nW2nRk4stbPy6cq3jPPqjiChkVvvNKmPGJxWUtg6LnF5kejMRNNU3TGtR"
+        "BeJgk33yuGBxrMPHi",
+    ),
+    (
+        "m/0H",
+        "xpub68Gmy5EdvgibQVfPdqkBBCHxA5htiqg55crXYuXoQRKfDBFA1WEjWgP6LHhwBZeNK1VTsfTFUHCdrfp1bgwQ9xv5sk"
+        "i8PX9rL2dZXvgGDnw",
+        "xprv9uHRZZhk6KAJC1avXpDAp4MDc3sQKNxDiPvvkX8Br5ngLNv1TxvUxt4cV1rGL5hj6KCesnDYUhd7oWgT11eZG7XnxH"
+        "rnYeSvkzY7d2bhkJ7",
+    ),
+    (
+        "m/0H/1",
+        "xpub6ASuArnXKPbfEwhqN6e3mwBcDTgzisQN1wXN9BJcM47sSikHjJf3UFHKkNAWbWMiGj7Wf5uMash7SyYq527Hqck2Ax"
+        "YysAA7xmALppuCkwQ",
+        "xprv9wTYmMFdV23N2TdNG573QoEsfRrWKQgWeibmLntzniatZvR9BmLnvSxqu53Kw1UmYPxLgboyZQaXwTCg8MSY3H2EU4"
+        "pWcQDnRnrVA1xe8fs",
+    ),
+    (
+        "m/0H/1/2H",
+        "xpub6D4BDPcP2GT577Vvch3R8wDkScZWzQzMMUm3PWbmWvVJrZwQY4VUNgqFJPMM3No2dFDFGTsxxpG5uJh7n7epu4trkr"
+        "X7x7DogT5Uv6fcLW5",
+        "xprv9z4pot5VBttmtdRTWfWQmoH1taj2axGVzFqSb8C9xaxKymcFzXBDptWmT7FwuEzG3ryjH4ktypQSAewRiNMjANTtpg"
+        "P4mLTj34bhnZX7UiM",
+    ),
+    (
+        "m/0H/1/2H/2",
+        "xpub6FHa3pjLCk84BayeJxFW2SP4XRrFd1JYnxeLeU8EqN3vDfZmbqBqaGJAyiLjTAwm6ZLRQUMv1ZACTj37sR62cfN7fe"
+        "5JnJ7dh8zL4fiyLHV",
+        "xprvA2JDeKCSNNZky6uBCviVfJSKyQ1mDYahRjijr5idH2WwLsEd4Hsb2Tyh8RfQMuPh7f7RtyzTtdrbdqqsunu5Mm3wDv"
+        "UAKRHSC34sJ7in334",
+    ),
+    (
+        "m/0H/1/2H/2/1000000000",
+        "xpub6H1LXWLaKsWFhvm6RVpEL9P4KfRZSW7abD2ttkWP3SSQvnyA8FSVqNTEcYFgJS2UaFcxupHiYkro49S8yGasTvXEYB"
+        "VPamhGW6cFJodrTHy",
+        "xprvA41z7zogVVwxVSgdKUHDy1SKmdb533PjDz7J6N6mV6uS3ze1ai8FHa8kmHScGpWmj4WggLyQjgPie1rFSruoUihUZR"
+        "EPSL39UNdE3BBDu76",
+    ),
+]
+
+
+class TestHDKey(TestCase):
+    def test_vector_1(self):
+        master = HDKey.from_seed(SEED_1, cache=NodeCache())
+        for path, xpub, xprv in VECTOR_1:
+            node = master.derive(path)
+            self.assertEqual(node.serialize(), xprv)
+            self.assertEqual(node.neuter().serialize(), xpub)
+
+    def test_deserialize(self):
+        for _, xpub, xprv in VECTOR_1:
+            private = HDKey.deserialize(xprv)
+            public = HDKey.deserialize(xpub)
+            self.assertTrue(private.is_private)
+            self.assertFalse(public.is_private)
+            self.assertEqual(private.Q, public.Q)
+            self.assertEqual(private.serialize(), xprv)
+            self.assertEqual(public.serialize(), xpub)
+            self.assertEqual(private.parent_fingerprint, public.parent_fingerprint)
+
+        testnet = HDKey.deserialize(VECTOR_1[1][2]).serialize(testnet=True)
+        self.assertTrue(testnet.startswith("tprv"))
+        self.assertEqual(HDKey.deserialize(testnet).serialize(), VECTOR_1[1][2])
+
+    def test_invalid_serializations(self):
+        xprv = VECTOR_1[0][2]
+        for encoded in (xprv[:-1] + "j", xprv[:-2], "0" + xprv[1:]):
+            with self.assertRaises(HDError):
+                HDKey.deserialize(encoded)
+
+    def test_public_derivation(self):
+        master = HDKey.from_seed(SEED_1, cache=NodeCache())
+        node = master.derive("m/0H/1")
+        public = HDKey.deserialize(VECTOR_1[1][1])
+        self.assertEqual(public.child(1).serialize(), node.neuter().serialize())
+        self.assertEqual(public.derive("1").Q, node.d * secp256k1.G)
+
+        with self.assertRaises(HDError):
+            public.child(HARDENED)
+
+    def test_children(self):
+        master = HDKey.from_seed(SEED_1, cache=NodeCache(0))
+        account = master.derive("m/0H/1")
+
+        children = account.children(0, 20)
+        self.assertEqual(
+            [child.serialize() for child in children],
+            [account.child(i).serialize() for i in range(20)],
+        )
+
+        public_children = account.neuter().children(0, 20)
+        self.assertEqual(
+            [child.serialize() for child in public_children],
+            [child.neuter().serialize() for child in children],
+        )
+
+        hardened = master.children(HARDENED, HARDENED + 3)
+        self.assertEqual(hardened[0].serialize(), VECTOR_1[1][2])
+        self.assertEqual(master.children(5, 5), [])
+
+        for start, stop in (
+            (-1, 2),
+            (3, 2),
+            (HARDENED - 1, HARDENED + 1),
+            (0, 2**32 + 1),
+        ):
+            with self.assertRaises(HDError):
+                account.children(start, stop)
+        with self.assertRaises(HDError):
+            account.neuter().children(HARDENED, HARDENED + 1)
+
+    def test_node_cache(self):
+        cache = NodeCache(maxsize=3)
+        master = HDKey.from_seed(SEED_1, cache=cache)
+
+        leaf = master.derive("m/0H/1/2H")
+        self.assertEqual(len(cache), 3)
+        self.assertIs(master.derive("m/0H/1/2H"), leaf)
+
+        # m/0H/1/2H/2 evicts m/0H, the least recently used node
+        master.derive("m/0H/1/2H/2")
+        self.assertEqual(len(cache), 3)
+        self.assertIsNot(master.child(HARDENED), leaf)
+        self.assertEqual(master.derive("m/0H/1/2H/2").serialize(), VECTOR_1[4][2])
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+        uncached = NodeCache(0)
+        master = HDKey.from_seed(SEED_1, cache=uncached)
+        master.derive("m/0H/1")
+        self.assertEqual(len(uncached), 0)
+
+        with self.assertRaises(ValueError):
+            NodeCache(-1)
+
+    def test_caching_is_opt_in(self):
+        master = HDKey.from_seed(SEED_1)
+        self.assertIsNone(master.cache)
+        node = master.derive("m/0H/1")
+        self.assertIsNone(node.cache)
+        self.assertIsNot(master.derive("m/0H/1"), node)
+        self.assertEqual(master.derive("m/0H/1").serialize(), VECTOR_1[2][2])
+
+        # nodes derived from a root share its cache
+        cache = NodeCache()
+        master = HDKey.deserialize(VECTOR_1[0][2], cache=cache)
+        node = master.derive("m/0H/1")
+        self.assertIs(node.cache, cache)
+        self.assertIs(node.neuter().cache, cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_parse_path(self):
+        self.assertEqual(parse_path("m"), [])
+        self.assertEqual(
+            parse_path("m/44'/0h/0H/1/2"), [HARDENED + 44, HARDENED, HARDENED, 1, 2]
+        )
+        self.assertEqual(parse_path("0/1"), [0, 1])
+        for path in ("m/", "m/x", "m/1//2", "m/2147483648", "m/-1"):
+            with self.assertRaises(HDError):
+                parse_path(path)
+
+    def test_invalid_keys(self):
+        with self.assertRaises(HDError):
+            HDKey.from_seed(b"\x00" * 15)
+        with self.assertRaises(HDError):
+            HDKey(b"\x00" * 31, d=1)
+        with self.assertRaises(HDError):
+            HDKey(b"\x00" * 32)
+        with self.assertRaises(HDError):
+            HDKey(b"\x00" * 32, d=secp256k1.q)
+        with self.assertRaises(HDError):
+            HDKey.from_seed(SEED_1).child(2**32)
+
+        chain_code = b"\x00" * 32
+        for kwargs in (
+            {"Q": P256.G},
+            {"Q": secp256k1.G * 0},
+            {"d": 1, "depth": 256},
+            {"d": 1, "child_number": 2**32},
+            {"d": 1, "parent_fingerprint": b"\x00" * 3},
+        ):
+            with self.assertRaises(HDError):
+                HDKey(chain_code, **kwargs)
+
+    def test_fingerprints(self):
+        master = HDKey.from_seed(SEED_1)
+        child = master.child(HARDENED)
+        self.assertEqual(master.fingerprint, master.identifier[:4])
+        self.assertEqual(child.parent_fingerprint, master.fingerprint)
+        self.assertEqual(master.fingerprint.hex(), "3442193e")
+        self.assertEqual(repr(master), "<HDKey private depth=0 child_number=0>")
+        self.assertEqual(
+            repr(child.neuter()), f"<HDKey public depth=1 child_number={HARDENED}>"
+        )
+
+    def test_hash160_without_ripemd160(self):
+        with patch.object(hd.hashlib, "new", side_effect=ValueError):
+            with self.assertRaises(HDError):
+                HDKey.from_seed(SEED_1).fingerprint
+
+    def test_invalid_derivations(self):
+        # the derivations are fixed to give a tweak of at least q, or one that cancels the key
+        master = HDKey.from_seed(SEED_1)
+        public = master.neuter()
+        chain_code = b"\x00" * 32
+        too_large = secp256k1.q.to_bytes(32, "big") + chain_code
+        cancels = (secp256k1.q - master.d).to_bytes(32, "big") + chain_code
+
+        with patch.object(hd.hmac, "digest", return_value=b"\xff" * 64):
+            with self.assertRaises(HDError):
+                HDKey.from_seed(SEED_1)
+
+        with patch.object(hd.hmac, "digest", return_value=too_large):
+            for node in (master, public):
+                with self.assertRaises(HDError):
+                    node.child(0)
+                with self.assertRaises(HDError):
+                    node.children(0, 2)
+
+        with patch.object(hd.hmac, "digest", return_value=cancels):
+            for node in (master, public):
+                with self.assertRaises(HDError):
+                    node.child(0)
+            with self.assertRaises(HDError):
+                public.children(0, 2)
+
+        # the patch didn't leak, derivation works again
+        self.assertEqual(master.child(HARDENED).serialize(), VECTOR_1[1][2])
+        self.assertIs(hd.hmac.digest, hmac.digest)
+
+    def test_deserialize_errors(self):
+        xprv = HDKey.deserialize(VECTOR_1[1][2])
+        xpub = xprv.neuter()
+        valid_private = hd._base58check_decode(xprv.serialize())
+        valid_public = hd._base58check_decode(xpub.serialize())
+
+        invalid = [
+            valid_private[:-1],  # too short
+            b"\x01\x02\x03\x04" + valid_private[4:],  # unknown version
+            valid_private[:4] + b"\x00" + valid_private[5:],  # master with a parent
+            valid_private[:45] + b"\x01" + valid_private[46:],  # private key prefix
+            valid_public[:45] + b"\x04" + valid_public[46:],  # uncompressed public key
+            valid_public[:45] + b"\x02" + (5).to_bytes(32, "big"),  # not on the curve
+        ]
+        for data in invalid:
+            with self.assertRaises(HDError):
+                HDKey.deserialize(hd._base58check_encode(data))
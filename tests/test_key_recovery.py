@@ -1,9 +1,24 @@
-from hashlib import sha256
+from hashlib import sha256, sha384
 from unittest import TestCase
 
 from . import CURVES
+from fastecdsa.curve import P256, secp256k1
 from fastecdsa.ecdsa import sign
-from fastecdsa.keys import gen_keypair, get_public_keys_from_sig
+from fastecdsa.keys import (
+    gen_keypair,
+    get_public_keys_from_sig,
+    recover_public_key,
+    recover_public_keys_batch,
+)
+
+
+def _recovery_id(sig, digest, Q, curve, hashfunc):
+    for recovery_id in range(4):
+        try:
+            if recover_public_key(sig, digest, recovery_id, curve, hashfunc, True) == Q:
+                return recovery_id
+        except ValueError:
+            pass
 
 
 class TestKeyRecovery(TestCase):
@@ -18,3 +33,113 @@ class TestKeyRecovery(TestCase):
 
             Qs = get_public_keys_from_sig(sig, msg, curve=curve, hashfunc=sha256)
             self.assertTrue(Q in Qs)
+
+    def test_key_recovery_order(self):
+        # the candidates are ordered by recovery id
+        for curve in (P256, secp256k1):
+            d, Q = gen_keypair(curve)
+            sig = sign("recovery order", d, curve=curve)
+            Qs = get_public_keys_from_sig(
+                sig, "recovery order", curve=curve, hashfunc=sha256
+            )
+            for recovery_id in (0, 1):
+                self.assertEqual(
+                    recover_public_key(sig, "recovery order", recovery_id, curve),
+                    Qs[recovery_id],
+                )
+
+    def test_recover_public_key(self):
+        for curve in CURVES:
+            d, Q = gen_keypair(curve)
+            msg = b"recover a single key"
+            sig = sign(msg, d, curve=curve, hashfunc=sha384)
+
+            recovered = [
+                recover_public_key(sig, msg, recovery_id, curve, hashfunc=sha384)
+                for recovery_id in (0, 1)
+            ]
+            self.assertIn(Q, recovered)
+            self.assertNotEqual(recovered[0], recovered[1])
+
+            prehashed = recover_public_key(
+                sig,
+                sha384(msg).digest(),
+                recovered.index(Q),
+                curve,
+                hashfunc=sha384,
+                prehashed=True,
+            )
+            self.assertEqual(prehashed, Q)
+
+    def test_recover_public_key_invalid(self):
+        d, Q = gen_keypair(P256)
+        r, s = sign("invalid", d, curve=P256)
+
+        with self.assertRaises(ValueError):
+            recover_public_key((r, s), "invalid", 4, P256)
+        with self.assertRaises(ValueError):
+            recover_public_key((r, s), "invalid", -1, P256)
+        with self.assertRaises(ValueError):
+            recover_public_key((0, s), "invalid", 0, P256)
+        with self.assertRaises(ValueError):
+            recover_public_key((r, P256.q), "invalid", 0, P256)
+        with self.assertRaises(ValueError):
+            get_public_keys_from_sig((r, 0), "invalid", P256, sha256)
+
+        # r + n is larger than p on P256, so there is no R for recovery ids 2 and 3
+        with self.assertRaises(ValueError):
+            recover_public_key((r, s), "invalid", 2, P256)
+
+    def test_recover_public_keys_batch(self):
+        for curve in CURVES:
+            sigs, digests, recovery_ids, expected = [], [], [], []
+            for i in range(4):
+                d, Q = gen_keypair(curve)
+                digest = sha384(str(i).encode()).digest()
+                sig = sign(digest, d, curve=curve, hashfunc=sha384, prehashed=True)
+                recovery_id = _recovery_id(sig, digest, Q, curve, sha384)
+
+                sigs.append(sig)
+                digests.append(digest)
+                recovery_ids.append(recovery_id)
+                expected.append(Q)
+
+            keys = recover_public_keys_batch(sigs, digests, recovery_ids, curve)
+            self.assertEqual(len(keys), 4)
+            self.assertEqual(list(keys), expected)
+            self.assertEqual(keys[-1], expected[-1])
+            self.assertEqual(list(keys[1::2]), expected[1::2])
+
+    def test_recover_public_keys_batch_chunks(self):
+        # more signatures than are recovered in one native pass
+        sigs, digests, recovery_ids, expected = [], [], [], []
+        for i in range(300):
+            d, Q = gen_keypair(secp256k1)
+            digest = sha256(i.to_bytes(2, "big")).digest()
+            sig = sign(digest, d, curve=secp256k1, prehashed=True)
+            recovery_id = _recovery_id(sig, digest, Q, secp256k1, sha256)
+
+            sigs.append(sig)
+            digests.append(digest)
+            recovery_ids.append(recovery_id)
+            expected.append(Q)
+
+        keys = recover_public_keys_batch(sigs, digests, recovery_ids, secp256k1)
+        self.assertEqual(list(keys), expected)
+        self.assertEqual(len(recover_public_keys_batch([], [], [], secp256k1)), 0)
+
+    def test_recover_public_keys_batch_invalid(self):
+        d, Q = gen_keypair(P256)
+        digest = sha256(b"invalid").digest()
+        r, s = sign(digest, d, curve=P256, prehashed=True)
+
+        with self.assertRaisesRegex(ValueError, "index 1"):
+            recover_public_keys_batch([(r, s), (0, s)], [digest] * 2, [0, 0], P256)
+        with self.assertRaisesRegex(ValueError, "index 0"):
+            recover_public_keys_batch([(r, s)], [digest], [2], P256)
+        with self.assertRaises(ValueError):
+            recover_public_keys_batch([(r, s)], [digest], [4], P256)
+        with self.assertRaises(ValueError):
+            recover_public_keys_batch([(r, s)], [digest] * 2, [0], P256)
+        with self.assertRaises(TypeError):
+            recover_public_keys_batch([(r, s)], ["digest"], [0], P256)
@@ -1,7 +1,8 @@
 from unittest import TestCase
 
-from fastecdsa.curve import Curve
-from fastecdsa.keys import gen_private_key
+from fastecdsa.curve import Curve, P256, P521, secp256k1, W25519
+from fastecdsa.keys import gen_keypairs, gen_private_key
+from fastecdsa.point import PointArray
 
 
 class TestKeygen(TestCase):
@@ -46,3 +47,37 @@ class TestKeygen(TestCase):
             gen_private_key(FakeCurve(8191), randfunc=FakeRandom(b"\xff\xf8\xff\xef")),
             8189,
         )
+
+    def test_gen_keypairs(self) -> None:
+        for curve in (P256, P521, secp256k1, W25519):
+            keypairs = gen_keypairs(300, curve)
+            self.assertEqual(len(keypairs), 300)
+            self.assertEqual(len({d for d, _ in keypairs}), 300)
+            for d, Q in keypairs:
+                self.assertTrue(1 <= d < curve.q)
+                self.assertEqual(Q, d * curve.G)
+
+    def test_gen_keypairs_contiguous(self) -> None:
+        private_keys, public_keys = gen_keypairs(10, P256, contiguous=True)
+        self.assertIsInstance(public_keys, PointArray)
+        self.assertEqual(len(public_keys), 10)
+        self.assertEqual(list(public_keys), [d * P256.G for d in private_keys])
+
+        self.assertEqual(gen_keypairs(0, P256), [])
+        with self.assertRaises(ValueError):
+            gen_keypairs(-1, P256)
+
+    def test_gen_keypairs_rejection_sampling(self) -> None:
+        # the first key drawn is the order and is rejected, the missing key is drawn again
+        order = P256.q.to_bytes(32, "big")
+        values = order + (1).to_bytes(32, "big") + (2).to_bytes(32, "big")
+        calls = []
+
+        def randfunc(n: int) -> bytes:
+            calls.append(n)
+            start = sum(calls[:-1])
+            return values[start : start + n]
+
+        keypairs = gen_keypairs(2, P256, randfunc=randfunc)
+        self.assertEqual(calls, [64, 32])
+        self.assertEqual(keypairs, [(1, P256.G), (2, 2 * P256.G)])
@@ -0,0 +1,179 @@
+from unittest import TestCase
+
+from fastecdsa.curve import P256, W25519, W448
+from fastecdsa.ecdh import shared_secret
+from fastecdsa.keys import gen_keypair
+from fastecdsa.montgomery import Curve25519, Curve448, MontgomeryCurve, x25519, x448
+
+
+class TestX25519(TestCase):
+    def test_rfc7748_vectors(self):
+        # https://tools.ietf.org/html/rfc7748#section-5.2
+        self.assertEqual(
+            x25519(
+                bytes.fromhex(
+                    "a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4"
+                ),
+                bytes.fromhex(
+                    "e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c"
+                ),
+            ),
+            bytes.fromhex(
+                "c3da55379de9c6908e94ea4df28d084f32eccf03491c71f754b4075577a28552"
+            ),
+        )
+
+        # the top bit of the u coordinate is ignored
+        self.assertEqual(
+            x25519(
+                bytes.fromhex(
+                    "4b66e9d4d1b4673c5ad22691957d6af5c11b6421e0ea01d42ca4169e7918ba0d"
+                ),
+                bytes.fromhex(
+                    "e5210f12786811d3f4b7959d0538ae2c31dbe7106fc03c3efc4cd549c715a493"
+                ),
+            ),
+            bytes.fromhex(
+                "95cbde9476e8907d7aade45cb4b873f88b595a68799fa152e6f8f7647aac7957"
+            ),
+        )
+
+    def test_rfc7748_iterations(self):
+        k = u = Curve25519.encode_u(9)
+        for i in range(1000):
+            k, u = x25519(k, u), k
+            if i == 0:
+                self.assertEqual(
+                    k.hex(),
+                    "422c8e7a6227d7bca1350b3e2bb7279f7897b87bb6854b783c60e80311ae3079",
+                )
+        self.assertEqual(
+            k.hex(), "684cf59ba83309552800ef566f2f4d3c1c3887c49360e3875f2eb94d99532c51"
+        )
+
+    def test_rfc7748_diffie_hellman(self):
+        # https://tools.ietf.org/html/rfc7748#section-6.1
+        a = bytes.fromhex(
+            "77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a"
+        )
+        b = bytes.fromhex(
+            "5dab087e624a8a4b79e17f8b83800ee66f3bb1292618b6fd1c2f8b27ff88e0eb"
+        )
+        A = Curve25519.public_key(a)
+        B = Curve25519.public_key(b)
+
+        self.assertEqual(
+            A.hex(), "8520f0098930a754748b7ddcb43ef75a0dbf3a0d26381af4eba4a98eaa9b4e6a"
+        )
+        self.assertEqual(
+            B.hex(), "de9edb7d7b7dc1b4d35b61c2ece435373f8343c85b78674dadfc7e146f882b4f"
+        )
+        self.assertEqual(x25519(a, B), x25519(b, A))
+        self.assertEqual(
+            x25519(a, B).hex(),
+            "4a5d9d5ba4ce2de1728e3bf480350f25e07e21c947d19e3376f09b3c1e161742",
+        )
+
+    def test_invalid_lengths(self):
+        with self.assertRaises(ValueError):
+            x25519(b"\x01" * 31, Curve25519.encode_u(9))
+        with self.assertRaises(ValueError):
+            x25519(b"\x01" * 32, b"\x09" * 33)
+
+
+class TestX448(TestCase):
+    def test_rfc7748_vectors(self):
+        # https://tools.ietf.org/html/rfc7748#section-5.2
+        self.assertEqual(
+            x448(
+                bytes.fromhex(
+                    "3d262fddf9ec8e88495266fea19a34d28882acef045104d0d1aae121700a779c"
+                    "984c24f8cdd78fbff44943eba368f54b29259a4f1c600ad3"
+                ),
+                bytes.fromhex(
+                    "06fce640fa3487bfda5f6cf2d5263f8aad88334cbd07437f020f08f9814dc031"
+                    "ddbdc38c19c6da2583fa5429db94ada18aa7a7fb4ef8a086"
+                ),
+            ),
+            bytes.fromhex(
+                "ce3e4ff95a60dc6697da1db1d85e6afbdf79b50a2412d7546d5f239fe14fbaad"
+                "eb445fc66a01b0779d98223961111e21766282f73dd96b6f"
+            ),
+        )
+
+    def test_rfc7748_iterations(self):
+        k = u = Curve448.encode_u(5)
+        for i in range(1000):
+            k, u = x448(k, u), k
+            if i == 0:
+                self.assertEqual(
+                    k.hex(),
+                    "3f482c8a9f19b01e6c46ee9711d9dc14fd4bf67af30765c2ae2b846a4d23a8cd"
+                    "0db897086239492caf350b51f833868b9bc2b3bca9cf4113",
+                )
+        self.assertEqual(
+            k.hex(),
+            "aa3b4749d55b9daf1e5b00288826c467274ce3ebbdd5c17b975e09d4af6c67cf"
+            "10d087202db88286e2b79fceea3ec353ef54faa26e219f38",
+        )
+
+    def test_rfc7748_diffie_hellman(self):
+        # https://tools.ietf.org/html/rfc7748#section-6.2
+        a = bytes.fromhex(
+            "9a8f4925d1519f5775cf46b04b5800d4ee9ee8bae8bc5565d498c28dd9c9baf5"
+            "74a9419744897391006382a6f127ab1d9ac2d8c0a598726b"
+        )
+        b = bytes.fromhex(
+            "1c306a7ac2a0e2e0990b294470cba339e6453772b075811d8fad0d1d6927c120"
+            "bb5ee8972b0d3e21374c9c921b09d1b0366f10b65173992d"
+        )
+        A = Curve448.public_key(a)
+        B = Curve448.public_key(b)
+
+        self.assertEqual(
+            A.hex(),
+            "9b08f7cc31b7e3e67d22d5aea121074a273bd2b83de09c63faa73d2c22c5d9bb"
+            "c836647241d953d40c5b12da88120d53177f80e532c41fa0",
+        )
+        self.assertEqual(
+            B.hex(),
+            "3eb7a829b0cd20f5bcfc0b599b6feccf6da4627107bdb0d4f345b43027d8b972"
+            "fc3e34fb4232a13ca706dcb57aec3dae07bdc1c67bf33609",
+        )
+        self.assertEqual(
+            x448(a, B).hex(),
+            "07fff4181ac6cc95ec1c16a94a0f74d12da232ce40a77552281d282bb60c0b56"
+            "fd2464c335543936521c24403085d59a449a5037514a879d",
+        )
+
+
+class TestMontgomeryCurve(TestCase):
+    def test_weierstrass_mapping(self):
+        for curve in (Curve25519, Curve448):
+            G = curve.weierstrass.G
+            self.assertEqual(curve.from_point(G), curve.base_u)
+            self.assertIn(
+                G, (curve.to_point(curve.base_u), -curve.to_point(curve.base_u))
+            )
+            self.assertIs(MontgomeryCurve.from_weierstrass(curve.weierstrass), curve)
+
+            d, Q = gen_keypair(curve.weierstrass)
+            self.assertEqual(curve.mul_u(d, curve.base_u), curve.from_point(Q))
+            self.assertEqual(
+                curve.from_point(curve.to_point(curve.from_point(Q), True)),
+                curve.from_point(Q),
+            )
+
+        with self.assertRaises(ValueError):
+            Curve25519.from_point(P256.G)
+        with self.assertRaises(ValueError):
+            MontgomeryCurve.from_weierstrass(P256)
+
+    def test_shared_secret(self):
+        for curve in (W25519, W448):
+            dA, QA = gen_keypair(curve)
+            dB, QB = gen_keypair(curve)
+
+            secret = shared_secret(dA, QB, curve)
+            self.assertEqual(secret, shared_secret(dB, QA, curve))
+            self.assertEqual(int.from_bytes(secret, "big"), (dA * QB).x)
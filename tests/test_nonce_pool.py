@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from hashlib import sha256, sha512
+from unittest import TestCase, skipUnless
+
+from fastecdsa import _ecdsa  # type: ignore[attr-defined]
+from fastecdsa.curve import P256, P521, secp256k1, W25519
+from fastecdsa.ecdsa import NoncePool, verify
+from fastecdsa.keys import gen_keypair
+
+
+class TestPrecomputeNonces(TestCase):
+    def test_matches_scalar_multiplication(self):
+        for curve in (P256, P521, secp256k1, W25519):
+            ks = [
+                1,
+                2,
+                3,
+                15,
+                16,
+                17,
+                0xDEADBEEF,
+                curve.q // 3,
+                curve.q - 2,
+                curve.q - 1,
+            ]
+            ks += [
+                2 ** (curve.q_bits - 1),
+                int.from_bytes(os.urandom(curve.q_bits // 8), "big"),
+            ]
+            for k, (r, kinv) in zip(ks, _ecdsa.precompute_nonces(ks, curve)):
+                self.assertEqual(r, (k * curve.G).x % curve.q)
+                self.assertEqual(kinv * k % curve.q, 1)
+
+    def test_empty(self):
+        self.assertEqual(_ecdsa.precompute_nonces([], P256), [])
+
+    def test_invalid_nonces(self):
+        for k in (0, -1, P256.q, P256.q + 1):
+            with self.assertRaises(ValueError):
+                _ecdsa.precompute_nonces([1, k], P256)
+
+
+class TestNoncePool(TestCase):
+    def test_signatures_verify(self):
+        for curve in (P256, P521, secp256k1):
+            d, Q = gen_keypair(curve)
+            pool = NoncePool(curve, size=8, refill_threshold=2, background=False)
+            for i in range(20):
+                msg = f"message {i}"
+                sig = pool.sign(msg, d)
+                self.assertTrue(verify(sig, msg, Q, curve))
+
+    def test_long_digest_is_truncated(self):
+        d, Q = gen_keypair(P256)
+        pool = NoncePool(P256, size=4, refill_threshold=0, background=False)
+        sig = pool.sign("message", d, hashfunc=sha512)
+        self.assertTrue(verify(sig, "message", Q, P256, hashfunc=sha512))
+
+    def test_prehashed(self):
+        d, Q = gen_keypair(P256)
+        pool = NoncePool(P256, size=4, refill_threshold=0, background=False)
+        digest = sha256(b"message").digest()
+        sig = pool.sign(digest, d, prehashed=True)
+        self.assertTrue(verify(sig, b"message", Q, P256))
+
+    def test_nonces_are_used_once(self):
+        d, _ = gen_keypair(P256)
+        pool = NoncePool(P256, size=16, refill_threshold=4, background=False)
+        rs = [pool.sign("message", d)[0] for _ in range(64)]
+        self.assertEqual(len(set(rs)), len(rs))
+
+    def test_fill_and_refill(self):
+        pool = NoncePool(P256, size=10, refill_threshold=5, background=False)
+        self.assertEqual(len(pool), 0)
+        pool.fill()
+        self.assertEqual(len(pool), 10)
+
+        d, _ = gen_keypair(P256)
+        for _ in range(5):
+            pool.sign("message", d)
+        self.assertEqual(len(pool), 5)
+        pool.sign("message", d)
+        self.assertEqual(len(pool), 10)
+
+    def test_background_refill(self):
+        d, Q = gen_keypair(P256)
+        pool = NoncePool(P256, size=32, refill_threshold=16)
+        for i in range(100):
+            self.assertTrue(verify(pool.sign(str(i), d), str(i), Q, P256))
+
+    def test_background_refill_error_is_raised(self):
+        d, _ = gen_keypair(P256)
+
+        def randfunc(n):
+            if threading.current_thread() is not threading.main_thread():
+                raise OSError("no entropy")
+            return os.urandom(n)
+
+        pool = NoncePool(P256, size=4, refill_threshold=2, randfunc=randfunc)
+        with self.assertRaises(OSError):
+            for _ in range(100):
+                pool.sign("message", d)
+                time.sleep(0.01)
+
+    def test_invalid_sizes(self):
+        for size, threshold in ((0, 0), (4, 5), (4, -1)):
+            with self.assertRaises(ValueError):
+                NoncePool(P256, size=size, refill_threshold=threshold)
+
+    @skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork_empties_the_pool(self):
+        pool = NoncePool(P256, size=8, refill_threshold=0, background=False)
+        pool.fill()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+            os.write(write_fd, bytes([len(pool)]))
+            os._exit(0)
+
+        os.close(write_fd)
+        child_len = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        self.assertEqual(child_len, b"\x00")
+        self.assertEqual(len(pool), 8)
@@ -1,7 +1,18 @@
+from pickle import dumps, loads
+from random import randrange
 from unittest import TestCase
 
-from fastecdsa.curve import P256, W25519
-from fastecdsa.point import CurveMismatchError, Point
+from . import CURVES
+from fastecdsa.curve import P256, W25519, secp256k1
+from fastecdsa.curvemath import NativePoint, msm
+from fastecdsa.curvemath import PointAccumulator as NativePointAccumulator
+from fastecdsa.point import (
+    CurveMismatchError,
+    Point,
+    PointAccumulator,
+    PointArray,
+    PointExpression,
+)
 
 
 class TestPoint(TestCase):
@@ -43,6 +54,46 @@ class TestPoint(TestCase):
 
         self.assertTrue((-value)._is_identity())
 
+    def test_add_inverse(self):
+        G = P256.G
+        self.assertTrue((G + -G)._is_identity())
+        self.assertTrue((-G + G)._is_identity())
+        self.assertEqual(G - -G, 2 * G)
+
+    def test_trusted_construction(self):
+        point = Point._trusted(P256.gx, P256.gy, P256)
+        self.assertEqual(point, P256.G)
+
+        # results computed by the library are reduced and still on the curve
+        for value in (-P256.G, 3 * P256.G, P256.G + P256.G, P256.G - 5 * P256.G):
+            self.assertTrue(0 <= value.x < P256.p and 0 <= value.y < P256.p)
+            self.assertTrue(P256.is_point_on_curve((value.x, value.y)))
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            P256.G.z = 1
+
+    def test_hash(self):
+        P = P256.G * 7
+        Q = Point(P.x, P.y, P256)
+        self.assertEqual(hash(P), hash(Q))
+        self.assertEqual(len({P, Q, P256.G, -P}), 3)
+        self.assertEqual({P: "P"}[Q], "P")
+        self.assertEqual(hash(P256.G * 0), hash(Point._identity_element()))
+
+    def test_pickle(self):
+        for curve in (P256, W25519):
+            for P in (curve.G * 5, -(curve.G * 5)):
+                restored = loads(dumps(P))
+                self.assertEqual(restored, P)
+                self.assertIs(restored.curve, curve)
+
+        P = P256.G * 3
+        self.assertLess(len(dumps(P)), len(dumps((P.x, P.y, P256))))
+
+        identity = loads(dumps(P256.G * 0))
+        self.assertEqual(identity, Point._identity_element())
+
 
 class TestPointTypeValidation(TestCase):
     def test_type_validation_add(self):
@@ -89,3 +140,219 @@ class TestPointTypeValidation(TestCase):
         self.assertEqual(W25519.G * W25519.q, Point._identity_element())
         self.assertEqual(W25519.G + Point._identity_element(), W25519.G)
         self.assertEqual(W25519.G - Point._identity_element(), W25519.G)
+
+
+class TestNativePoint(TestCase):
+    def test_lazy_coordinates(self):
+        value = 3 * (5 * P256.G - 7 * P256.G)
+        self.assertIsNone(value._x)
+
+        expected = Point._trusted(value.x, value.y, P256)
+        self.assertEqual(value, expected)
+        self.assertEqual(value, -6 * P256.G)
+
+    def test_arithmetic(self):
+        G = NativePoint(P256.gx, P256.gy, P256)
+        self.assertEqual(G + G, 2 * G)
+        self.assertEqual(G - 3 * G, G * -2)
+        self.assertEqual((2 * G).affine(), ((2 * P256.G).x, (2 * P256.G).y))
+        self.assertEqual(((-G).x, (-G).y), ((-P256.G).x, (-P256.G).y))
+        self.assertNotEqual(G, -G)
+
+        identity = G - G
+        self.assertTrue(identity.is_identity())
+        self.assertEqual(identity.affine(), (0, 0))
+        self.assertEqual(identity + G, G)
+        self.assertTrue((P256.q * G).is_identity())
+
+    def test_mul_matches_msm(self):
+        # multiplication uses the fixed base table for the base point and the ladder for other
+        # points (both for secret scalars), msm the variable time methods
+        G = NativePoint(P256.gx, P256.gy, P256)
+        for P in (G, 2 * G):
+            for k in (0, 1, 2, 3, P256.q - 1, P256.q, P256.q + 1, 2**300 + 5, -7):
+                self.assertEqual(P * k, msm([P], [k], P256))
+            for _ in range(10):
+                k = randrange(P256.q)
+                self.assertEqual(P * k, msm([P], [k], P256))
+
+    def test_mul_base(self):
+        for curve in CURVES:
+            G = NativePoint(curve.gx, curve.gy, curve)
+            for k in (1, 2, 16, curve.q - 1, randrange(curve.q)):
+                self.assertEqual(G * k, -(-G * k))
+                self.assertEqual(
+                    curve.G * k, Point(*msm([G], [k], curve).affine(), curve)
+                )
+
+    def test_errors(self):
+        G = NativePoint(P256.gx, P256.gy, P256)
+        W = NativePoint(W25519.gx, W25519.gy, W25519)
+
+        with self.assertRaises(ValueError):
+            G + W
+        with self.assertRaises(TypeError):
+            G * 1.5
+        with self.assertRaises(TypeError):
+            NativePoint(P256.gx, P256.gy, "P256")
+
+    def test_set_coordinates(self):
+        value = 2 * P256.G
+        with self.assertWarns(DeprecationWarning):
+            value.x = 1
+        self.assertEqual((value.x, value.y), (1, (2 * P256.G).y))
+
+
+class TestMsm(TestCase):
+    def _naive(self, points, scalars):
+        expected = Point._identity_element()
+        for point, scalar in zip(points, scalars):
+            expected += point * scalar
+        return expected
+
+    def test_msm(self):
+        for curve in (P256, secp256k1, W25519):
+            # few points use Straus' method, many use Pippenger's
+            for n in (1, 2, 5, 200):
+                points = [curve.G * randrange(1, curve.q) for _ in range(n)]
+                scalars = [randrange(-curve.q, curve.q) for _ in range(n)]
+                self.assertEqual(
+                    Point.msm(points, scalars), self._naive(points, scalars)
+                )
+
+    def test_msm_edge_cases(self):
+        P, Q = P256.G * 3, P256.G * 5
+        identity = Point._identity_element()
+
+        self.assertEqual(Point.msm([], []), identity)
+        self.assertEqual(Point.msm([identity, P], [7, 0]), identity)
+        self.assertEqual(Point.msm([P, P, Q], [2, 3, 1]), P256.G * 20)
+        self.assertEqual(Point.msm([P, -P], [4, 4]), identity)
+        self.assertEqual(Point.msm([P, identity], [P256.q + 1, 9]), P)
+
+    def test_msm_native(self):
+        P, Q = P256.G * 3, P256.G * 5
+        result = msm([P._to_native(), Q], [2, -1], P256)
+        self.assertIsInstance(result, NativePoint)
+        self.assertEqual(result, (P256.G * 1)._to_native())
+
+    def test_msm_invalid(self):
+        with self.assertRaises(ValueError):
+            Point.msm([P256.G], [1, 2])
+        with self.assertRaises(TypeError):
+            Point.msm([P256.G], [1.0])
+        with self.assertRaises(CurveMismatchError):
+            Point.msm([P256.G, W25519.G], [1, 2])
+        with self.assertRaises(ValueError):
+            msm([W25519.G._to_native()], [1], P256)
+
+
+class TestPointExpression(TestCase):
+    def test_evaluate(self):
+        P, Q = P256.G * 3, P256.G * 5
+        expression = 2 * (P.lazy() + Q) - P * 4 + -Q.lazy() * 3
+        self.assertIsInstance(expression, PointExpression)
+        self.assertEqual(expression.evaluate(), P256.G * -11)
+        self.assertEqual(expression, P256.G * -11)
+        self.assertEqual(expression.x, (P256.G * -11).x)
+
+        # points on the left hand side defer to the expression
+        self.assertEqual((Q - P.lazy()).evaluate(), P256.G * 2)
+        self.assertEqual((Q + P.lazy()).evaluate(), P256.G * 8)
+
+    def test_like_terms_merged(self):
+        P = P256.G * 3
+        expression = P.lazy() + P - 2 * P.lazy() + P256.G
+        self.assertEqual(len(expression._terms), 2)
+        self.assertEqual(expression.evaluate(), P256.G)
+        self.assertEqual((P.lazy() - P).evaluate(), Point._identity_element())
+
+    def test_identity(self):
+        identity = Point._identity_element()
+        self.assertEqual(identity.lazy().evaluate(), identity)
+        self.assertEqual((identity.lazy() + P256.G).evaluate(), P256.G)
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            P256.G.lazy() * 1.5
+        with self.assertRaises(TypeError):
+            P256.G.lazy() + 1
+        with self.assertRaises(CurveMismatchError):
+            (P256.G.lazy() + W25519.G).evaluate()
+
+
+class TestPointAccumulator(TestCase):
+    def test_accumulate(self):
+        points = [P256.G * randrange(1, P256.q) for _ in range(20)]
+        expected = Point._identity_element()
+        for point in points:
+            expected += point
+
+        accumulator = PointAccumulator(P256)
+        accumulator.add_many(points)
+        self.assertEqual(accumulator.result(), expected)
+
+        accumulator.add(P256.G)
+        accumulator.sub(points[0])
+        accumulator.add_scaled(P256.G, 5)
+        accumulator += Point(P256.gx, P256.gy, P256)
+        accumulator -= P256.G._to_native()
+        self.assertEqual(accumulator.result(), expected + P256.G * 6 - points[0])
+
+        accumulator.reset()
+        self.assertEqual(accumulator.result(), Point._identity_element())
+
+    def test_identity_and_inverses(self):
+        accumulator = PointAccumulator(W25519)
+        accumulator.add(Point._identity_element())
+        accumulator.add(W25519.G)
+        accumulator.add(-W25519.G)
+        self.assertEqual(accumulator.result(), Point._identity_element())
+
+        accumulator.add_many(iter([W25519.G, W25519.G]))
+        self.assertEqual(accumulator.result(), W25519.G * 2)
+
+    def test_native(self):
+        accumulator = NativePointAccumulator(P256)
+        accumulator.add(P256.G)
+        accumulator.add(P256.G)
+        self.assertIsInstance(accumulator.result(), NativePoint)
+        self.assertEqual(accumulator.result(), (P256.G * 2)._to_native())
+
+    def test_invalid(self):
+        accumulator = PointAccumulator(P256)
+        with self.assertRaises(ValueError):
+            accumulator.add(W25519.G)
+        with self.assertRaises(ValueError):
+            accumulator.add(Point(W25519.gx, W25519.gy, W25519))
+        with self.assertRaises(TypeError):
+            accumulator.add_scaled(P256.G, 1.5)
+        with self.assertRaises(AttributeError):
+            accumulator.add(1)
+
+
+class TestPointArray(TestCase):
+    def test_point_array(self):
+        G = P256.G
+        points = [G, 2 * G, Point._identity_element(), 3 * G]
+        data = b"".join(
+            P.x.to_bytes(P256.p_bytes, "big") + P.y.to_bytes(P256.p_bytes, "big")
+            for P in points
+        )
+
+        array = PointArray(data, P256)
+        self.assertEqual(len(array), 4)
+        self.assertEqual(list(array), points)
+        self.assertEqual(array[-1], 3 * G)
+        self.assertEqual(list(array[::2]), [G, Point._identity_element()])
+        self.assertEqual(array[1:], PointArray(data[2 * P256.p_bytes :], P256))
+        with self.assertRaises(IndexError):
+            array[4]
+
+    def test_point_array_invalid(self):
+        with self.assertRaises(ValueError):
+            PointArray(b"\x00" * 63, P256)
+
+        array = PointArray((1).to_bytes(64, "big"), P256)
+        with self.assertRaises(ValueError):
+            array[0]
@@ -0,0 +1,48 @@
+from hashlib import sha256, sha384
+from io import BytesIO, StringIO
+from unittest import TestCase
+
+from fastecdsa.curve import P256, secp256k1
+from fastecdsa.ecdsa import sign, sign_stream, verify, verify_stream
+from fastecdsa.keys import gen_keypair
+
+
+class TestStream(TestCase):
+    def setUp(self):
+        self.msg = b"".join(bytes([i % 251]) * 1000 for i in range(300))
+        self.d, self.Q = gen_keypair(P256)
+
+    def test_sign_file_matches_sign(self):
+        expected = sign(self.msg, self.d)
+        sig = sign_stream(BytesIO(self.msg), self.d, chunk_size=4096)
+
+        self.assertEqual(sig, expected)
+        self.assertTrue(verify_stream(sig, BytesIO(self.msg), self.Q, chunk_size=7))
+        self.assertTrue(verify(sig, self.msg, self.Q))
+
+    def test_text_file(self):
+        sig = sign_stream(StringIO("sample"), self.d)
+        self.assertEqual(sig, sign("sample", self.d))
+
+    def test_chunk_iterator(self):
+        chunks = (self.msg[i : i + 1000] for i in range(0, len(self.msg), 1000))
+        sig = sign_stream(chunks, self.d, curve=P256)
+
+        self.assertEqual(sig, sign(self.msg, self.d))
+
+        sig = sign("sample", self.d)
+        self.assertTrue(verify_stream(sig, ["sam", b"p", bytearray(b"le")], self.Q))
+        self.assertFalse(verify_stream(sig, ["sam", b"ple", b"s"], self.Q))
+
+    def test_hash_object(self):
+        d, Q = gen_keypair(secp256k1)
+        hasher = sha384()
+        hasher.update(self.msg)
+
+        sig = sign_stream(hasher, d, curve=secp256k1, hashfunc=sha384)
+        self.assertEqual(sig, sign(self.msg, d, curve=secp256k1, hashfunc=sha384))
+        self.assertTrue(verify_stream(sig, hasher, Q, curve=secp256k1, hashfunc=sha384))
+
+    def test_hash_object_mismatch(self):
+        with self.assertRaises(ValueError):
+            sign_stream(sha384(self.msg), self.d, hashfunc=sha256)
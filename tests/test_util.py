@@ -0,0 +1,49 @@
+from random import randrange
+from unittest import TestCase
+
+from . import CURVES
+from fastecdsa.curve import P224, W448, W25519
+from fastecdsa.curvemath import decompress
+from fastecdsa.util import _tonelli_shanks_precompute, mod_sqrt
+
+
+class TestModSqrt(TestCase):
+    def test_mod_sqrt(self):
+        # P224 uses Tonelli-Shanks, W25519 and secp224k1 (p = 5 mod 8) use Atkin's algorithm
+        for curve in CURVES + [W25519, W448]:
+            p = curve.p
+            for _ in range(20):
+                a = pow(randrange(1, p), 2, p)
+                root1, root2 = mod_sqrt(a, p)
+                self.assertEqual(pow(root1, 2, p), a)
+                self.assertEqual((root1 + root2) % p, 0)
+
+            self.assertEqual(mod_sqrt(0, p), (0, 0))
+
+    def test_tonelli_shanks_non_residue(self):
+        p = P224.p
+        non_residue = next(n for n in range(2, 100) if pow(n, (p - 1) // 2, p) != 1)
+        with self.assertRaises(ValueError):
+            mod_sqrt(non_residue, p)
+
+    def test_tonelli_shanks_cache_is_bounded(self):
+        mod_sqrt(4, P224.p)
+        self.assertIsNotNone(_tonelli_shanks_precompute.cache_info().maxsize)
+
+    def test_decompress(self):
+        for curve in CURVES + [W25519, W448]:
+            for _ in range(20):
+                point = curve.G * randrange(1, curve.q)
+                self.assertEqual(decompress(point.x, point.y & 1, curve), point.y)
+
+    def test_decompress_not_on_curve(self):
+        for curve in (P224, W25519):
+            x = next(
+                x
+                for x in range(1, 100)
+                if pow(curve.evaluate(x), (curve.p - 1) // 2, curve.p) != 1
+            )
+            with self.assertRaises(ValueError):
+                decompress(x, 0, curve)
+            with self.assertRaises(ValueError):
+                decompress(curve.p, 0, curve)
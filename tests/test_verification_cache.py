@@ -0,0 +1,125 @@
+from hashlib import sha256, sha384
+from unittest import TestCase
+
+from fastecdsa.curve import P256, Curve, secp256k1
+from fastecdsa.ecdsa import EcdsaError, VerificationCache, sign
+from fastecdsa.keys import gen_keypair
+from fastecdsa.point import Point
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestVerificationCache(TestCase):
+    def setUp(self):
+        self.d, self.Q = gen_keypair(P256)
+        self.sig = sign("message", self.d)
+
+    def test_hits_and_misses(self):
+        cache = VerificationCache()
+        self.assertTrue(cache.verify(self.sig, "message", self.Q))
+        self.assertTrue(cache.verify(self.sig, "message", self.Q))
+        self.assertTrue(cache.verify(self.sig, b"message", self.Q))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(len(cache), 1)
+
+        # the digest is what's cached, a prehashed message hits the same entry
+        digest = sha256(b"message").digest()
+        self.assertTrue(cache.verify(self.sig, digest, self.Q, prehashed=True))
+        self.assertEqual(cache.hits, 3)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+    def test_failures_are_not_cached(self):
+        cache = VerificationCache()
+        for _ in range(2):
+            self.assertFalse(cache.verify(self.sig, "other message", self.Q))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 2, 0))
+
+        _, other_Q = gen_keypair(P256)
+        self.assertTrue(cache.verify(self.sig, "message", self.Q))
+        self.assertFalse(cache.verify(self.sig, "message", other_Q))
+        self.assertFalse(cache.verify(self.sig, "message", self.Q, hashfunc=sha384))
+        self.assertFalse(
+            cache.verify((self.sig[0], self.sig[1] + 1), "message", self.Q)
+        )
+
+        with self.assertRaises(EcdsaError):
+            cache.verify((0, 1), "message", self.Q)
+
+    def test_curves_are_distinguished(self):
+        d, Q = gen_keypair(secp256k1)
+        sig = sign("message", d, curve=secp256k1)
+        cache = VerificationCache()
+        self.assertTrue(cache.verify(sig, "message", Q, curve=secp256k1))
+        self.assertTrue(cache.verify(self.sig, "message", self.Q))
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+        # a curve named P256 with another order doesn't hit the entries of P256
+        params = (P256.p, P256.a, P256.b, P256.q + 2, P256.gx, P256.gy)
+        impostor = Curve("P256", *params)
+        try:
+            Q = Point(self.Q.x, self.Q.y, impostor)
+            self.assertFalse(cache.verify(self.sig, "message", Q, curve=impostor))
+            self.assertEqual((cache.hits, cache.misses), (0, 3))
+        finally:
+            Curve._name_lookup["P256"] = P256
+
+    def test_point_on_another_curve(self):
+        cache = VerificationCache()
+        self.assertTrue(cache.verify(self.sig, "message", self.Q))
+        with self.assertRaises(EcdsaError):
+            cache.verify(self.sig, "message", self.Q, curve=secp256k1)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = VerificationCache(ttl=10, clock=clock)
+        cache.verify(self.sig, "message", self.Q)
+
+        clock.now = 9.9
+        cache.verify(self.sig, "message", self.Q)
+        self.assertEqual(cache.hits, 1)
+
+        clock.now = 10.0
+        self.assertTrue(cache.verify(self.sig, "message", self.Q))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        cache = VerificationCache(maxsize=2)
+        sigs = [sign(f"message {i}", self.d) for i in range(3)]
+        cache.verify(sigs[0], "message 0", self.Q)
+        cache.verify(sigs[1], "message 1", self.Q)
+        # sigs[1] becomes the least recently used entry
+        cache.verify(sigs[0], "message 0", self.Q)
+        cache.verify(sigs[2], "message 2", self.Q)
+        self.assertEqual(len(cache), 2)
+
+        cache.hits = cache.misses = 0
+        cache.verify(sigs[0], "message 0", self.Q)
+        cache.verify(sigs[2], "message 2", self.Q)
+        cache.verify(sigs[1], "message 1", self.Q)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_verify_many(self):
+        cache = VerificationCache()
+        items = [
+            (sign(f"message {i}", self.d), f"message {i}", self.Q) for i in range(4)
+        ]
+        items.append((self.sig, "wrong message", self.Q))
+
+        self.assertEqual(cache.verify_many(items), [True] * 4 + [False])
+        self.assertEqual(cache.verify_many(items), [True] * 4 + [False])
+        self.assertEqual((cache.hits, cache.misses), (4, 6))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            VerificationCache(maxsize=0)
+        with self.assertRaises(ValueError):
+            VerificationCache(ttl=0)